@@ -1,34 +1,52 @@
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.database import get_db
-from api.auth.service.auth_service import AuthService
-from database.models.user.user_model import UserModel
+from api.auth.schemas.current_user_schema import CurrentUserSchema
+from api.auth.service.auth_service import AUTH_STATELESS, AuthService
+from api.auth.service.user_cache import user_cache
+from core import metrics
 
 security = HTTPBearer()
 
+stateless_auth_counter = metrics.counter("auth_stateless_total")
 
-def get_current_user(
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
+    db: AsyncSession = Depends(get_db)
+) -> CurrentUserSchema:
     """Получение текущего аутентифицированного пользователя"""
     auth_service = AuthService(db)
 
-    user_id = auth_service.validate_access_token(credentials.credentials)
-    if not user_id:
+    payload = auth_service.decode_access_token(credentials.credentials)
+    if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Недействительный токен аутентификации",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
-    if not user:
+    user_id = payload["sub"]
+
+    # В stateless-режиме пользователь собирается из claims токена
+    if AUTH_STATELESS and payload.get("email"):
+        stateless_auth_counter.inc()
+        return CurrentUserSchema(id=user_id, email=payload["email"])
+
+    user = user_cache.get(user_id)
+    if user:
+        return user
+
+    user_model = await auth_service.get_user_by_id(user_id)
+    if not user_model:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Пользователь не найден"
         )
 
+    user = CurrentUserSchema.model_validate(user_model)
+    user_cache.set(user)
+
     return user
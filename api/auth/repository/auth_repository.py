@@ -1,5 +1,5 @@
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
 
 from api.auth.service.auth_service import AuthService, get_auth_service
@@ -17,7 +17,7 @@ class AuthRepository:
     Делегирует выполнение операций сервису AuthService.
     """
 
-    def __init__(self, db: Session, auth_service: AuthService, user_service: UserService):
+    def __init__(self, db: AsyncSession, auth_service: AuthService, user_service: UserService):
         """
         Инициализирует репозиторий
         """
@@ -25,31 +25,31 @@ class AuthRepository:
         self.user_service = user_service
         self.db_session = db
 
-    def refresh_tokens(self, refresh_token: str) -> Optional[TokenSchema]:
+    async def refresh_tokens(self, refresh_token: str) -> Optional[TokenSchema]:
         """
         Обновление пары токенов по refresh токену
         """
-        return self.auth_service.refresh_tokens(refresh_token)
+        return await self.auth_service.refresh_tokens(refresh_token)
 
-    def revoke_tokens(self, user_id: str) -> bool:
+    async def revoke_tokens(self, user_id: str) -> bool:
         """
         Отзыв всех refresh токенов пользователя
         """
-        return self.auth_service.revoke_tokens(user_id)
+        return await self.auth_service.revoke_tokens(user_id)
 
-    def register(self, user_data: AuthRegisterSchema) -> TokenSchema:
+    async def register(self, user_data: AuthRegisterSchema) -> TokenSchema:
         """Регистрация нового пользователя"""
-        return self.auth_service.register(user_data)
+        return await self.auth_service.register(user_data)
 
-    def login(self, user_data: AuthLoginSchema) -> TokenSchema:
+    async def login(self, user_data: AuthLoginSchema) -> TokenSchema:
         """Авторизация пользователя"""
-        return self.auth_service.login(user_data)
+        return await self.auth_service.login(user_data)
 
 # Функция для внедрения зависимости
 
 
 def get_auth_repository(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     auth_service: AuthService = Depends(get_auth_service),
     user_service: UserService = Depends(get_user_service),
 ) -> AuthRepository:
@@ -6,27 +6,27 @@ from api.auth.schemas.token_schema import TokenSchema, RefreshTokenRequest
 from api.auth.schemas.auth_register_schema import AuthRegisterSchema
 from api.auth.schemas.auth_login_schema import AuthLoginSchema
 from api.auth.middleware.auth_middleware import get_current_user
-from database.models.user.user_model import UserModel
+from api.auth.schemas.current_user_schema import CurrentUserSchema
 
 router = APIRouter(tags=["auth"], prefix="/auth")
 
 
 @router.post("/login", response_model=TokenSchema)
-def login(
+async def login(
     user_data: AuthLoginSchema,
     auth_repository: AuthRepository = Depends(get_auth_repository)
 ):
     """Авторизация пользователя"""
-    return auth_repository.login(user_data)
+    return await auth_repository.login(user_data)
 
 
 @router.post("/refresh", response_model=TokenSchema)
-def refresh_token(
+async def refresh_token(
     token_data: RefreshTokenRequest,
     auth_repository: AuthRepository = Depends(get_auth_repository)
 ):
     """Обновление пары токенов через refresh токен"""
-    new_tokens = auth_repository.refresh_tokens(token_data.refresh_token)
+    new_tokens = await auth_repository.refresh_tokens(token_data.refresh_token)
 
     if not new_tokens:
         raise HTTPException(
@@ -39,19 +39,19 @@ def refresh_token(
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
-def logout(
-    user: UserModel = Depends(get_current_user),
+async def logout(
+    user: CurrentUserSchema = Depends(get_current_user),
     auth_repository: AuthRepository = Depends(get_auth_repository)
 ):
     """Выход из системы (отзыв всех refresh токенов)"""
-    auth_repository.revoke_tokens(user.id)
+    await auth_repository.revoke_tokens(user.id)
     return {}
 
 
 @router.post("/register", response_model=TokenSchema)
-def register(
+async def register(
     user_data: AuthRegisterSchema,
     auth_repository: AuthRepository = Depends(get_auth_repository)
 ):
     """Регистрация нового пользователя"""
-    return auth_repository.register(user_data)
+    return await auth_repository.register(user_data)
@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+
+class CurrentUserSchema(BaseModel):
+    """
+    Аутентифицированный пользователь запроса.
+    Не привязан к сессии БД, поэтому может храниться в кэше
+    или собираться из claims access токена.
+    """
+    id: str
+    email: str
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,8 +1,9 @@
+import os
 from typing import Optional, Tuple
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import uuid4
 from fastapi import Depends, HTTPException, status
 
@@ -12,6 +13,7 @@ from database.models.token_model import RefreshToken
 from api.auth.schemas.token_schema import TokenSchema
 from api.auth.schemas.auth_register_schema import AuthRegisterSchema
 from api.auth.schemas.auth_login_schema import AuthLoginSchema
+from api.auth.service.password_hasher import password_hasher
 
 # Константы для JWT
 # Используйте переменные окружения в реальном проекте
@@ -20,30 +22,39 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
-# Контекст для хеширования паролей
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Stateless-режим: данные пользователя, нужные роутам, передаются в claims
+# access токена, и get_current_user не обращается к таблице users.
+# Удаление пользователя в этом режиме вступает в силу после истечения токена.
+AUTH_STATELESS = os.getenv("AUTH_STATELESS", "false").lower() == "true"
 
 
 class AuthService:
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Проверка пароля"""
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Проверка пароля, возвращает новый хеш, если параметры bcrypt изменились"""
+        return await password_hasher.verify_and_update(plain_password, hashed_password)
 
-    def get_password_hash(self, password: str) -> str:
+    async def get_password_hash(self, password: str) -> str:
         """Хеширование пароля"""
-        return pwd_context.hash(password)
+        return await password_hasher.hash(password)
 
-    def get_user_by_email(self, email: str) -> Optional[UserModel]:
+    async def get_user_by_email(self, email: str) -> Optional[UserModel]:
         """Получение пользователя по email"""
-        return self.db_session.query(UserModel).filter(UserModel.email == email).first()
+        result = await self.db_session.execute(
+            select(UserModel).where(UserModel.email == email)
+        )
+        return result.scalars().first()
+
+    async def get_user_by_id(self, user_id: str) -> Optional[UserModel]:
+        """Получение пользователя по ID"""
+        return await self.db_session.get(UserModel, user_id)
 
-    def register(self, user_data: AuthRegisterSchema) -> TokenSchema:
+    async def register(self, user_data: AuthRegisterSchema) -> TokenSchema:
         """Регистрация нового пользователя"""
         # Проверяем, существует ли пользователь с таким email
-        existing_user = self.get_user_by_email(user_data.email)
+        existing_user = await self.get_user_by_email(user_data.email)
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -51,7 +62,7 @@ class AuthService:
             )
 
         # Создаем нового пользователя
-        hashed_password = self.get_password_hash(user_data.password)
+        hashed_password = await self.get_password_hash(user_data.password)
         user = UserModel(
             id=str(uuid4()),
             email=user_data.email,
@@ -59,18 +70,18 @@ class AuthService:
         )
 
         self.db_session.add(user)
-        self.db_session.commit()
-        self.db_session.refresh(user)
+        await self.db_session.commit()
+        await self.db_session.refresh(user)
 
         # Создаем токены для нового пользователя
-        tokens = self.create_tokens(user.id)
+        tokens = await self.create_tokens(user.id, user.email)
 
         return tokens
 
-    def login(self, user_data: AuthLoginSchema) -> TokenSchema:
+    async def login(self, user_data: AuthLoginSchema) -> TokenSchema:
         """Авторизация пользователя"""
         # Получаем пользователя по email
-        user = self.get_user_by_email(user_data.email)
+        user = await self.get_user_by_email(user_data.email)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -78,18 +89,25 @@ class AuthService:
             )
 
         # Проверяем пароль
-        if not self.verify_password(user_data.password, user.hashed_password):
+        valid, new_hash = await self.verify_password(
+            user_data.password, user.hashed_password)
+        if not valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Неверный email или пароль"
             )
 
+        # Пересчитываем хеш, если изменилась стоимость bcrypt
+        # (сохраняется вместе с refresh токеном)
+        if new_hash:
+            user.hashed_password = new_hash
+
         # Создаем новые токены
-        tokens = self.create_tokens(user.id)
+        tokens = await self.create_tokens(user.id, user.email)
 
         return tokens
 
-    def create_access_token(self, user_id: str) -> str:
+    def create_access_token(self, user_id: str, email: Optional[str] = None) -> str:
         """Создание access токена"""
         expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         expire = datetime.utcnow() + expires_delta
@@ -98,10 +116,12 @@ class AuthService:
             "sub": user_id,
             "exp": expire
         }
+        if AUTH_STATELESS and email:
+            payload["email"] = email
 
         return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
-    def create_refresh_token(self, user_id: str) -> str:
+    async def create_refresh_token(self, user_id: str) -> str:
         """Создание refresh токена и сохранение в БД"""
         expires_delta = timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
         expires_at = datetime.utcnow() + expires_delta
@@ -118,22 +138,19 @@ class AuthService:
         )
 
         # Удаляем старые токены того же пользователя
-        old_tokens = self.db_session.query(RefreshToken).filter(
-            RefreshToken.user_id == user_id
-        ).all()
-
-        for old_token in old_tokens:
-            self.db_session.delete(old_token)
+        await self.db_session.execute(
+            delete(RefreshToken).where(RefreshToken.user_id == user_id)
+        )
 
         self.db_session.add(token)
-        self.db_session.commit()
+        await self.db_session.commit()
 
         return token_value
 
-    def create_tokens(self, user_id: str) -> TokenSchema:
+    async def create_tokens(self, user_id: str, email: Optional[str] = None) -> TokenSchema:
         """Создание пары токенов"""
-        access_token = self.create_access_token(user_id)
-        refresh_token = self.create_refresh_token(user_id)
+        access_token = self.create_access_token(user_id, email)
+        refresh_token = await self.create_refresh_token(user_id)
 
         return TokenSchema(
             access_token=access_token,
@@ -142,6 +159,14 @@ class AuthService:
 
     def validate_access_token(self, token: str) -> Optional[str]:
         """Проверка access токена"""
+        payload = self.decode_access_token(token)
+        if payload is None:
+            return None
+
+        return payload["sub"]
+
+    def decode_access_token(self, token: str) -> Optional[dict]:
+        """Проверка access токена, возвращает его claims"""
         try:
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
             user_id = payload.get("sub")
@@ -153,43 +178,43 @@ class AuthService:
             if datetime.fromtimestamp(expiry) < datetime.utcnow():
                 return None
 
-            return user_id
+            return payload
         except JWTError:
             return None
 
-    def refresh_tokens(self, refresh_token: str) -> Optional[TokenSchema]:
+    async def refresh_tokens(self, refresh_token: str) -> Optional[TokenSchema]:
         """Обновление пары токенов через refresh токен"""
         # Ищем токен в БД
-        token_record = self.db_session.query(RefreshToken).filter(
-            RefreshToken.token == refresh_token
-        ).first()
+        result = await self.db_session.execute(
+            select(RefreshToken).where(RefreshToken.token == refresh_token)
+        )
+        token_record = result.scalars().first()
 
         if not token_record or token_record.expires_at < datetime.utcnow():
             return None
 
-        # Создаем новые токены
-        new_tokens = self.create_tokens(token_record.user_id)
+        email = None
+        if AUTH_STATELESS:
+            user = await self.get_user_by_id(token_record.user_id)
+            email = user.email if user else None
 
-        # Удаляем старый токен
-        self.db_session.delete(token_record)
-        self.db_session.commit()
+        # Создаем новые токены (старые токены пользователя, включая
+        # текущий, удаляются в create_refresh_token)
+        new_tokens = await self.create_tokens(token_record.user_id, email)
 
         return new_tokens
 
-    def revoke_tokens(self, user_id: str) -> bool:
+    async def revoke_tokens(self, user_id: str) -> bool:
         """Отзыв всех refresh токенов пользователя"""
-        tokens = self.db_session.query(RefreshToken).filter(
-            RefreshToken.user_id == user_id
-        ).all()
-
-        for token in tokens:
-            self.db_session.delete(token)
+        await self.db_session.execute(
+            delete(RefreshToken).where(RefreshToken.user_id == user_id)
+        )
 
-        self.db_session.commit()
+        await self.db_session.commit()
         return True
 
 
-def get_auth_service(db_session: Session = Depends(get_db)) -> AuthService:
+def get_auth_service(db_session: AsyncSession = Depends(get_db)) -> AuthService:
     """
     Зависимость для получения AuthService
     """
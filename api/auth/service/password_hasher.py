@@ -0,0 +1,106 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from core import metrics
+
+# Стоимость bcrypt. При изменении хеши пользователей пересчитываются
+# при следующем успешном входе.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# bcrypt освобождает GIL, поэтому пул потоков загружает все ядра
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+
+# Сколько операций может ждать свободного потока, прежде чем
+# новые запросы получат 503
+PASSWORD_HASH_MAX_QUEUE = int(
+    os.getenv("PASSWORD_HASH_MAX_QUEUE", str(PASSWORD_HASH_WORKERS * 4)))
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """
+    Хеширование и проверка паролей на выделенном пуле потоков.
+    Пул не делит потоки с threadpool Starlette, а при переполнении очереди
+    запрос сразу отклоняется с 503 вместо накопления задержки.
+    """
+
+    def __init__(self, rounds: int, workers: int, max_queue: int):
+        self.pwd_context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__rounds=rounds,
+        )
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="password-hasher",
+        )
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+        self._queue_depth = metrics.gauge("password_hash_queue_depth")
+        self._in_flight_gauge = metrics.gauge("password_hash_in_flight")
+        self._rejected = metrics.counter("password_hash_rejected_total")
+        self._rehashed = metrics.counter("password_rehash_total")
+
+    async def hash(self, password: str) -> str:
+        """Хеширование пароля"""
+        return await self._submit(self.pwd_context.hash, password)
+
+    async def verify_and_update(
+        self,
+        password: str,
+        hashed_password: str,
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Проверка пароля. Если хеш создан с устаревшими параметрами,
+        вторым элементом возвращается новый хеш.
+        """
+        valid, new_hash = await self._submit(
+            self.pwd_context.verify_and_update, password, hashed_password)
+        if new_hash:
+            self._rehashed.inc()
+        return valid, new_hash
+
+    async def _submit(self, func: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self._rejected.inc()
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Сервис перегружен, повторите попытку позже",
+                    headers={"Retry-After": "1"},
+                )
+            self._in_flight += 1
+            self._update_gauges()
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._update_gauges()
+
+    def _update_gauges(self):
+        self._in_flight_gauge.set(self._in_flight)
+        self._queue_depth.set(max(0, self._in_flight - self.workers))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_QUEUE,
+)
@@ -0,0 +1,77 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from api.auth.schemas.current_user_schema import CurrentUserSchema
+from core import metrics
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+
+
+class UserCache:
+    """
+    In-process кэш пользователей по ID с TTL и вытеснением LRU.
+    Снимает запрос в таблицу users с каждого аутентифицированного запроса.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._items: "OrderedDict[str, Tuple[float, CurrentUserSchema]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._hits = metrics.counter("user_cache_hits_total")
+        self._misses = metrics.counter("user_cache_misses_total")
+        self._evictions = metrics.counter("user_cache_evictions_total")
+        self._size = metrics.gauge("user_cache_size")
+
+    def get(self, user_id: str) -> Optional[CurrentUserSchema]:
+        """Возвращает пользователя из кэша или None, если записи нет или она устарела"""
+        with self._lock:
+            item = self._items.get(user_id)
+            if item is None:
+                self._misses.inc()
+                return None
+
+            expires_at, user = item
+            if expires_at < time.monotonic():
+                del self._items[user_id]
+                self._size.set(len(self._items))
+                self._misses.inc()
+                return None
+
+            self._items.move_to_end(user_id)
+            self._hits.inc()
+            return user
+
+    def set(self, user: CurrentUserSchema):
+        """Сохраняет пользователя, вытесняя давно не использованные записи"""
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._items[user.id] = (time.monotonic() + self.ttl_seconds, user)
+            self._items.move_to_end(user.id)
+
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+                self._evictions.inc()
+
+            self._size.set(len(self._items))
+
+    def invalidate(self, user_id: str):
+        """Удаляет пользователя из кэша (после изменения или удаления)"""
+        with self._lock:
+            self._items.pop(user_id, None)
+            self._size.set(len(self._items))
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._size.set(0)
+
+
+user_cache = UserCache(USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_SIZE)
@@ -0,0 +1,31 @@
+import hmac
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from core import metrics
+
+# Токен сборщика метрик. Без него эндпоинт выключен: метрики раскрывают
+# внутреннее состояние и не должны быть доступны снаружи
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+router = APIRouter(tags=["metrics"])
+
+
+def check_metrics_token(authorization: Optional[str] = Header(None)):
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if authorization is None or not hmac.compare_digest(
+            authorization.encode(), f"Bearer {METRICS_TOKEN}".encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Неверный токен метрик",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get("/metrics", response_model=dict, dependencies=[Depends(check_metrics_token)])
+async def get_metrics():
+    """Счетчики и gauge-метрики текущего процесса"""
+    return metrics.snapshot()
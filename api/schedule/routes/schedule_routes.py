@@ -0,0 +1,94 @@
+import json
+import logging
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from api.auth.middleware.auth_middleware import get_current_user
+from api.auth.schemas.current_user_schema import CurrentUserSchema
+from api.schemas.chat_gpt_request_schema import ChatGptRequestSchema
+from api.schemas.schedule.applied_schedule_schema import AppliedScheduleSchema
+from api.schemas.schedule.edited_schedule_schema import EditedScheduleSchema
+from api.schemas.schedule.edited_task_schema import EditedTaskSchema
+from api.service.schedule.schedule_applier import ScheduleApplier, get_schedule_applier
+from api.service.schedule.schedule_service import ScheduleService, get_schedule_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["schedule"], prefix="/schedule")
+
+
+@router.post("", response_model=EditedScheduleSchema)
+async def edit_schedule(
+    request: ChatGptRequestSchema,
+    current_user: CurrentUserSchema = Depends(get_current_user),
+    schedule_service: ScheduleService = Depends(get_schedule_service),
+):
+    """Редактирование расписания по запросу пользователя"""
+    return await schedule_service.request(request.message, current_user.id)
+
+
+@router.post("/apply", response_model=AppliedScheduleSchema)
+async def apply_schedule(
+    schedule: EditedScheduleSchema,
+    current_user: CurrentUserSchema = Depends(get_current_user),
+    schedule_applier: ScheduleApplier = Depends(get_schedule_applier),
+):
+    """
+    Применение результата редактирования расписания в одной транзакции.
+    Принимает ответ POST /schedule как есть; 428 — нет tasks_version,
+    409 — задачи изменились после редактирования, нужно отредактировать заново
+    """
+    return await schedule_applier.apply(schedule, current_user.id)
+
+
+@router.post("/stream")
+async def edit_schedule_stream(
+    request: ChatGptRequestSchema,
+    current_user: CurrentUserSchema = Depends(get_current_user),
+    schedule_service: ScheduleService = Depends(get_schedule_service),
+):
+    """
+    Редактирование расписания с потоковым ответом (Server-Sent Events).
+    Каждая задача приходит событием task, в конце — событие done
+    с tasks_version для POST /schedule/apply
+    """
+    # Задачи читаются из БД до начала стрима: сессия закрывается
+    # до отправки ответа. Версия — до задач, как в POST /schedule
+    tasks_version = await schedule_service.get_tasks_version(current_user.id)
+    edit_request, tasks, filters = await schedule_service.prepare_edit(
+        request.message, current_user.id)
+
+    edited_tasks = schedule_service.edit_schedule_stream(
+        edit_request, current_user.id, tasks, filters)
+
+    return StreamingResponse(
+        _sse_events(edited_tasks, tasks_version),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _sse_events(
+    edited_tasks: AsyncIterator[EditedTaskSchema],
+    tasks_version: int,
+) -> AsyncIterator[str]:
+    count = 0
+    try:
+        async for edited_task in edited_tasks:
+            count += 1
+            yield _sse("task", edited_task.model_dump_json())
+    except HTTPException as e:
+        yield _sse("error", json.dumps({"detail": e.detail}, ensure_ascii=False))
+        return
+    except Exception:
+        logger.error("Ошибка при потоковом редактировании расписания", exc_info=True)
+        yield _sse("error", json.dumps({"detail": "Ошибка ассистента"}, ensure_ascii=False))
+        return
+
+    yield _sse("done", json.dumps({"count": count, "tasks_version": tasks_version}))
+
+
+def _sse(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
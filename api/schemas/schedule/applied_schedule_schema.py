@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+from api.task.schemas.task.task_response_schema import TaskResponseSchema
+
+
+class AppliedScheduleSchema(BaseModel):
+    """Расписание после применения изменений"""
+    # Созданные, измененные и прочитанные задачи в порядке изменений,
+    # без удаленных
+    tasks: list[TaskResponseSchema]
+    # Версия задач пользователя после применения
+    tasks_version: int
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 from api.schemas.schedule.edited_task_schema import EditedTaskSchema
@@ -5,3 +7,7 @@ from api.schemas.schedule.edited_task_schema import EditedTaskSchema
 
 class EditedScheduleSchema(BaseModel):
     tasks: list[EditedTaskSchema]
+    # Версия задач пользователя, прочитанная до загрузки задач для
+    # редактирования: POST /schedule/apply отклоняет изменения (409),
+    # если задачи с тех пор менялись
+    tasks_version: Optional[int] = None
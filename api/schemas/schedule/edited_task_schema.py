@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 
-from api.schemas.task.task_response_schema import TaskResponseSchema
+from api.task.schemas.task.task_response_schema import TaskResponseSchema
 
 
 class EditedTaskSchema(BaseModel):
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional, Union
 from pydantic import BaseModel, Field
 
-from api.schemas.task.task_status_schema import TaskStatusSchema
+from api.task.schemas.task.task_status_schema import TaskStatusSchema
 
 
 class DateTimeRange(BaseModel):
@@ -1,5 +1,5 @@
 from api.schemas.schema_spec import get_schema_fields
-from api.schemas.task.task_response_schema import TaskResponseSchema
+from api.task.schemas.task.task_response_schema import TaskResponseSchema
 
 
 edit_schedule_prompt = """
@@ -13,9 +13,13 @@ edit_schedule_prompt = """
 
 {
   "user_request": "...",
-  "tasks": [ ... ] или null
+  "tasks": {"columns": ["id", "title", ...], "rows": [["...", "...", ...], ...]} или null
 }
 
+Задачи переданы таблицей: columns — имена полей задачи, каждая строка rows — значения
+полей одной задачи в том же порядке. Время может быть указано без секунд (2025-04-01T10:00).
+Задачи упорядочены по релевантности запросу. В ответе edited_task — обычный объект с полями задачи.
+
 Выход — JSON-массив действий вида:
 tasks : [
   {
@@ -0,0 +1,85 @@
+import json
+from typing import List, Optional
+
+from api.schemas.schedule.edited_task_schema import EditedTaskSchema
+
+
+class EditedTasksStreamParser:
+    """
+    Инкрементальный разбор ответа edit_schedule вида {"tasks": [{...}, ...]}.
+
+    Текст ответа подается частями по мере прихода из стрима. Как только
+    очередной объект массива tasks закрыт, он разбирается в EditedTaskSchema
+    и возвращается из feed, не дожидаясь конца ответа. Каждый символ
+    просматривается один раз.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # Последняя строка на уровне корневого объекта (ключ)
+        self._key_start: Optional[int] = None
+        self._last_key: Optional[str] = None
+        # Глубина массива tasks и начало текущего элемента
+        self._tasks_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+        self._position = 0
+        # Абсолютная позиция начала буфера
+        self._offset = 0
+
+    def feed(self, text: str) -> List[EditedTaskSchema]:
+        """
+        Returns:
+            List[EditedTaskSchema]: Задачи, полностью полученные в этой части
+        """
+        completed: List[EditedTaskSchema] = []
+        self._buffer.append(text)
+
+        for char in text:
+            position = self._position
+            self._position += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._last_key = json.loads(
+                            self._slice(self._key_start, position + 1))
+                        self._key_start = None
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._tasks_depth is None:
+                    self._key_start = position
+            elif char in "{[":
+                self._depth += 1
+                if char == "[" and self._depth == 2 and self._last_key == "tasks":
+                    self._tasks_depth = self._depth
+                elif char == "{" and self._tasks_depth is not None and self._depth == self._tasks_depth + 1:
+                    self._item_start = position
+            elif char in "}]":
+                if char == "}" and self._item_start is not None and self._depth == self._tasks_depth + 1:
+                    item = json.loads(self._slice(self._item_start, position + 1))
+                    completed.append(EditedTaskSchema(**item))
+                    self._item_start = None
+                elif char == "]" and self._depth == self._tasks_depth:
+                    self._tasks_depth = None
+                self._depth -= 1
+
+        if self._item_start is None and self._key_start is None:
+            # Разобранный текст больше не нужен
+            self._buffer = []
+            self._offset = self._position
+        return completed
+
+    def _slice(self, start: int, end: int) -> str:
+        text = "".join(self._buffer)
+        self._buffer = [text]
+        return text[start - self._offset:end - self._offset]
@@ -0,0 +1,379 @@
+import json
+import os
+import re
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
+
+from api.schemas.schedule.filters_response_schema import DateTimeRange, TaskFilterSchema
+from api.task.schemas.task.task_status_schema import TaskStatusSchema
+from core import metrics
+
+# Ниже этого порога запрос передается в LLM (define_filters_prompt)
+FILTERS_PARSER_MIN_CONFIDENCE = float(
+    os.getenv("FILTERS_PARSER_MIN_CONFIDENCE", "0.75"))
+
+# Формы дней недели в единственном числе целиком: основа с \w*
+# совпала бы с другими словами ("сред" — "среди")
+WEEKDAYS = {
+    "понедельник(?:а|у|ом|е)?": 0,
+    "вторник(?:а|у|ом|е)?": 1,
+    "сред(?:а|у|ы|е|ой)": 2,
+    "четверг(?:а|у|ом|е)?": 3,
+    "пятниц(?:а|у|ы|е|ей)": 4,
+    "суббот(?:а|у|ы|е|ой)": 5,
+    "воскресень(?:е|я|ю|ем)": 6,
+}
+WEEKDAY_PATTERN = "|".join(WEEKDAYS)
+
+MONTHS = {
+    "января": 1,
+    "февраля": 2,
+    "марта": 3,
+    "апреля": 4,
+    "мая": 5,
+    "июня": 6,
+    "июля": 7,
+    "августа": 8,
+    "сентября": 9,
+    "октября": 10,
+    "ноября": 11,
+    "декабря": 12,
+}
+
+NUMBERS = {
+    "один": 1,
+    "одну": 1,
+    "два": 2,
+    "две": 2,
+    "три": 3,
+    "четыре": 4,
+    "пять": 5,
+    "шесть": 6,
+    "семь": 7,
+}
+
+RELATIVE_DAYS = {
+    "позавчера": -2,
+    "вчера": -1,
+    "сегодня": 0,
+    "завтра": 1,
+    "послезавтра": 2,
+}
+
+# Части дня в формате (начало, конец) как в примере define_filters_prompt
+DAY_PARTS = {
+    "утр": (time(6, 0), time(12, 0)),
+    "днем": (time(12, 0), time(18, 0)),
+    "вечер": (time(18, 0), time(23, 59, 59)),
+    "ночью": (time(0, 0), time(6, 0)),
+}
+
+# Фиксированный словарь mark из define_filters_prompt
+MARK_PATTERNS = [
+    (r"звон\w*|созвон\w*|позвонить", "call"),
+    (r"рабоч\w*|работ\w*", "work"),
+    (r"отдых\w*", "rest"),
+    (r"спорт\w*|тренировк\w*", "sport"),
+    (r"проект\w*", "projects"),
+]
+
+STATUS_PATTERNS = [
+    (r"не\s+(?:выполненн|завершенн|сделанн)\w*", TaskStatusSchema.created),
+    (r"(?:невыполненн|незавершенн|несделанн|активн|открыт)\w*", TaskStatusSchema.created),
+    (r"(?:выполненн|завершенн|сделанн|законченн)\w*", TaskStatusSchema.completed),
+]
+
+STOPWORDS = {
+    "а", "и", "в", "во", "на", "по", "у", "с", "за", "про", "для",
+    "я", "мне", "меня", "мои", "мой", "моя", "мое", "все", "всех", "весь",
+    "покажи", "показать", "выведи", "найди", "какие", "какая", "какой",
+    "что", "есть", "будет", "было", "нужно", "надо", "список", "пожалуйста",
+    "задачи", "задача", "задачу", "задач", "дела", "дел", "план", "планы",
+    "расписание", "запланировано", "запланированы", "мероприятия",
+}
+
+# Слова, которые означают дату или время, но не разбираются правилами:
+# такие запросы всегда передаются в LLM
+TEMPORAL_STEMS = ("недел", "месяц", "год", "час", "минут", "числ", "сутк",
+                  "полдень", "полноч", "квартал", "утр", "вечер", "ноч")
+
+# Перенос задач требует искать задачи не в указанную дату (см. prompt),
+# поэтому такие запросы разбирает LLM
+FALLBACK_PATTERN = re.compile(
+    r"\b(?:перенес\w*|перенест\w*|передвин\w*|сдвин\w*|кроме|не\s+в)\b")
+
+
+class FiltersParser:
+    """
+    Детерминированный разбор русскоязычных запросов в TaskFilterSchema.
+    Покрывает относительные дни, дни недели, недели, выходные, месяцы,
+    явные даты, периоды "с ... по ..." и "ДД.ММ - ДД.ММ" из дней недели
+    или дат, части дня, словарь mark и статус. Возвращает фильтры
+    вместе с уверенностью, при низкой уверенности нужно обращаться к LLM.
+    """
+
+    def __init__(self):
+        self._hits = metrics.counter("filters_parser_hits_total")
+        self._fallbacks = metrics.counter("filters_parser_fallbacks_total")
+
+    def parse(self, request: str, now: datetime) -> Tuple[Optional[TaskFilterSchema], float]:
+        """
+        Разбирает запрос пользователя.
+
+        Returns:
+            Tuple[Optional[TaskFilterSchema], float]: Фильтры (None, если запрос
+            не удалось разобрать) и уверенность от 0 до 1
+        """
+        text = _normalize(request)
+        if FALLBACK_PATTERN.search(text):
+            return None, 0.0
+
+        parser = _RequestParse(text, now.date())
+        try:
+            parser.run()
+        except ValueError:
+            return None, 0.0
+
+        return parser.filters(), parser.confidence()
+
+    def parse_confident(self, request: str, now: datetime) -> Optional[TaskFilterSchema]:
+        """Возвращает фильтры, только если уверенность выше порога, и учитывает hit rate"""
+        filters, confidence = self.parse(request, now)
+        if filters is None or confidence < FILTERS_PARSER_MIN_CONFIDENCE:
+            self._fallbacks.inc()
+            return None
+
+        self._hits.inc()
+        return filters
+
+
+class _RequestParse:
+    def __init__(self, text: str, today: date):
+        self.text = text
+        self.today = today
+        self.consumed: List[Tuple[int, int]] = []
+        self.day_range: Optional[Tuple[date, date]] = None
+        self.day_part: Optional[Tuple[time, time]] = None
+        self.mark: Optional[str] = None
+        self.status: Optional[TaskStatusSchema] = None
+
+    def run(self):
+        self._ranges()
+        self._relative_days()
+        self._in_days()
+        self._weeks()
+        self._weekends()
+        self._months()
+        self._weekdays()
+        self._explicit_dates()
+        self._day_parts()
+        self._status()
+        self._marks()
+
+    def filters(self) -> TaskFilterSchema:
+        start_day, end_day = self.day_range or (self.today, self.today)
+        start_time, end_time = self.day_part or (time.min, time(23, 59, 59))
+
+        return TaskFilterSchema(
+            start_time=DateTimeRange(
+                gte=datetime.combine(start_day, start_time),
+                lte=datetime.combine(end_day, end_time),
+            ),
+            mark=self.mark,
+            status=self.status,
+        )
+
+    def confidence(self) -> float:
+        known = 0
+        unknown = 0
+        for match in re.finditer(r"[а-яa-z0-9]+", self.text):
+            if self._is_consumed(match.start()):
+                known += 1
+                continue
+
+            word = match.group()
+            if word in STOPWORDS:
+                continue
+            if word.isdigit() or word.startswith(TEMPORAL_STEMS):
+                # Нераспознанная дата: нельзя вернуть фильтры без нее
+                return 0.0
+            unknown += 1
+
+        if known + unknown == 0:
+            return 1.0
+        return known / (known + unknown)
+
+    # --- правила ---
+
+    def _ranges(self):
+        for match in self._find(
+                r"\bс\s+(" + WEEKDAY_PATTERN + r")\s+по\s+(" + WEEKDAY_PATTERN + r")\b"):
+            start = _weekday_index(match.group(1))
+            end = _weekday_index(match.group(2))
+            # Ближайший такой период, который еще не закончился
+            monday = self.today - timedelta(days=self.today.weekday())
+            start_day = monday + timedelta(days=start)
+            end_day = monday + timedelta(days=end if end >= start else end + 7)
+            if end_day < self.today:
+                start_day += timedelta(weeks=1)
+                end_day += timedelta(weeks=1)
+            self._set_range(start_day, end_day)
+
+        numeric = r"(\d{1,2})\.(\d{1,2})(?:\.(\d{2}|\d{4}))?"
+        for match in self._find(
+                r"\b(?:с\s+)?" + numeric + r"(?:\s*[-–—]\s*|\s+по\s+)" + numeric + r"\b"):
+            self._set_date_range(
+                self._numeric_date(*match.group(1, 2, 3)),
+                self._numeric_date(*match.group(4, 5, 6)))
+
+        months = "|".join(MONTHS)
+        pattern = (r"\bс\s+(\d{1,2})(?:\s+(" + months + r"))?\s+по\s+(\d{1,2})\s+("
+                   + months + r")(?:\s+(\d{4}))?\b")
+        for match in self._find(pattern):
+            year = int(match.group(5)) if match.group(5) else self.today.year
+            end_month = MONTHS[match.group(4)]
+            start_month = MONTHS[match.group(2)] if match.group(2) else end_month
+            self._set_date_range(
+                date(year, start_month, int(match.group(1))),
+                date(year, end_month, int(match.group(3))))
+
+    def _relative_days(self):
+        for match in self._find(r"\b(?:на\s+)?(позавчера|вчера|сегодня|послезавтра|завтра)\b"):
+            day = self.today + timedelta(days=RELATIVE_DAYS[match.group(1)])
+            self._set_range(day, day)
+
+    def _in_days(self):
+        pattern = r"\bчерез\s+(\d+|" + "|".join(NUMBERS) + r")\s+(?:день|дня|дней)\b"
+        for match in self._find(pattern):
+            value = match.group(1)
+            days = int(value) if value.isdigit() else NUMBERS[value]
+            day = self.today + timedelta(days=days)
+            self._set_range(day, day)
+
+        for match in self._find(r"\bчерез\s+неделю\b"):
+            day = self.today + timedelta(days=7)
+            self._set_range(day, day)
+
+    def _weeks(self):
+        for match in self._find(r"\b(?:на\s+)?(эт\w+|следующ\w+|прошл\w+)\s+недел\w+\b"):
+            shift = _shift(match.group(1))
+            monday = self.today - timedelta(days=self.today.weekday()) + timedelta(weeks=shift)
+            self._set_range(monday, monday + timedelta(days=6))
+
+    def _weekends(self):
+        for match in self._find(r"\b(?:на\s+|в\s+)?(?:(эт\w+|следующ\w+|прошл\w+)\s+)?выходн\w+\b"):
+            shift = _shift(match.group(1)) if match.group(1) else 0
+            saturday = self.today + timedelta(days=5 - self.today.weekday()) + timedelta(weeks=shift)
+            self._set_range(saturday, saturday + timedelta(days=1))
+
+    def _months(self):
+        for match in self._find(r"\b(?:в\s+)?(эт\w+|следующ\w+|прошл\w+)\s+месяц\w*\b"):
+            shift = _shift(match.group(1))
+            month_index = self.today.year * 12 + self.today.month - 1 + shift
+            first_day = date(month_index // 12, month_index % 12 + 1, 1)
+            next_index = month_index + 1
+            last_day = date(next_index // 12, next_index % 12 + 1, 1) - timedelta(days=1)
+            self._set_range(first_day, last_day)
+
+    def _weekdays(self):
+        pattern = (r"\b(?:(?:в|во|на)\s+)?(?:(эт\w+|следующ\w+|прошл\w+)\s+)?("
+                   + WEEKDAY_PATTERN + r")\b")
+        for match in self._find(pattern):
+            weekday = _weekday_index(match.group(2))
+            if match.group(1):
+                monday = self.today - timedelta(days=self.today.weekday())
+                day = monday + timedelta(weeks=_shift(match.group(1)), days=weekday)
+            else:
+                # Ближайший такой день, включая сегодняшний
+                day = self.today + timedelta(days=(weekday - self.today.weekday()) % 7)
+            self._set_range(day, day)
+
+    def _explicit_dates(self):
+        for match in self._find(r"\b(\d{1,2})\.(\d{1,2})(?:\.(\d{2}|\d{4}))?\b"):
+            day = self._numeric_date(*match.groups())
+            self._set_range(day, day)
+
+        pattern = r"\b(?:на\s+)?(\d{1,2})\s+(" + "|".join(MONTHS) + r")(?:\s+(\d{4}))?\b"
+        for match in self._find(pattern):
+            year = int(match.group(3)) if match.group(3) else self.today.year
+            day = date(year, MONTHS[match.group(2)], int(match.group(1)))
+            self._set_range(day, day)
+
+    def _day_parts(self):
+        for match in self._find(r"\b(?:с\s+утра|утром|днем|вечером|ночью)\b"):
+            word = match.group().split()[-1]
+            key = next(stem for stem in DAY_PARTS if word.startswith(stem))
+            if self.day_part is not None and self.day_part != DAY_PARTS[key]:
+                raise ValueError("Несколько частей дня в запросе")
+            self.day_part = DAY_PARTS[key]
+
+    def _status(self):
+        for pattern, status in STATUS_PATTERNS:
+            for match in self._find(r"\b(?:" + pattern + r")\b"):
+                if self.status is not None and self.status != status:
+                    raise ValueError("Несколько статусов в запросе")
+                self.status = status
+
+    def _marks(self):
+        for pattern, mark in MARK_PATTERNS:
+            for match in self._find(r"\b(?:" + pattern + r")\b"):
+                if self.mark is not None and self.mark != mark:
+                    raise ValueError("Несколько mark в запросе")
+                self.mark = mark
+
+    # --- вспомогательные методы ---
+
+    def _find(self, pattern: str):
+        """Совпадения, не пересекающиеся с уже разобранными фрагментами"""
+        for match in re.finditer(pattern, self.text):
+            if any(match.start() < end and start < match.end() for start, end in self.consumed):
+                continue
+            self.consumed.append(match.span())
+            yield match
+
+    def _numeric_date(self, day: str, month: str, year: Optional[str]) -> date:
+        if year is None:
+            return date(self.today.year, int(month), int(day))
+        return date(int(year) + (2000 if len(year) == 2 else 0), int(month), int(day))
+
+    def _set_date_range(self, start: date, end: date):
+        if start > end:
+            # Период через границу года или опечатка: разбирает LLM
+            raise ValueError("Начало периода позже конца")
+        self._set_range(start, end)
+
+    def _is_consumed(self, position: int) -> bool:
+        return any(start <= position < end for start, end in self.consumed)
+
+    def _set_range(self, start: date, end: date):
+        if self.day_range is not None and self.day_range != (start, end):
+            # Несколько разных дат вне распознанного периода: разбирает LLM
+            raise ValueError("Несколько дат в запросе")
+        self.day_range = (start, end)
+
+
+def _normalize(request: str) -> str:
+    """Приводит запрос к нижнему регистру; аргументы tool call содержат JSON"""
+    try:
+        arguments = json.loads(request)
+        if isinstance(arguments, dict) and isinstance(arguments.get("request"), str):
+            request = arguments["request"]
+    except ValueError:
+        pass
+
+    return request.lower().replace("ё", "е")
+
+
+def _weekday_index(word: str) -> int:
+    return next(index for pattern, index in WEEKDAYS.items() if re.fullmatch(pattern, word))
+
+
+def _shift(word: str) -> int:
+    if word.startswith("следующ"):
+        return 1
+    if word.startswith("прошл"):
+        return -1
+    return 0
+
+
+filters_parser = FiltersParser()
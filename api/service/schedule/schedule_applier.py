@@ -0,0 +1,158 @@
+import logging
+from typing import List, Tuple
+
+from fastapi import Depends, HTTPException, status
+
+from api.schemas.schedule.applied_schedule_schema import AppliedScheduleSchema
+from api.schemas.schedule.edited_schedule_schema import EditedScheduleSchema
+from api.schemas.schedule.edited_task_schema import EditedTaskSchema
+from api.task.schemas.task.task_batch_schema import TaskBatchUpdateItemSchema
+from api.task.schemas.task.task_create_schema import TaskCreateSchema
+from api.task.service.task_service import TaskService, get_task_service
+
+logger = logging.getLogger(__name__)
+
+# Действия edit_schedule (см. edit_schedule_prompt)
+EDIT_ACTIONS = ("CREATED", "UPDATED", "DELETED", "READ")
+
+
+class ScheduleApplier:
+    """
+    Применяет результат edit_schedule в одной транзакции: действия
+    проверяются целиком, затем выполняются пакетные DELETE, UPDATE и INSERT
+    TaskService. Фиксация транзакции выполняется в get_db, при ошибке
+    не применяется ни одно действие
+    """
+
+    def __init__(self, task_service: TaskService):
+        self.task_service = task_service
+
+    async def apply(self, schedule: EditedScheduleSchema, user_id: str) -> AppliedScheduleSchema:
+        """
+        Raises:
+            HTTPException: 422 — некорректные действия, 428 — не передан
+                tasks_version, 409 — задачи изменились после редактирования
+                (tasks_version) или не найдены
+        """
+        creates, updates, deletes, reads = _group_actions(schedule.tasks)
+
+        if schedule.tasks_version is None:
+            # Без версии изменения применились бы поверх чужих правок
+            raise HTTPException(
+                status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+                detail="Не передан tasks_version из ответа POST /schedule",
+            )
+
+        # Строка пользователя заблокирована до конца транзакции:
+        # версия не изменится между проверкой и записью
+        current_version = await self.task_service.get_tasks_version(
+            user_id, for_update=True)
+        if current_version != schedule.tasks_version:
+            logger.info(
+                f"Расписание устарело: user_id={user_id}, версия "
+                f"{schedule.tasks_version}, текущая {current_version}")
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Задачи изменились после редактирования, повторите запрос",
+            )
+
+        existing = await self.task_service.get_tasks_by_ids(
+            [task.id for task in updates] + deletes + reads, user_id)
+        missing = [task_id for task_id in [task.id for task in updates] + deletes + reads
+                   if task_id not in existing]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Задачи не найдены: {', '.join(missing)}",
+            )
+
+        if deletes:
+            await self.task_service.delete_tasks(deletes, user_id)
+        if updates:
+            for result in (await self.task_service.update_tasks(updates, user_id)).results:
+                existing[result.id] = result.task
+        created = []
+        if creates:
+            created = [result.task for result in
+                       (await self.task_service.create_tasks(creates, user_id)).results]
+
+        # Итоговое расписание в порядке действий edit_schedule
+        created_tasks = iter(created)
+        tasks = []
+        for edited_task in schedule.tasks:
+            if edited_task.action == "CREATED":
+                tasks.append(next(created_tasks))
+            elif edited_task.action != "DELETED":
+                tasks.append(existing[edited_task.edited_task.id])
+
+        logger.info(
+            f"Расписание применено: user_id={user_id}, создано {len(creates)}, "
+            f"изменено {len(updates)}, удалено {len(deletes)}")
+        return AppliedScheduleSchema(
+            tasks=tasks,
+            tasks_version=await self.task_service.get_tasks_version(user_id),
+        )
+
+
+def _group_actions(
+    edited_tasks: List[EditedTaskSchema],
+) -> Tuple[List[TaskCreateSchema], List[TaskBatchUpdateItemSchema], List[str], List[str]]:
+    """
+    Проверяет действия и раскладывает их по видам: задачи для создания,
+    изменения, ID для удаления и для чтения
+
+    Raises:
+        HTTPException: 422, если действие неизвестно, у существующей задачи
+            нет ID или одна задача встречается несколько раз
+    """
+    creates, updates, deletes, reads = [], [], [], []
+    seen = set()
+    for index, edited_task in enumerate(edited_tasks):
+        task = edited_task.edited_task
+        if edited_task.action not in EDIT_ACTIONS:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Неизвестное действие {edited_task.action!r} (задача {index})",
+            )
+
+        if edited_task.action == "CREATED":
+            creates.append(TaskCreateSchema(
+                title=task.title,
+                description=task.description,
+                date=task.date,
+                status=task.status,
+            ))
+            continue
+
+        if not task.id:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Не указан ID задачи для действия {edited_task.action} (задача {index})",
+            )
+        if task.id in seen:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Задача {task.id} встречается несколько раз",
+            )
+        seen.add(task.id)
+
+        if edited_task.action == "UPDATED":
+            updates.append(TaskBatchUpdateItemSchema(
+                id=task.id,
+                title=task.title,
+                description=task.description,
+                date=task.date,
+                status=task.status,
+            ))
+        elif edited_task.action == "DELETED":
+            deletes.append(task.id)
+        else:
+            reads.append(task.id)
+
+    return creates, updates, deletes, reads
+
+
+def get_schedule_applier(
+    task_service: TaskService = Depends(get_task_service),
+) -> ScheduleApplier:
+    return ScheduleApplier(task_service)
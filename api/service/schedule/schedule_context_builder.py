@@ -0,0 +1,154 @@
+import json
+import math
+import os
+from datetime import datetime
+from typing import List, Optional
+
+from api.schemas.schedule.filters_response_schema import TaskFilterSchema
+from api.task.schemas.task.task_response_schema import TaskResponseSchema
+from api.task.service.task_filters_compiler import RANGE_COLUMNS
+from database.models.task.task_model import TaskStatusModel
+
+# Жесткий лимит токенов на задачи в одном запросе edit_schedule
+EDIT_SCHEDULE_CONTEXT_TOKENS = int(
+    os.getenv("EDIT_SCHEDULE_CONTEXT_TOKENS", "3000"))
+
+# Колонки табличной кодировки задач, в порядке TaskResponseSchema
+TASK_COLUMNS = list(TaskResponseSchema.model_fields)
+
+# Средняя длина токена: латиница, цифры и JSON-разметка кодируются
+# примерно по 4 символа, кириллица — примерно по 2
+ASCII_CHARS_PER_TOKEN = 4
+NON_ASCII_CHARS_PER_TOKEN = 2
+
+
+def estimate_tokens(text: str) -> int:
+    """Приблизительная оценка числа токенов текста без токенизатора"""
+    non_ascii = sum(1 for char in text if ord(char) > 127)
+    ascii_chars = len(text) - non_ascii
+    return math.ceil(
+        ascii_chars / ASCII_CHARS_PER_TOKEN
+        + non_ascii / NON_ASCII_CHARS_PER_TOKEN
+    )
+
+
+class ScheduleContextBuilder:
+    """
+    Собирает пользовательское сообщение для edit_schedule.
+
+    Задачи кодируются таблицей: список колонок один раз и по строке
+    значений на задачу, без отступов и экранирования кириллицы. Если задачи
+    не помещаются в бюджет токенов, они упорядочиваются по релевантности
+    (близость даты, совпадение с фильтрами, статус): в первый запрос
+    попадают самые релевантные, остальные делятся на последующие части.
+    """
+
+    def __init__(self, token_budget: int = EDIT_SCHEDULE_CONTEXT_TOKENS):
+        self.token_budget = token_budget
+
+    def build(
+        self,
+        request: str,
+        tasks: Optional[List[TaskResponseSchema]],
+        filters: Optional[TaskFilterSchema] = None,
+        now: Optional[datetime] = None,
+    ) -> List[str]:
+        """
+        Returns:
+            List[str]: Сообщения для LLM; первое содержит самые релевантные задачи
+        """
+        if not tasks:
+            return [self._encode(request, None)]
+
+        now = now or datetime.now()
+        rows = [
+            _encode_task(task)
+            for task in sorted(
+                tasks,
+                key=lambda task: self._relevance(task, filters, now),
+                reverse=True,
+            )
+        ]
+
+        base_tokens = estimate_tokens(self._encode(request, []))
+        chunks: List[List[list]] = [[]]
+        chunk_tokens = base_tokens
+        for row in rows:
+            row_tokens = estimate_tokens(_dumps(row)) + 1
+            if chunks[-1] and chunk_tokens + row_tokens > self.token_budget:
+                chunks.append([])
+                chunk_tokens = base_tokens
+            chunks[-1].append(row)
+            chunk_tokens += row_tokens
+
+        return [self._encode(request, chunk) for chunk in chunks]
+
+    def _encode(self, request: str, rows: Optional[List[list]]) -> str:
+        tasks = None
+        if rows is not None:
+            tasks = {"columns": TASK_COLUMNS, "rows": rows}
+        return _dumps({"user_request": request, "tasks": tasks})
+
+    def _relevance(
+        self,
+        task: TaskResponseSchema,
+        filters: Optional[TaskFilterSchema],
+        now: datetime,
+    ) -> float:
+        reference = _filters_center(filters) or now
+        days = abs((task.date - reference).total_seconds()) / 86400
+        score = 1 / (1 + days)
+
+        if filters is not None:
+            if filters.status is not None and task.status.value == filters.status.value:
+                score += 0.5
+            if filters.start_time is not None and _in_range(task.date, filters.start_time):
+                score += 1
+
+        # Выполненные задачи редко редактируются
+        if task.status == TaskStatusModel.created:
+            score += 0.25
+
+        return score
+
+
+def _encode_task(task: TaskResponseSchema) -> list:
+    values = task.model_dump(mode="json")
+    return [_compact(values[column]) for column in TASK_COLUMNS]
+
+
+def _compact(value):
+    # 2025-04-01T10:00:00 -> 2025-04-01T10:00
+    if isinstance(value, str) and len(value) == 19 and value[10] == "T" and value.endswith(":00"):
+        return value[:16]
+    return value
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _filters_center(filters: Optional[TaskFilterSchema]) -> Optional[datetime]:
+    """Середина первого заданного временного диапазона фильтров"""
+    if filters is None:
+        return None
+
+    for field in RANGE_COLUMNS:
+        value = getattr(filters, field)
+        if isinstance(value, datetime):
+            return value
+        if value is not None and value.gte is not None and value.lte is not None:
+            return value.gte + (value.lte - value.gte) / 2
+        if value is not None and (value.gte or value.lte):
+            return value.gte or value.lte
+    return None
+
+
+def _in_range(moment: datetime, value) -> bool:
+    if isinstance(value, datetime):
+        return moment.date() == value.date()
+    return ((value.gte is None or moment >= value.gte)
+            and (value.lte is None or moment <= value.lte))
+
+
+schedule_context_builder = ScheduleContextBuilder()
@@ -1,31 +1,83 @@
-from fastapi import Depends
-from openai import OpenAI
+from fastapi import Depends, HTTPException, status
+import asyncio
 import json
+import os
 import logging
-from sqlalchemy import and_, or_
+import time
+from datetime import datetime
+from typing import AsyncIterator, Optional, Tuple
+from sqlalchemy import select
 
 from api.schemas.schedule.edited_schedule_schema import EditedScheduleSchema
+from api.schemas.schedule.edited_task_schema import EditedTaskSchema
 from api.schemas.schedule.filters_response_schema import TaskFilterSchema
-from api.schemas.task.task_response_schema import TaskResponseSchema
+from api.task.schemas.task.task_response_schema import TaskResponseSchema
 from api.service.schedule.edit_schedule_prompt import edit_schedule_prompt
 from api.service.schedule.schedule_service_prompt import schedule_service_prompt
 from api.service.schedule.define_filters_prompt import define_filters_prompt
-from sqlalchemy.orm import Session
+from api.service.schedule.edited_tasks_stream_parser import EditedTasksStreamParser
+from api.service.schedule.filters_parser import filters_parser
+from api.service.schedule.schedule_context_builder import (
+    estimate_tokens,
+    schedule_context_builder,
+)
+from api.task.service.task_filters_compiler import compile_task_filters
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.database import get_db
 from database.models.task.task_model import TaskModel
-from dependencies import get_open_ai_client
+from database.models.user.user_model import UserModel
+from core import metrics
+from core.dependencies import get_open_ai_client
+from core.llm_client import LLMClient
 
 logger = logging.getLogger(__name__)
 
+# Сколько частей контекста edit_schedule отправлять в LLM,
+# если задачи не помещаются в бюджет токенов одной части.
+# Если частей больше, запрос отклоняется (422)
+EDIT_SCHEDULE_MAX_CHUNKS = int(os.getenv("EDIT_SCHEDULE_MAX_CHUNKS", "3"))
+
 
 class ScheduleService:
-    def __init__(self, client: OpenAI, db_session: Session):
+    def __init__(self, client: LLMClient, db_session: AsyncSession):
         self.client = client
         self.db_session = db_session
+        self._first_task_seconds = metrics.gauge(
+            "edit_schedule_first_task_seconds")
+        self._streamed_tasks = metrics.counter(
+            "edit_schedule_stream_tasks_total")
 
     async def request(self, request: str, user_id: str) -> EditedScheduleSchema:
-        response = self.client.chat.completions.create(
+        # Версия читается до задач: изменение между чтениями даст
+        # лишний 409 при применении, но не потерю изменений
+        tasks_version = await self.get_tasks_version(user_id)
+        edit_request, tasks, filters_schema = await self.prepare_edit(
+            request, user_id)
+        schedule_response = await self.edit_schedule(
+            edit_request,
+            user_id,
+            tasks,
+            filters_schema,
+        )
+        schedule_response.tasks_version = tasks_version
+        logger.debug(f"Получен ответ от edit_schedule: {schedule_response}")
+        return schedule_response
+
+    async def prepare_edit(
+        self,
+        request: str,
+        user_id: str,
+    ) -> Tuple[str, Optional[list[TaskResponseSchema]], Optional[TaskFilterSchema]]:
+        """
+        Выбор инструмента по запросу пользователя и загрузка задач из БД.
+
+        Returns:
+            Tuple: Запрос для edit_schedule, задачи пользователя и фильтры,
+            по которым они получены (None, если задачи не запрашивались)
+        """
+        response = await self.client.chat_completion(
+            user_id,
             model="gpt-4o",
             messages=[
                 {
@@ -107,127 +159,67 @@ class ScheduleService:
             for tool_call in tool_calls:
                 if tool_call.function.name == "get_tasks_by_user_request":
                     logger.debug("Выполняется get_tasks_by_user_request")
-                    tasks = await self.get_tasks_by_user_request(
+                    filters_schema = await self.define_filters(
                         tool_call.function.arguments,
                         user_id,
                     )
+                    tasks = await self.get_tasks_by_filters(
+                        filters_schema,
+                        user_id,
+                    )
                     logger.debug(f"Получено задач: {len(tasks)}")
 
                     logger.debug("Передача задач в edit_schedule")
-                    schedule_response = await self.edit_schedule(
-                        tool_call.function.arguments,
-                        tasks,
-                    )
-                    logger.debug(
-                        f"Получен ответ от edit_schedule: {schedule_response}",
-                    )
-                    return schedule_response
+                    return tool_call.function.arguments, tasks, filters_schema
 
                 elif tool_calls[0].function.name == "edit_schedule":
                     logger.debug("Прямой вызов edit_schedule")
-                    return await self.edit_schedule(tool_call.function.arguments)
-        else:
-            logger.debug(
-                "Функция не вызвана, выполняется edit_schedule напрямую",
-            )
-            return await self.edit_schedule(request, user_id)
+                    return tool_call.function.arguments, None, None
+
+        logger.debug(
+            "Функция не вызвана, выполняется edit_schedule напрямую",
+        )
+        return request, None, None
 
     async def get_tasks_by_user_request(self, request: str, user_id: str) -> list[TaskResponseSchema]:
         logger.debug(
             f"Получение задач по запросу. User ID: {user_id}, Request: {request}")
 
-        try:
-            # Получаем фильтры от GPT
-            logger.debug("Отправляем запрос к GPT для получения фильтров")
-            filters = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": define_filters_prompt,
-                            }
-                        ]
-                    },
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": request
-                            }
-                        ]
-                    }
-                ],
-                response_format={"type": "json_object"},
-                temperature=0,
-                max_completion_tokens=2048,
-                top_p=1,
-                frequency_penalty=0,
-                presence_penalty=0
-            )
+        filters_schema = await self.define_filters(request, user_id)
+        return await self.get_tasks_by_filters(filters_schema, user_id)
 
-            # Логируем ответ GPT
-            gpt_response = filters.choices[0].message.content
-            logger.debug(f"Получен ответ от GPT: {gpt_response}")
+    async def get_tasks_version(self, user_id: str) -> int:
+        """Версия задач пользователя для проверки в POST /schedule/apply"""
+        result = await self.db_session.execute(
+            select(UserModel.tasks_version).where(UserModel.id == user_id))
+        return result.scalar_one()
 
-            # Парсим фильтры
-            logger.debug("Парсинг фильтров в схему")
-            filters_json = json.loads(filters.choices[0].message.content)
-            filters_schema = TaskFilterSchema(
-                **filters_json["filters"],
-            )
-            logger.debug(f"Полученные фильтры: {filters_schema}")
+    async def define_filters(self, request: str, user_id: str) -> TaskFilterSchema:
+        """Формирование фильтров задач по запросу пользователя"""
+        # Частые формулировки разбираются локально, без запроса к GPT
+        filters_schema = filters_parser.parse_confident(
+            request, datetime.now())
+        if filters_schema is None:
+            filters_schema = await self._define_filters_gpt(request, user_id)
+        logger.debug(f"Полученные фильтры: {filters_schema}")
+
+        return filters_schema
 
+    async def get_tasks_by_filters(
+        self,
+        filters_schema: TaskFilterSchema,
+        user_id: str,
+    ) -> list[TaskResponseSchema]:
+        """Получение задач пользователя по фильтрам"""
+        try:
             # Формируем запрос к БД
             logger.debug("Формирование запроса к БД с фильтрами")
-            tasks = self.db_session.query(TaskModel).filter(
+            query = select(TaskModel).where(
                 TaskModel.user_id == user_id,
-                # Для start_time
-                or_(
-                    and_(
-                        filters_schema.start_time is not None,
-                        filters_schema.start_time.gte is not None,
-                        TaskModel.start_time >= filters_schema.start_time.gte
-                    ),
-                    and_(
-                        filters_schema.start_time is not None,
-                        filters_schema.start_time.lte is not None,
-                        TaskModel.start_time <= filters_schema.start_time.lte
-                    )
-                ) if filters_schema.start_time else True,
-                # Для end_time
-                or_(
-                    and_(
-                        filters_schema.end_time is not None,
-                        filters_schema.end_time.gte is not None,
-                        TaskModel.end_time >= filters_schema.end_time.gte
-                    ),
-                    and_(
-                        filters_schema.end_time is not None,
-                        filters_schema.end_time.lte is not None,
-                        TaskModel.end_time <= filters_schema.end_time.lte
-                    )
-                ) if filters_schema.end_time else True,
-                # Для reminder
-                or_(
-                    and_(
-                        filters_schema.reminder is not None,
-                        filters_schema.reminder.gte is not None,
-                        TaskModel.reminder >= filters_schema.reminder.gte
-                    ),
-                    and_(
-                        filters_schema.reminder is not None,
-                        filters_schema.reminder.lte is not None,
-                        TaskModel.reminder <= filters_schema.reminder.lte
-                    )
-                ) if filters_schema.reminder else True,
-                # Для mark и status
-                TaskModel.mark == filters_schema.mark if filters_schema.mark else True,
-                TaskModel.status == filters_schema.status if filters_schema.status else True
-            ).all()
+                *compile_task_filters(filters_schema),
+            )
+            result = await self.db_session.execute(query)
+            tasks = result.scalars().all()
             logger.debug(f"Найдено задач: {len(tasks)}")
 
             # Преобразуем в схему ответа
@@ -241,53 +233,190 @@ class ScheduleService:
                 f"Ошибка при получении задач: {str(e)}", exc_info=True)
             raise
 
-    async def edit_schedule(self, request: str, tasks: list[TaskResponseSchema] = None) -> EditedScheduleSchema:
+    async def _define_filters_gpt(self, request: str, user_id: str) -> TaskFilterSchema:
+        """Формирование фильтров задач через GPT (define_filters_prompt)"""
+        # Получаем фильтры от GPT
+        logger.debug("Отправляем запрос к GPT для получения фильтров")
+        filters = await self.client.chat_completion(
+            user_id,
+            model="gpt-4o",
+            messages=[
+                {
+                    "role": "system",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": define_filters_prompt,
+                        }
+                    ]
+                },
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": request
+                        }
+                    ]
+                }
+            ],
+            response_format={"type": "json_object"},
+            temperature=0,
+            max_completion_tokens=2048,
+            top_p=1,
+            frequency_penalty=0,
+            presence_penalty=0
+        )
+
+        # Логируем ответ GPT
+        gpt_response = filters.choices[0].message.content
+        logger.debug(f"Получен ответ от GPT: {gpt_response}")
+
+        # Парсим фильтры
+        logger.debug("Парсинг фильтров в схему")
+        filters_json = json.loads(filters.choices[0].message.content)
+        return TaskFilterSchema(
+            **filters_json["filters"],
+        )
+
+    async def edit_schedule(
+        self,
+        request: str,
+        user_id: str,
+        tasks: list[TaskResponseSchema] = None,
+        filters: TaskFilterSchema = None,
+    ) -> EditedScheduleSchema:
         logger.debug(f"Начало edit_schedule. Request: {request}")
         logger.debug(
             f"Количество переданных задач: {len(tasks) if tasks else 'None'}")
 
+        contexts = self._edit_schedule_contexts(request, tasks, filters)
+        chunk_slots = self._chunk_slots()
+
+        async def edit_chunk(context: str) -> EditedScheduleSchema:
+            async with chunk_slots:
+                return await self._edit_schedule_chunk(context, user_id)
+
+        chunk_schedules = await asyncio.gather(*[
+            edit_chunk(context) for context in contexts
+        ])
+
+        # Новые задачи создаются только по первой части,
+        # иначе каждая часть продублировала бы их
+        edited_tasks = list(chunk_schedules[0].tasks)
+        for chunk_schedule in chunk_schedules[1:]:
+            edited_tasks.extend(
+                edited_task for edited_task in chunk_schedule.tasks
+                if edited_task.action != "CREATED"
+            )
+
+        return EditedScheduleSchema(tasks=edited_tasks)
+
+    async def edit_schedule_stream(
+        self,
+        request: str,
+        user_id: str,
+        tasks: list[TaskResponseSchema] = None,
+        filters: TaskFilterSchema = None,
+    ) -> AsyncIterator[EditedTaskSchema]:
+        """
+        Потоковый edit_schedule: каждая задача отдается, как только ее объект
+        полностью получен из стрима OpenAI. Части контекста обрабатываются
+        параллельно, задачи отдаются в порядке готовности
+        """
+        logger.debug(f"Начало edit_schedule_stream. Request: {request}")
+        contexts = self._edit_schedule_contexts(request, tasks, filters)
+        chunk_slots = self._chunk_slots()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def produce(index: int, json_request: str):
+            parser = EditedTasksStreamParser()
+            try:
+                async with chunk_slots:
+                    async for text in self.client.chat_completion_stream(
+                        user_id,
+                        **_edit_schedule_params(json_request),
+                    ):
+                        for edited_task in parser.feed(text):
+                            # Новые задачи создаются только по первой части
+                            if index == 0 or edited_task.action != "CREATED":
+                                await queue.put(edited_task)
+            except Exception as e:
+                logger.error(
+                    f"Ошибка в edit_schedule_stream: {str(e)}", exc_info=True)
+                await queue.put(e)
+                return
+            await queue.put(None)
+
+        started = time.perf_counter()
+        producers = [
+            asyncio.create_task(produce(index, context))
+            for index, context in enumerate(contexts)
+        ]
         try:
-            # Преобразуем TaskResponseSchema в dict для JSON сериализации
-            tasks_json = [task.model_dump_json()
-                          for task in tasks] if tasks else None
-
-            # Подготовка данных для запроса
-            request_data = {
-                "user_request": request,
-                "tasks": tasks_json
-            }
+            remaining = len(producers)
+            first_task = True
+            while remaining:
+                item = await queue.get()
+                if item is None:
+                    remaining -= 1
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+
+                if first_task:
+                    first_task = False
+                    self._first_task_seconds.set(
+                        round(time.perf_counter() - started, 3))
+                self._streamed_tasks.inc()
+                yield item
+        finally:
+            # Клиент отключился или произошла ошибка: закрываем остальные стримы
+            for producer in producers:
+                producer.cancel()
 
-            json_request = json.dumps(request_data, indent=2)
+    def _edit_schedule_contexts(
+        self,
+        request: str,
+        tasks: Optional[list[TaskResponseSchema]],
+        filters: Optional[TaskFilterSchema],
+    ) -> list[str]:
+        """
+        Raises:
+            HTTPException: 422, если задачи не помещаются
+                в EDIT_SCHEDULE_MAX_CHUNKS частей
+        """
+        # Компактный контекст в пределах бюджета токенов:
+        # самые релевантные задачи идут в первую часть
+        contexts = schedule_context_builder.build(request, tasks, filters)
+        if len(contexts) > EDIT_SCHEDULE_MAX_CHUNKS:
+            # Без части задач ассистент вернул бы неполное расписание
+            logger.warning(
+                f"edit_schedule: задачи не поместились в {EDIT_SCHEDULE_MAX_CHUNKS} "
+                f"частей (нужно {len(contexts)})")
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Запрос затрагивает слишком много задач, уточните период",
+            )
+        return contexts
+
+    def _chunk_slots(self) -> asyncio.Semaphore:
+        """
+        Одновременно обрабатывается не больше частей, чем разрешено запросов
+        пользователя в LLMClient: иначе лишние части ждали бы слот и получали 429
+        """
+        return asyncio.Semaphore(self.client.max_concurrency_per_user)
+
+    async def _edit_schedule_chunk(self, json_request: str, user_id: str) -> EditedScheduleSchema:
+        gpt_response = None
+        try:
             logger.debug(f"edit_schedule JSON Request: {json_request}")
+            logger.debug(
+                f"edit_schedule: оценка токенов запроса {estimate_tokens(json_request)}")
 
-            edited_schedule = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": edit_schedule_prompt,
-                            }
-                        ]
-                    },
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": json_request
-                            }
-                        ]
-                    }
-                ],
-                response_format={"type": "json_object"},
-                temperature=0,
-                max_completion_tokens=2048,
-                top_p=1,
-                frequency_penalty=0,
-                presence_penalty=0
+            edited_schedule = await self.client.chat_completion(
+                user_id,
+                **_edit_schedule_params(json_request),
             )
 
             # Получение и парсинг ответа
@@ -320,8 +449,41 @@ class ScheduleService:
             raise
 
 
+def _edit_schedule_params(json_request: str) -> dict:
+    """Параметры запроса к OpenAI для edit_schedule"""
+    return dict(
+        model="gpt-4o",
+        messages=[
+            {
+                "role": "system",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": edit_schedule_prompt,
+                    }
+                ]
+            },
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": json_request
+                    }
+                ]
+            }
+        ],
+        response_format={"type": "json_object"},
+        temperature=0,
+        max_completion_tokens=2048,
+        top_p=1,
+        frequency_penalty=0,
+        presence_penalty=0
+    )
+
+
 def get_schedule_service(
-    client: OpenAI = Depends(get_open_ai_client),
-    db_session: Session = Depends(get_db),
+    client: LLMClient = Depends(get_open_ai_client),
+    db_session: AsyncSession = Depends(get_db),
 ) -> ScheduleService:
     return ScheduleService(client, db_session)
@@ -1,10 +1,20 @@
-from typing import List, Optional
-from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+from datetime import date, datetime
 from fastapi import Depends, HTTPException, status
 from api.task.schemas.task.task_response_schema import TaskResponseSchema
 from api.task.schemas.task.task_create_schema import TaskCreateSchema
 from api.task.schemas.task.task_response_gpt_schema import TaskResponseGptSchema
 from api.task.schemas.task.task_update_schema import TaskUpdateSchema
+from api.task.schemas.task.task_changes_response_schema import TaskChangesResponseSchema
+from api.task.schemas.task.task_batch_schema import (
+    TaskBatchUpdateItemSchema,
+    TasksBatchResponseSchema,
+)
+from api.task.schemas.task.task_filters_schema import TaskFiltersSchema
+from api.task.schemas.task.task_range_response_schema import (
+    TaskCountsRangeResponseSchema,
+    TasksRangeResponseSchema,
+)
 from api.task.service.task_service import TaskService, get_task_service
 import logging
 
@@ -29,9 +39,69 @@ class TaskRepository:
         """
         self.task_service = task_service
 
-    async def search_by_query(self, query: str, user_id: str) -> List[TaskResponseSchema]:
+    async def create_tasks(self, tasks: List[TaskCreateSchema], user_id: str) -> TasksBatchResponseSchema:
+        """Создает задачи пакетом в одной транзакции"""
+        return await self.task_service.create_tasks(tasks, user_id)
+
+    async def update_tasks(
+        self,
+        items: List[TaskBatchUpdateItemSchema],
+        user_id: str,
+    ) -> TasksBatchResponseSchema:
+        """Изменяет задачи пакетом в одной транзакции"""
+        return await self.task_service.update_tasks(items, user_id)
+
+    async def delete_tasks(self, task_ids: List[str], user_id: str) -> TasksBatchResponseSchema:
+        """Удаляет задачи пакетом в одной транзакции"""
+        return await self.task_service.delete_tasks(task_ids, user_id)
+
+    async def search_by_query(self, query: str, user_id: str, limit: int = 10) -> List[TaskResponseSchema]:
         """Поиск задач по запросу"""
-        return await self.task_service.search_by_query(query, user_id)
+        return await self.task_service.search_by_query(query, user_id, limit)
+
+    async def full_text_search(
+        self,
+        query: str,
+        user_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[TaskResponseSchema], Optional[str]]:
+        """Поиск задач по словам запроса с учетом опечаток"""
+        return await self.task_service.full_text_search(query, user_id, limit, cursor)
+
+    async def list_tasks(
+        self,
+        user_id: str,
+        filters: TaskFiltersSchema,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[TaskResponseSchema], Optional[str]]:
+        """Страница задач пользователя в порядке (date, id)"""
+        return await self.task_service.list_tasks(user_id, filters, limit, cursor)
+
+    async def list_tasks_json(
+        self,
+        user_id: str,
+        filters: TaskFiltersSchema,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> bytes:
+        """Страница задач готовым JSON, собранным в PostgreSQL"""
+        return await self.task_service.list_tasks_json(user_id, filters, limit, cursor)
+
+    def uses_db_json(self, endpoint: str) -> bool:
+        """Собирать ли ответ эндпоинта в JSON на стороне PostgreSQL"""
+        return self.task_service.uses_db_json(endpoint)
+
+    def stream_tasks(
+        self,
+        user_id: str,
+        filters: TaskFiltersSchema,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator:
+        """Задачи пользователя в порядке (date, id) потоком из серверного курсора"""
+        return self.task_service.stream_tasks(user_id, filters, cursor, limit)
 
     async def generate_task_gpt(self, request: str) -> TaskResponseGptSchema:
         """
@@ -183,6 +253,47 @@ class TaskRepository:
                 f"Repository: Ошибка при получении задач: {str(e)}", exc_info=True)
             raise
 
+    async def get_tasks_by_date_json(self, date: datetime, status: TaskStatusModel, user_id: str) -> bytes:
+        """Задачи на день готовым JSON, собранным в PostgreSQL"""
+        return await self.task_service.get_tasks_by_date_json(date, status, user_id)
+
+    async def get_tasks_by_date_etag(self, date: datetime, status: TaskStatusModel, user_id: str) -> str:
+        """ETag задач на день для условного GET"""
+        return await self.task_service.get_tasks_by_date_etag(date, status, user_id)
+
+    async def get_task_etag(self, task_id: str, user_id: str) -> str:
+        """ETag задачи для условного GET"""
+        return await self.task_service.get_task_etag(task_id, user_id)
+
+    async def get_tasks_by_range(
+        self,
+        user_id: str,
+        date_from: date,
+        date_to: date,
+        status: Optional[TaskStatusModel] = None,
+    ) -> TasksRangeResponseSchema:
+        """Задачи за период по дням"""
+        return await self.task_service.get_tasks_by_range(user_id, date_from, date_to, status)
+
+    async def count_tasks_by_range(
+        self,
+        user_id: str,
+        date_from: date,
+        date_to: date,
+        status: Optional[TaskStatusModel] = None,
+    ) -> TaskCountsRangeResponseSchema:
+        """Количество задач за период по дням, статусам и меткам"""
+        return await self.task_service.count_tasks_by_range(user_id, date_from, date_to, status)
+
+    async def get_changes(
+        self,
+        user_id: str,
+        since: Optional[str],
+        limit: int,
+    ) -> TaskChangesResponseSchema:
+        """Изменения задач после курсора синхронизации"""
+        return await self.task_service.get_changes(user_id, since, limit)
+
 
 def get_task_repository(
     task_service: TaskService = Depends(get_task_service)
@@ -1,27 +1,118 @@
-from fastapi import APIRouter, Depends, Query
-from typing import Annotated, List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Literal, Optional, Union
 import logging
-from datetime import datetime
+from datetime import date, datetime
 
 from api.task.repository.task_repository import TaskRepository, get_task_repository
 from api.task.schemas.task.task_response_schema import TaskResponseSchema
 from api.task.schemas.task.task_create_schema import TaskCreateSchema
 from api.task.schemas.task.task_update_schema import TaskUpdateSchema
 from api.task.schemas.task.task_list_response_schema import TasksResponseSchema
+from api.task.schemas.task.task_page_response_schema import TasksPageResponseSchema
+from api.task.schemas.task.task_changes_response_schema import TaskChangesResponseSchema
+from api.task.schemas.task.task_batch_schema import (
+    TasksBatchCreateSchema,
+    TasksBatchDeleteSchema,
+    TasksBatchResponseSchema,
+    TasksBatchUpdateSchema,
+)
+from api.task.schemas.task.task_filters_schema import TaskFiltersSchema
+from api.task.schemas.task.task_range_response_schema import (
+    TaskCountsRangeResponseSchema,
+    TasksRangeResponseSchema,
+)
+from api.schemas.range_filter import RangeFilter
 from api.auth.middleware.auth_middleware import get_current_user
 from database.models.task.task_model import TaskStatusModel
-from database.models.user.user_model import UserModel
+from api.auth.schemas.current_user_schema import CurrentUserSchema
+from core.etag import conditional_responses
+from core.json_response import FastJSONResponse, FastJSONRoute, dump_json
 
 # Настраиваем логгер для этого модуля
 logger = logging.getLogger(__name__)
 
-router = APIRouter(tags=["tasks"])
+router = APIRouter(tags=["tasks"], route_class=FastJSONRoute)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Размер страницы списка задач, если limit не указан
+TASKS_PAGE_DEFAULT_LIMIT = 50
+
+
+def _range_filter(
+    name: str,
+    exact: Optional[datetime],
+    gte: Optional[datetime],
+    lte: Optional[datetime],
+):
+    if exact is not None and (gte is not None or lte is not None):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Укажите либо {name}, либо {name}_gte/{name}_lte",
+        )
+    if gte is not None or lte is not None:
+        return RangeFilter(gte=gte, lte=lte)
+    return exact
+
+
+def get_task_filters(
+    start_time: Optional[datetime] = None,
+    start_time_gte: Optional[datetime] = None,
+    start_time_lte: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    end_time_gte: Optional[datetime] = None,
+    end_time_lte: Optional[datetime] = None,
+    reminder: Optional[datetime] = None,
+    reminder_gte: Optional[datetime] = None,
+    reminder_lte: Optional[datetime] = None,
+    mark: Optional[str] = None,
+    status: Optional[TaskStatusModel] = None,
+) -> TaskFiltersSchema:
+    """
+    TaskFiltersSchema из параметров запроса: точное значение поля
+    (start_time=...) или диапазон (start_time_gte=...&start_time_lte=...)
+    """
+    return TaskFiltersSchema(
+        start_time=_range_filter("start_time", start_time, start_time_gte, start_time_lte),
+        end_time=_range_filter("end_time", end_time, end_time_gte, end_time_lte),
+        reminder=_range_filter("reminder", reminder, reminder_gte, reminder_lte),
+        mark=mark,
+        status=status,
+    )
+
+
+@router.get("/tasks", response_model=TasksPageResponseSchema)
+async def list_tasks(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, max_length=1000),
+    filters: TaskFiltersSchema = Depends(get_task_filters),
+    current_user: CurrentUserSchema = Depends(get_current_user),
+    task_repository: TaskRepository = Depends(get_task_repository)
+):
+    """
+    Список задач пользователя в порядке (date, id) с фильтрами.
+    По умолчанию — страница с курсором следующей страницы. С заголовком
+    Accept: application/x-ndjson — все задачи после курсора (или не больше
+    limit) потоком, по одному JSON-объекту в строке
+    """
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        rows = task_repository.stream_tasks(current_user.id, filters, cursor, limit)
+        return StreamingResponse(_ndjson_lines(rows), media_type=NDJSON_MEDIA_TYPE)
+
+    if task_repository.uses_db_json("list"):
+        return FastJSONResponse(await task_repository.list_tasks_json(
+            current_user.id, filters, limit or TASKS_PAGE_DEFAULT_LIMIT, cursor))
+
+    tasks, next_cursor = await task_repository.list_tasks(
+        current_user.id, filters, limit or TASKS_PAGE_DEFAULT_LIMIT, cursor)
+    return FastJSONResponse({"tasks": tasks, "next_cursor": next_cursor})
 
 
 @router.post("/tasks", response_model=TaskResponseSchema)
 async def create_task(
     task: TaskCreateSchema,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: CurrentUserSchema = Depends(get_current_user),
     task_repository: TaskRepository = Depends(get_task_repository)
 ):
     """Создание новой задачи"""
@@ -31,31 +122,150 @@ async def create_task(
         raise
 
 
+@router.post("/tasks/batch", response_model=TasksBatchResponseSchema)
+async def create_tasks_batch(
+    batch: TasksBatchCreateSchema,
+    current_user: CurrentUserSchema = Depends(get_current_user),
+    task_repository: TaskRepository = Depends(get_task_repository)
+):
+    """
+    Создание задач пакетом (импорт плана) в одной транзакции.
+    Результаты — в порядке задач запроса
+    """
+    return FastJSONResponse(await task_repository.create_tasks(batch.tasks, current_user.id))
+
+
+@router.patch("/tasks/batch", response_model=TasksBatchResponseSchema)
+async def update_tasks_batch(
+    batch: TasksBatchUpdateSchema,
+    current_user: CurrentUserSchema = Depends(get_current_user),
+    task_repository: TaskRepository = Depends(get_task_repository)
+):
+    """
+    Изменение задач пакетом в одной транзакции: у каждой задачи
+    меняются только переданные поля. Ненайденные — status=not_found
+    """
+    return FastJSONResponse(await task_repository.update_tasks(batch.tasks, current_user.id))
+
+
+@router.delete("/tasks/batch", response_model=TasksBatchResponseSchema)
+async def delete_tasks_batch(
+    batch: TasksBatchDeleteSchema,
+    current_user: CurrentUserSchema = Depends(get_current_user),
+    task_repository: TaskRepository = Depends(get_task_repository)
+):
+    """Удаление задач пакетом в одной транзакции"""
+    return FastJSONResponse(await task_repository.delete_tasks(batch.ids, current_user.id))
+
+
 @router.patch("/tasks/{task_id}/complete", response_model=TaskResponseSchema)
 async def mark_task_completed(
     task_id: str,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: CurrentUserSchema = Depends(get_current_user),
     task_repository: TaskRepository = Depends(get_task_repository)
 ):
     """Отметить задачу как выполненную"""
     return await task_repository.mark_task_completed(task_id, current_user.id)
 
 
+@router.get("/tasks/search", response_model=TasksResponseSchema)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=500),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: CurrentUserSchema = Depends(get_current_user),
+    task_repository: TaskRepository = Depends(get_task_repository)
+):
+    """Семантический поиск задач по тексту запроса"""
+    tasks = await task_repository.search_by_query(q, current_user.id, limit)
+    return TasksResponseSchema(tasks=tasks)
+
+
+@router.get("/tasks/fts", response_model=TasksPageResponseSchema)
+async def full_text_search_tasks(
+    q: str = Query(..., min_length=1, max_length=500),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, max_length=1000),
+    current_user: CurrentUserSchema = Depends(get_current_user),
+    task_repository: TaskRepository = Depends(get_task_repository)
+):
+    """Поиск задач по словам запроса, устойчивый к опечаткам"""
+    tasks, next_cursor = await task_repository.full_text_search(
+        q, current_user.id, limit, cursor)
+    return FastJSONResponse({"tasks": tasks, "next_cursor": next_cursor})
+
+
+@router.get(
+    "/tasks/range",
+    response_model=Union[TasksRangeResponseSchema, TaskCountsRangeResponseSchema],
+)
+async def get_tasks_by_range(
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    group: Literal["day"] = Query("day"),
+    counts: bool = Query(False),
+    status: Optional[TaskStatusModel] = Query(None),
+    current_user: CurrentUserSchema = Depends(get_current_user),
+    task_repository: TaskRepository = Depends(get_task_repository)
+):
+    """
+    Задачи за период (from и to включительно) по дням одним запросом —
+    для недельного и месячного календаря. С counts=true — только количество
+    задач по статусам и меткам на каждый день
+    """
+    if counts:
+        return FastJSONResponse(await task_repository.count_tasks_by_range(
+            current_user.id, date_from, date_to, status))
+    return FastJSONResponse(await task_repository.get_tasks_by_range(
+        current_user.id, date_from, date_to, status))
+
+
+@router.get("/tasks/changes", response_model=TaskChangesResponseSchema)
+async def get_task_changes(
+    since: Optional[str] = Query(None, max_length=1000),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: CurrentUserSchema = Depends(get_current_user),
+    task_repository: TaskRepository = Depends(get_task_repository)
+):
+    """
+    Синхронизация: задачи, созданные или измененные после курсора since,
+    и ID удаленных. Клиент сохраняет next_cursor и, пока has_more,
+    сразу запрашивает следующую порцию. 410 — курсор устарел,
+    нужна полная синхронизация (запрос без since)
+    """
+    return FastJSONResponse(await task_repository.get_changes(current_user.id, since, limit))
+
+
 @router.get("/tasks/{task_id}", response_model=TaskResponseSchema)
 async def get_task(
     task_id: str,
+    request: Request,
     task_repository: TaskRepository = Depends(get_task_repository),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: CurrentUserSchema = Depends(get_current_user)
 ):
-    """Получение задачи по ID"""
-    return await task_repository.get_task_by_id(task_id, current_user.id)
+    """
+    Получение задачи по ID. Поддерживает If-None-Match (ответ 304).
+    404 — задачи нет или она принадлежит другому пользователю
+    """
+    etag = await task_repository.get_task_etag(task_id, current_user.id)
+    not_modified = conditional_responses.not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+
+    task = await task_repository.get_task_by_id(task_id, current_user.id)
+    if task is None:
+        # Удалена между запросами ETag и задачи
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Задача не найдена",
+        )
+    return conditional_responses.respond(etag, dump_json(task))
 
 
 @router.put("/tasks/{task_id}", response_model=TaskResponseSchema)
 async def update_task(
     task_id: str,
     task: TaskUpdateSchema,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: CurrentUserSchema = Depends(get_current_user),
     task_repository: TaskRepository = Depends(get_task_repository)
 ):
     """Обновление задачи"""
@@ -65,7 +275,7 @@ async def update_task(
 @router.delete("/tasks/{task_id}", response_model=dict)
 async def delete_task(
     task_id: str,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: CurrentUserSchema = Depends(get_current_user),
     task_repository: TaskRepository = Depends(get_task_repository)
 ):
     """Удаление задачи"""
@@ -75,11 +285,35 @@ async def delete_task(
 
 @router.get("/tasks/by-date/", response_model=TasksResponseSchema)
 async def get_tasks_by_date(
+    request: Request,
     date: datetime = Query(...),
     status: TaskStatusModel = Query(TaskStatusModel.created),
-    current_user: UserModel = Depends(get_current_user),
+    current_user: CurrentUserSchema = Depends(get_current_user),
     task_repository: TaskRepository = Depends(get_task_repository)
 ):
-    """Получение задач на конкретный день"""
+    """
+    Получение задач на конкретный день. Поддерживает If-None-Match:
+    если задачи пользователя не менялись, ответ 304 без тела
+    """
+    etag = await task_repository.get_tasks_by_date_etag(date, status, current_user.id)
+    not_modified = conditional_responses.not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+
+    if task_repository.uses_db_json("by_date"):
+        return conditional_responses.respond(
+            etag, await task_repository.get_tasks_by_date_json(date, status, current_user.id))
+
     tasks = await task_repository.get_tasks_by_date(date, status, current_user.id)
-    return TasksResponseSchema(tasks=tasks)
+    return conditional_responses.respond(etag, dump_json({"tasks": tasks}))
+
+
+async def _ndjson_lines(rows: AsyncIterator) -> AsyncIterator[bytes]:
+    # Ответ уже начат: при ошибке соединение обрывается без завершающего
+    # chunk, и клиент видит, что выдача неполная
+    try:
+        async for row in rows:
+            yield dump_json(dict(row)) + b"\n"
+    except Exception as e:
+        logger.error(f"Ошибка потоковой выдачи задач: {str(e)}", exc_info=True)
+        raise
@@ -0,0 +1,72 @@
+import os
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, model_validator
+from api.task.schemas.task.task_create_schema import TaskCreateSchema
+from api.task.schemas.task.task_response_schema import TaskResponseSchema
+from api.task.schemas.task.task_update_schema import TaskUpdateSchema
+
+# Больше задач за один пакетный запрос не принимается (422)
+TASKS_BATCH_MAX_SIZE = int(os.getenv("TASKS_BATCH_MAX_SIZE", "1000"))
+
+# Поля задачи, которые нельзя сбросить в null
+NOT_NULL_FIELDS = ("title", "date", "status")
+
+
+def _check_unique_ids(ids: List[str]):
+    if len(set(ids)) != len(ids):
+        raise ValueError("ID задач в пакете не должны повторяться")
+
+
+class TasksBatchCreateSchema(BaseModel):
+    """Пакет новых задач"""
+    tasks: List[TaskCreateSchema] = Field(..., min_length=1, max_length=TASKS_BATCH_MAX_SIZE)
+
+
+class TaskBatchUpdateItemSchema(TaskUpdateSchema):
+    """Изменение одной задачи пакета: ID и поля, которые нужно изменить"""
+    id: str
+
+    @model_validator(mode="after")
+    def check_not_null(self):
+        # Явный null в NOT NULL колонке оборвал бы весь пакет ошибкой БД
+        nulls = [
+            field for field in NOT_NULL_FIELDS
+            if field in self.model_fields_set and getattr(self, field) is None
+        ]
+        if nulls:
+            raise ValueError(f"Поля не могут быть null: {', '.join(nulls)}")
+        return self
+
+
+class TasksBatchUpdateSchema(BaseModel):
+    """Пакет изменений задач"""
+    tasks: List[TaskBatchUpdateItemSchema] = Field(
+        ..., min_length=1, max_length=TASKS_BATCH_MAX_SIZE)
+
+    @model_validator(mode="after")
+    def check_unique_ids(self):
+        _check_unique_ids([task.id for task in self.tasks])
+        return self
+
+
+class TasksBatchDeleteSchema(BaseModel):
+    """ID задач для удаления"""
+    ids: List[str] = Field(..., min_length=1, max_length=TASKS_BATCH_MAX_SIZE)
+
+    @model_validator(mode="after")
+    def check_unique_ids(self):
+        _check_unique_ids(self.ids)
+        return self
+
+
+class TaskBatchItemResultSchema(BaseModel):
+    """Результат для одного элемента пакета, в порядке запроса"""
+    id: str
+    status: Literal["created", "updated", "deleted", "not_found"]
+    # Задача после создания или изменения
+    task: Optional[TaskResponseSchema] = None
+
+
+class TasksBatchResponseSchema(BaseModel):
+    """Результаты пакетной операции"""
+    results: List[TaskBatchItemResultSchema]
@@ -0,0 +1,15 @@
+from typing import List
+from pydantic import BaseModel
+from api.task.schemas.task.task_response_schema import TaskResponseSchema
+
+
+class TaskChangesResponseSchema(BaseModel):
+    """Изменения задач после курсора синхронизации"""
+    # Созданные и измененные задачи
+    tasks: List[TaskResponseSchema]
+    # ID удаленных задач
+    deleted: List[str]
+    # Курсор для следующего запроса, клиент сохраняет его всегда
+    next_cursor: str
+    # True — изменений больше, чем вошло в ответ, запросить сразу
+    has_more: bool
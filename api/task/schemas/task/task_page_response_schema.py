@@ -0,0 +1,10 @@
+from typing import List, Optional
+from pydantic import BaseModel
+from api.task.schemas.task.task_response_schema import TaskResponseSchema
+
+
+class TasksPageResponseSchema(BaseModel):
+    """Страница списка задач с курсором следующей страницы"""
+    tasks: List[TaskResponseSchema]
+    # None — страница последняя
+    next_cursor: Optional[str] = None
@@ -0,0 +1,30 @@
+from datetime import date
+from typing import Dict, List
+from pydantic import BaseModel
+from api.task.schemas.task.task_response_schema import TaskResponseSchema
+
+
+class TasksDaySchema(BaseModel):
+    """Задачи одного дня"""
+    day: date
+    tasks: List[TaskResponseSchema]
+
+
+class TasksRangeResponseSchema(BaseModel):
+    """Задачи за период по дням, включая дни без задач"""
+    days: List[TasksDaySchema]
+
+
+class TaskCountsDaySchema(BaseModel):
+    """Количество задач одного дня"""
+    day: date
+    total: int
+    # Статус -> количество задач
+    by_status: Dict[str, int]
+    # Метка -> количество задач (задачи без метки не учитываются)
+    by_mark: Dict[str, int]
+
+
+class TaskCountsRangeResponseSchema(BaseModel):
+    """Количество задач за период по дням, включая дни без задач"""
+    days: List[TaskCountsDaySchema]
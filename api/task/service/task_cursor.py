@@ -0,0 +1,59 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Sequence
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Курсор keyset pagination: значения ключа сортировки последней
+    отданной строки в base64 (url-safe), для клиента непрозрачен
+    """
+    data = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values],
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    """
+    Args:
+        cursor: Курсор из encode_cursor
+        types: Ожидаемые типы значений (для float допускается int,
+            datetime передается строкой ISO 8601)
+
+    Raises:
+        HTTPException: Если курсор поврежден или не соответствует types
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        if isinstance(values, list) and len(values) == len(types):
+            values = [
+                datetime.fromisoformat(value)
+                if type_ is datetime and isinstance(value, str) else value
+                for value, type_ in zip(values, types)
+            ]
+    except ValueError:
+        values = None
+
+    if not (
+        isinstance(values, list)
+        and len(values) == len(types)
+        and all(_is_instance(value, type_) for value, type_ in zip(values, types))
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный курсор",
+        )
+    return values
+
+
+def _is_instance(value: Any, type_: type) -> bool:
+    if type_ is float:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return isinstance(value, type_)
@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import List, Union
+
+from sqlalchemy import false
+from sqlalchemy.sql.elements import ColumnElement
+
+from api.schemas.schedule.filters_response_schema import TaskFilterSchema
+from api.task.schemas.task.task_filters_schema import TaskFiltersSchema
+from database.models.task.task_model import TaskModel, TaskStatusModel
+
+# Поля-диапазоны фильтра и соответствующие колонки.
+# Для каждой есть индекс (user_id, <колонка>)
+RANGE_COLUMNS = {
+    "start_time": TaskModel.start_time,
+    "end_time": TaskModel.end_time,
+    "reminder": TaskModel.reminder,
+}
+
+
+def compile_task_filters(
+    filters: Union[TaskFilterSchema, TaskFiltersSchema],
+) -> List[ColumnElement[bool]]:
+    """
+    Преобразует фильтры задач в минимальный набор условий WHERE.
+
+    Отсутствующие поля не порождают условий. Точное значение datetime
+    сравнивается на равенство, диапазон дает границы gte/lte, объединенные
+    через AND. Пустой диапазон (gte > lte) превращается в FALSE.
+
+    Returns:
+        List[ColumnElement[bool]]: Условия для select(...).where(*conditions)
+    """
+    conditions: List[ColumnElement[bool]] = []
+
+    for field, column in RANGE_COLUMNS.items():
+        value = getattr(filters, field)
+        if value is None:
+            continue
+
+        if isinstance(value, datetime):
+            conditions.append(column == value)
+            continue
+
+        if value.gte is not None and value.lte is not None and value.gte > value.lte:
+            return [false()]
+        if value.gte is not None:
+            conditions.append(column >= value.gte)
+        if value.lte is not None:
+            conditions.append(column <= value.lte)
+
+    if filters.mark is not None:
+        conditions.append(TaskModel.mark == filters.mark)
+
+    if filters.status is not None:
+        # TaskFilterSchema использует TaskStatusSchema, значения совпадают
+        conditions.append(
+            TaskModel.status == TaskStatusModel(filters.status.value))
+
+    return conditions
@@ -0,0 +1,247 @@
+import asyncio
+import logging
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, or_, select, update
+
+from api.task.service.task_search_index import (
+    TaskSearchIndex,
+    task_document,
+    task_search_index,
+)
+from core import metrics
+from database.database import SessionLocal
+from database.models.task.task_index_outbox_model import TaskIndexOutboxModel
+from database.models.task.task_model import TaskModel
+
+logger = logging.getLogger(__name__)
+
+TASK_INDEXER_ENABLED = os.getenv("TASK_INDEXER_ENABLED", "true").lower() == "true"
+TASK_INDEXER_BATCH_SIZE = int(os.getenv("TASK_INDEXER_BATCH_SIZE", "256"))
+# Пауза между опросами пустой очереди
+TASK_INDEXER_POLL_SECONDS = float(os.getenv("TASK_INDEXER_POLL_SECONDS", "0.5"))
+TASK_INDEXER_MAX_BACKOFF = float(os.getenv("TASK_INDEXER_MAX_BACKOFF", "30"))
+# На сколько пачка занимается индексатором. Если процесс упал,
+# после этого срока пачку обработает другой
+TASK_INDEXER_LEASE_SECONDS = float(os.getenv("TASK_INDEXER_LEASE_SECONDS", "120"))
+
+
+class TaskIndexer:
+    """
+    Фоновый перенос изменений задач из task_index_outbox в Qdrant.
+
+    Записи занимаются пачками через FOR UPDATE SKIP LOCKED и locked_until,
+    поэтому несколько процессов приложения могут работать параллельно, а
+    транзакция не держится открытой на время векторизации. Изменения
+    одной задачи схлопываются, актуальные тексты читаются из tasks одним
+    запросом и векторизуются одним вызовом модели. Upsert и удаление точек
+    идемпотентны: при сбое пачка остается в очереди и повторяется целиком.
+
+    Записи одной задачи могут попасть в пачки разных индексаторов, и
+    upsert по прочитанной ранее задаче может завершиться после удаления
+    ее точки. Поэтому после upsert задачи перечитываются: точки удаленных
+    задач удаляются, измененные задачи ставятся в очередь повторно.
+    """
+
+    def __init__(
+        self,
+        search_index: TaskSearchIndex = task_search_index,
+        batch_size: int = TASK_INDEXER_BATCH_SIZE,
+        poll_interval: float = TASK_INDEXER_POLL_SECONDS,
+    ):
+        self.search_index = search_index
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._task: Optional[asyncio.Task] = None
+
+        self._lag = metrics.gauge("task_index_outbox_lag_seconds")
+        self._batch_size = metrics.gauge("task_indexer_batch_size")
+        self._upserted = metrics.counter("task_indexer_upserted_total")
+        self._deleted = metrics.counter("task_indexer_deleted_total")
+        self._errors = metrics.counter("task_indexer_errors_total")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self):
+        logger.info("Индексатор задач запущен")
+        failures = 0
+        while True:
+            try:
+                processed = await self.process_batch()
+                failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._errors.inc()
+                failures += 1
+                delay = random.uniform(
+                    0, min(TASK_INDEXER_MAX_BACKOFF, self.poll_interval * (2 ** failures)))
+                logger.warning(
+                    f"Индексатор задач: ошибка обработки пачки ({str(e)}), "
+                    f"повтор через {delay:.1f} s")
+                await asyncio.sleep(delay)
+                continue
+
+            # Полная пачка — очередь, скорее всего, не пуста
+            if processed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    async def process_batch(self) -> int:
+        """
+        Обрабатывает одну пачку очереди. Транзакции короткие: пачка
+        занимается (locked_until) и фиксируется до векторизации и записи
+        в Qdrant, после них записи удаляются отдельной транзакцией
+
+        Returns:
+            int: Количество обработанных записей очереди
+        """
+        entries, tasks = await self._claim_batch()
+        if not entries:
+            self._lag.set(0)
+            self._batch_size.set(0)
+            return 0
+
+        self._lag.set(round(
+            (datetime.now() - entries[0].created_at).total_seconds(), 3))
+        self._batch_size.set(len(entries))
+        entry_ids = [entry.id for entry in entries]
+
+        try:
+            # Задача могла быть удалена после постановки в очередь
+            found_ids = {task.id for task in tasks}
+            changed: List[TaskModel] = []
+            delete_ids = list({
+                entry.task_id: None for entry in entries
+                if entry.task_id not in found_ids
+            })
+
+            if tasks:
+                # Тексты, не изменившиеся с прошлой индексации, берутся из кэша
+                vectors = await self.search_index.embed_documents([
+                    task_document(task.title, task.description) for task in tasks
+                ])
+                await self.search_index.upsert(
+                    [task.id for task in tasks],
+                    [task.user_id for task in tasks],
+                    vectors,
+                    # Записи очереди удаляются только после применения точек
+                    wait=True,
+                )
+                self._upserted.inc(len(tasks))
+
+                # Upsert уже применен (wait=True), поэтому удаление или
+                # изменение задачи, зафиксированное до него, здесь видно
+                gone_ids, changed = await self._recheck(tasks)
+                delete_ids += gone_ids
+
+            if delete_ids:
+                await self.search_index.delete(delete_ids, wait=True)
+                self._deleted.inc(len(delete_ids))
+        except BaseException:
+            # Пачка сразу доступна для повтора, не дожидаясь конца аренды
+            await self._release_batch(entry_ids)
+            raise
+
+        async with SessionLocal() as session:
+            await session.execute(
+                delete(TaskIndexOutboxModel).where(TaskIndexOutboxModel.id.in_(entry_ids)))
+            session.add_all([
+                TaskIndexOutboxModel(task_id=task.id, user_id=task.user_id, operation="upsert")
+                for task in changed
+            ])
+            await session.commit()
+        return len(entries)
+
+    async def _claim_batch(self) -> Tuple[List, List[TaskModel]]:
+        """
+        Занимает пачку записей очереди (FOR UPDATE SKIP LOCKED) и читает
+        актуальные задачи для upsert. Транзакция фиксируется сразу
+
+        Returns:
+            Tuple: Записи очереди по возрастанию id и задачи для upsert
+        """
+        now = datetime.now()
+        claimable = select(TaskIndexOutboxModel.id).where(or_(
+            TaskIndexOutboxModel.locked_until.is_(None),
+            TaskIndexOutboxModel.locked_until < now,
+        )).order_by(TaskIndexOutboxModel.id).limit(
+            self.batch_size).with_for_update(skip_locked=True)
+
+        async with SessionLocal() as session:
+            result = await session.execute(
+                update(TaskIndexOutboxModel)
+                .where(TaskIndexOutboxModel.id.in_(claimable))
+                .values(locked_until=now + timedelta(seconds=TASK_INDEXER_LEASE_SECONDS))
+                .returning(
+                    TaskIndexOutboxModel.id,
+                    TaskIndexOutboxModel.task_id,
+                    TaskIndexOutboxModel.operation,
+                    TaskIndexOutboxModel.created_at,
+                )
+            )
+            entries = sorted(result.all(), key=lambda entry: entry.id)
+
+            # Последняя операция по каждой задаче
+            latest: Dict[str, str] = {}
+            for entry in entries:
+                latest[entry.task_id] = entry.operation
+            upsert_ids = [
+                task_id for task_id, operation in latest.items() if operation == "upsert"
+            ]
+            tasks: List[TaskModel] = []
+            if upsert_ids:
+                tasks_result = await session.execute(
+                    select(TaskModel).where(TaskModel.id.in_(upsert_ids)))
+                tasks = tasks_result.scalars().all()
+
+            await session.commit()
+        return entries, tasks
+
+    async def _recheck(self, tasks: List[TaskModel]) -> Tuple[List[str], List[TaskModel]]:
+        """
+        Перечитывает задачи после upsert
+
+        Returns:
+            Tuple: ID удаленных задач и задачи, измененные после чтения
+        """
+        async with SessionLocal() as session:
+            result = await session.execute(
+                select(TaskModel.id, TaskModel.updated_at)
+                .where(TaskModel.id.in_([task.id for task in tasks])))
+            current = dict(result.all())
+
+        gone_ids = [task.id for task in tasks if task.id not in current]
+        changed = [
+            task for task in tasks
+            if task.id in current and current[task.id] != task.updated_at
+        ]
+        return gone_ids, changed
+
+    async def _release_batch(self, entry_ids: List[int]):
+        try:
+            async with SessionLocal() as session:
+                await session.execute(
+                    update(TaskIndexOutboxModel)
+                    .where(TaskIndexOutboxModel.id.in_(entry_ids))
+                    .values(locked_until=None)
+                )
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Индексатор задач: не удалось освободить пачку ({str(e)})")
+
+
+task_indexer = TaskIndexer()
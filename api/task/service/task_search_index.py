@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import os
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
+
+from core.embedding_cache import CachedEmbedder, cached_embedder
+
+logger = logging.getLogger(__name__)
+
+QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
+# Путь для встроенного (локального) режима Qdrant без отдельного сервера
+QDRANT_PATH = os.getenv("QDRANT_PATH")
+QDRANT_COLLECTION = os.getenv("QDRANT_COLLECTION", "tasks")
+# Точность/скорость HNSW при поиске
+QDRANT_HNSW_EF = int(os.getenv("QDRANT_HNSW_EF", "64"))
+
+
+def task_document(title: str, description: Optional[str]) -> str:
+    """Текст задачи, по которому строится вектор"""
+    if description:
+        return f"{title}\n{description}"
+    return title
+
+
+class TaskSearchIndex:
+    """
+    Векторный индекс задач в Qdrant.
+
+    ID точки совпадает с ID задачи, в payload хранится только user_id:
+    по нему есть индекс, и каждый поиск ограничен задачами пользователя.
+    Граф HNSW строится по пользователям (payload_m), а не по всей коллекции,
+    так как поиск без фильтра по user_id не выполняется.
+    """
+
+    def __init__(
+        self,
+        collection_name: str = QDRANT_COLLECTION,
+        embedder: CachedEmbedder = cached_embedder,
+    ):
+        self.collection_name = collection_name
+        self.embedder = embedder
+        self._client: Optional[AsyncQdrantClient] = None
+        self._ready = False
+        self._ready_lock = asyncio.Lock()
+
+    @property
+    def client(self) -> AsyncQdrantClient:
+        if self._client is None:
+            if QDRANT_PATH:
+                self._client = AsyncQdrantClient(path=QDRANT_PATH)
+            else:
+                self._client = AsyncQdrantClient(url=QDRANT_URL)
+        return self._client
+
+    async def ensure_collection(
+        self,
+        collection_name: Optional[str] = None,
+        dimension: Optional[int] = None,
+    ):
+        """Создает коллекцию и индекс по user_id, если их еще нет"""
+        collection_name = collection_name or self.collection_name
+        collections = await self.client.get_collections()
+        existing = {collection.name for collection in collections.collections}
+        aliases = await self.client.get_aliases()
+        existing.update(alias.alias_name for alias in aliases.aliases)
+        if collection_name in existing:
+            return
+
+        logger.info(f"Создание коллекции Qdrant {collection_name}")
+        if dimension is None:
+            await self.embedder.load_info()
+        await self.client.create_collection(
+            collection_name=collection_name,
+            vectors_config=models.VectorParams(
+                size=dimension or self.embedder.dimension,
+                distance=models.Distance.COSINE,
+            ),
+            hnsw_config=models.HnswConfigDiff(payload_m=16, m=0),
+        )
+        await self.client.create_payload_index(
+            collection_name=collection_name,
+            field_name="user_id",
+            field_schema=models.PayloadSchemaType.KEYWORD,
+        )
+
+    async def embed_query(self, query: str) -> np.ndarray:
+        """Вектор поискового запроса; запросы не пишутся в постоянный кэш"""
+        vectors = await self.embedder.embed_async([query], persistent=False)
+        return vectors[0]
+
+    async def embed_documents(self, texts: List[str]) -> np.ndarray:
+        return await self.embedder.embed_async(texts)
+
+    async def search(
+        self,
+        user_id: str,
+        vector: np.ndarray,
+        limit: int,
+    ) -> List[Tuple[str, float]]:
+        """
+        Returns:
+            List[Tuple[str, float]]: ID задач и близость, по убыванию близости
+        """
+        await self._ensure_ready()
+        points = await self.client.search(
+            collection_name=self.collection_name,
+            query_vector=vector,
+            query_filter=_user_filter(user_id),
+            search_params=models.SearchParams(hnsw_ef=QDRANT_HNSW_EF),
+            limit=limit,
+            with_payload=False,
+        )
+        return [(str(point.id), point.score) for point in points]
+
+    async def upsert(
+        self,
+        task_ids: Sequence[str],
+        user_ids: Sequence[str],
+        vectors: np.ndarray,
+        collection_name: Optional[str] = None,
+        wait: bool = True,
+    ):
+        """
+        wait=True: ответ приходит после применения точек, а не после
+        приема запроса. Без этого очередь индексации и контрольная точка
+        переиндексации продвигались бы раньше фактической записи
+        """
+        await self._ensure_ready()
+        await self.client.upsert(
+            collection_name=collection_name or self.collection_name,
+            points=models.Batch(
+                ids=list(task_ids),
+                vectors=vectors.tolist(),
+                payloads=[{"user_id": user_id} for user_id in user_ids],
+            ),
+            wait=wait,
+        )
+
+    async def delete(self, task_ids: Sequence[str], wait: bool = True):
+        await self._ensure_ready()
+        await self.client.delete(
+            collection_name=self.collection_name,
+            # Через фильтр: отсутствующие ID не считаются ошибкой
+            # и во встроенном режиме Qdrant
+            points_selector=models.FilterSelector(filter=models.Filter(must=[
+                models.HasIdCondition(has_id=list(task_ids)),
+            ])),
+            wait=wait,
+        )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+            self._ready = False
+
+    async def _ensure_ready(self):
+        if self._ready:
+            return
+        async with self._ready_lock:
+            if not self._ready:
+                await self.ensure_collection()
+                self._ready = True
+
+
+def _user_filter(user_id: str) -> models.Filter:
+    return models.Filter(must=[
+        models.FieldCondition(
+            key="user_id",
+            match=models.MatchValue(value=user_id),
+        )
+    ])
+
+
+task_search_index = TaskSearchIndex()
@@ -1,28 +1,117 @@
 import logging
-from typing import List, Optional
+import os
+from typing import AsyncIterator, List, Optional, Tuple
 from uuid import uuid4
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 
 from fastapi import Depends, HTTPException, status
+from pydantic import TypeAdapter
 from sqlalchemy.future import select
-from sqlalchemy import update, delete
+from sqlalchemy import (
+    and_,
+    case,
+    cast,
+    column,
+    delete,
+    false,
+    func,
+    insert,
+    literal,
+    literal_column,
+    null,
+    or_,
+    true,
+    tuple_,
+    union_all,
+    update,
+    values,
+    String,
+    Text,
+)
+from sqlalchemy.sql import ColumnElement, Select
+from sqlalchemy.dialects.postgresql import TSVECTOR, aggregate_order_by
 from api.task.schemas.task.task_response_schema import TaskResponseSchema
 from api.task.schemas.task.task_create_schema import TaskCreateSchema
 from api.task.schemas.task.task_update_schema import TaskUpdateSchema
-from database.database import get_db
-from database.models.task.task_model import TaskModel, TaskStatusModel
-from sqlalchemy.orm import Session
+from api.task.schemas.task.task_changes_response_schema import TaskChangesResponseSchema
+from api.task.schemas.task.task_batch_schema import (
+    TaskBatchItemResultSchema,
+    TaskBatchUpdateItemSchema,
+    TasksBatchResponseSchema,
+)
+from api.task.schemas.task.task_filters_schema import TaskFiltersSchema
+from api.task.schemas.task.task_range_response_schema import (
+    TaskCountsDaySchema,
+    TaskCountsRangeResponseSchema,
+    TasksDaySchema,
+    TasksRangeResponseSchema,
+)
+from api.task.service.task_filters_compiler import compile_task_filters
+from database.database import SessionLocal, get_db
+from api.task.service.task_cursor import decode_cursor, encode_cursor
+from api.task.service.task_search_index import TaskSearchIndex, task_search_index
+from database.models.task.task_deletion_model import TaskDeletionModel
+from database.models.task.task_index_outbox_model import TaskIndexOutboxModel
+from database.models.task.task_model import TASK_SEARCH_VECTOR, TaskModel, TaskStatusModel
+from database.models.user.user_model import UserModel
+from core.etag import make_etag
+from core.json_response import dump_json
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Настраиваем логгер для этого модуля
 logger = logging.getLogger(__name__)
 
+# Сколько задач возвращает семантический поиск по умолчанию
+SEARCH_DEFAULT_LIMIT = 10
+# Порог сходства слов (pg_trgm word_similarity) для поиска с опечатками:
+# ниже — больше опечаток прощается, но больше лишних совпадений
+FTS_TYPO_THRESHOLD = float(os.getenv("FTS_TYPO_THRESHOLD", "0.5"))
+# Строк, которые серверный курсор передает за одно обращение
+# при потоковой выдаче списка задач
+TASKS_STREAM_BATCH_SIZE = int(os.getenv("TASKS_STREAM_BATCH_SIZE", "500"))
+
+# Изменения моложе этого окна не отдаются: транзакция с более ранним
+# updated_at может зафиксироваться позже, и курсор клиента ее бы пропустил
+TASK_CHANGES_SETTLE_SECONDS = float(os.getenv("TASK_CHANGES_SETTLE_SECONDS", "2"))
+# Сколько хранятся записи об удаленных задачах; клиенту с более старым
+# курсором нужна полная синхронизация
+TASK_TOMBSTONE_RETENTION_DAYS = int(os.getenv("TASK_TOMBSTONE_RETENTION_DAYS", "90"))
+
+# Самый длинный период выборки по дням (квартал)
+TASKS_RANGE_MAX_DAYS = 92
+
+# Колонки TaskResponseSchema: список задач читается без ORM-объектов
+TASK_RESPONSE_COLUMNS = (
+    TaskModel.id,
+    TaskModel.title,
+    TaskModel.description,
+    TaskModel.date,
+    TaskModel.status,
+)
+
+# Валидация списка задач одним вызовом вместо model_validate на строку
+TASKS_ADAPTER = TypeAdapter(List[TaskResponseSchema])
+
+# Эндпоинты, ответ которых собирает в JSON сам PostgreSQL (json_agg),
+# через запятую: list (GET /tasks), by_date (GET /tasks/by-date/).
+# Строки не проходят через ORM и pydantic; на других СУБД не действует
+TASKS_DB_JSON_ENDPOINTS = frozenset(
+    name.strip() for name in os.getenv("TASKS_DB_JSON_ENDPOINTS", "").split(",")
+    if name.strip()
+)
+
 
 class TaskService:
     def __init__(
         self,
-        db_session: Session,
+        db_session: AsyncSession,
+        search_index: TaskSearchIndex = task_search_index,
+        session_factory=SessionLocal,
     ):
         self.db_session = db_session
+        self.search_index = search_index
+        # Для потоковой выдачи: сессия запроса закрывается до отправки ответа
+        self.session_factory = session_factory
 
     async def create_task(
         self,
@@ -48,8 +137,9 @@ class TaskService:
             )
 
             self.db_session.add(new_task)
-            self.db_session.commit()
-            self.db_session.refresh(new_task)
+            self._enqueue_index(task_id, user_id, "upsert")
+            await self._bump_tasks_version(user_id)
+            # Фиксация — в get_db, одна на запрос
             # Создание ответа
             response = TaskResponseSchema(
                 id=task_id,
@@ -77,7 +167,7 @@ class TaskService:
                 TaskModel.id == task_id,
                 TaskModel.user_id == user_id,
             )
-            result = self.db_session.execute(query)
+            result = await self.db_session.execute(query)
             task = result.scalars().first()
 
             if task is None:
@@ -117,49 +207,371 @@ class TaskService:
         Returns:
             Optional[TaskResponseSchema]: Обновленная задача или None, если задача не найдена
         """
-        # Проверяем существование задачи
-        existing_task = await self.get_task_by_id(task_id, user_id)
-        if not existing_task:
-            logger.warning(
-                f"Задача не найдена: task_id={task_id}, user_id={user_id}")
-            return None
-
         # Подготавливаем данные для обновления
         update_task_params_dict = update_task_params.model_dump(
             exclude_unset=True
         )
         if not update_task_params_dict:
             logger.warning(f"Нет данных для обновления: task_id={task_id}")
-            return existing_task
+            return await self.get_task_by_id(task_id, user_id)
 
         # Добавляем время обновления
         update_task_params_dict["updated_at"] = datetime.now()
 
-        # Выполняем обновление одним запросом
-        query = update(TaskModel).where(
-            TaskModel.id == task_id,
-            TaskModel.user_id == user_id
-        ).values(**update_task_params_dict)
-
-        self.db_session.execute(query)
-        self.db_session.commit()
+        task = await self._update_task_returning(
+            task_id, user_id, update_task_params_dict
+        )
+        if task is None:
+            logger.warning(
+                f"Задача не найдена: task_id={task_id}, user_id={user_id}")
+            return None
 
-        # Получаем обновленную задачу
-        return await self.get_task_by_id(task_id, user_id)
+        if "title" in update_task_params_dict or "description" in update_task_params_dict:
+            self._enqueue_index(task_id, user_id, "upsert")
+        return task
 
     async def delete_task(self, task_id: str, user_id: str) -> bool:
         """Удалить задачу"""
+        # DELETE ... RETURNING: существование задачи определяется
+        # по возвращенной строке, без предварительного SELECT
+        query = delete(TaskModel).where(
+            TaskModel.id == task_id,
+            TaskModel.user_id == user_id,
+        ).returning(TaskModel.id)
+        result = await self.db_session.execute(query)
+
+        deleted = result.first() is not None
+        if deleted:
+            self._enqueue_index(task_id, user_id, "delete")
+            await self._bump_tasks_version(user_id)
+            self.db_session.add(TaskDeletionModel(
+                task_id=task_id,
+                user_id=user_id,
+                deleted_at=datetime.now(),
+            ))
 
-        task = await self.get_task_by_id(task_id, user_id)
-        if not task:
-            return False
+        # Фиксация транзакции выполняется в get_db
+        return deleted
 
-        query = delete(TaskModel).where(
-            TaskModel.id == task_id, TaskModel.user_id == user_id)
-        self.db_session.execute(query)
-        self.db_session.commit()
+    async def create_tasks(
+        self,
+        tasks: List[TaskCreateSchema],
+        user_id: str,
+    ) -> TasksBatchResponseSchema:
+        """
+        Создать задачи пакетом: многострочный INSERT ... RETURNING
+        в одной транзакции. Фиксация транзакции выполняется в get_db
+        """
+        now = datetime.now()
+        rows = [
+            {**task.model_dump(), "id": str(uuid4()), "user_id": user_id,
+             "created_at": now, "updated_at": now}
+            for task in tasks
+        ]
+        result = await self.db_session.execute(
+            insert(TaskModel).returning(*TASK_RESPONSE_COLUMNS, sort_by_parameter_order=True),
+            rows,
+        )
+        created = TASKS_ADAPTER.validate_python(result.all(), from_attributes=True)
+
+        await self._enqueue_index_many([task.id for task in created], user_id, "upsert")
+        await self._bump_tasks_version(user_id)
+        return TasksBatchResponseSchema(results=[
+            TaskBatchItemResultSchema(id=task.id, status="created", task=task)
+            for task in created
+        ])
+
+    async def update_tasks(
+        self,
+        items: List[TaskBatchUpdateItemSchema],
+        user_id: str,
+    ) -> TasksBatchResponseSchema:
+        """
+        Изменить задачи пакетом в одной транзакции: по одному
+        UPDATE ... FROM (VALUES ...) на каждый набор изменяемых полей.
+        Фиксация транзакции выполняется в get_db
+        """
+        changes_by_fields = {}
+        for item in items:
+            changes = item.model_dump(exclude_unset=True, exclude={"id"})
+            changes_by_fields.setdefault(tuple(sorted(changes)), []).append(
+                {"id": item.id, **changes})
+
+        now = datetime.now()
+        tasks = {}
+        updated = False
+        reindex = []
+        for fields, changes in changes_by_fields.items():
+            if not fields:
+                # Как update_task без данных: задача возвращается без изменений
+                rows = (await self.db_session.execute(select(*TASK_RESPONSE_COLUMNS).where(
+                    TaskModel.user_id == user_id,
+                    TaskModel.id.in_([change["id"] for change in changes]),
+                ))).all()
+            else:
+                rows = await self._update_tasks_from_values(user_id, fields, changes, now)
+                updated = updated or len(rows) > 0
+                if "title" in fields or "description" in fields:
+                    reindex += [row.id for row in rows]
+            for task in TASKS_ADAPTER.validate_python(rows, from_attributes=True):
+                tasks[task.id] = task
+
+        await self._enqueue_index_many(reindex, user_id, "upsert")
+        if updated:
+            await self._bump_tasks_version(user_id)
+        return TasksBatchResponseSchema(results=[
+            TaskBatchItemResultSchema(id=item.id, status="updated", task=tasks[item.id])
+            if item.id in tasks else
+            TaskBatchItemResultSchema(id=item.id, status="not_found")
+            for item in items
+        ])
+
+    async def _update_tasks_from_values(
+        self,
+        user_id: str,
+        fields: Tuple[str, ...],
+        changes: List[dict],
+        now: datetime,
+    ) -> list:
+        """Задачи с одинаковым набором изменяемых полей, с RETURNING"""
+        if self.db_session.get_bind().dialect.name != "postgresql":
+            # SQLite (локальный запуск): VALUES с именами колонок
+            # не поддерживается, UPDATE ... RETURNING на задачу
+            rows = []
+            for change in changes:
+                rows += (await self.db_session.execute(update(TaskModel).where(
+                    TaskModel.id == change["id"],
+                    TaskModel.user_id == user_id,
+                ).values(
+                    **{field: change[field] for field in fields}, updated_at=now,
+                ).returning(*TASK_RESPONSE_COLUMNS))).all()
+            return rows
+
+        columns = TaskModel.__table__.c
+        changed = values(
+            column("id", String),
+            # Статус передается текстом: имя типа enum в БД зависит
+            # от того, создана схема миграциями или create_all
+            *(column(field, String if field == "status" else columns[field].type)
+              for field in fields),
+            name="changed",
+        ).data([
+            (change["id"], *(
+                change[field].value if field == "status" and change[field] is not None
+                else change[field]
+                for field in fields
+            ))
+            for change in changes
+        ])
+
+        assignments = {field: changed.c[field] for field in fields}
+        if "status" in fields:
+            # Литералы без типа в CASE приводятся к типу колонки status
+            assignments["status"] = case(
+                *((changed.c.status == member.value, literal_column(f"'{member.value}'"))
+                  for member in TaskStatusModel),
+                else_=TaskModel.status,
+            )
+
+        query = update(TaskModel).where(
+            TaskModel.id == changed.c.id,
+            TaskModel.user_id == user_id,
+        ).values(**assignments, updated_at=now).returning(*TASK_RESPONSE_COLUMNS)
+        return (await self.db_session.execute(
+            query, execution_options={"synchronize_session": False})).all()
+
+    async def delete_tasks(self, task_ids: List[str], user_id: str) -> TasksBatchResponseSchema:
+        """
+        Удалить задачи пакетом одним DELETE ... RETURNING.
+        Фиксация транзакции выполняется в get_db
+        """
+        result = await self.db_session.execute(delete(TaskModel).where(
+            TaskModel.user_id == user_id,
+            TaskModel.id.in_(task_ids),
+        ).returning(TaskModel.id))
+        deleted = set(result.scalars().all())
+
+        if deleted:
+            now = datetime.now()
+            await self.db_session.execute(insert(TaskDeletionModel), [
+                {"task_id": task_id, "user_id": user_id, "deleted_at": now}
+                for task_id in deleted
+            ])
+            await self._enqueue_index_many(list(deleted), user_id, "delete")
+            await self._bump_tasks_version(user_id)
+        return TasksBatchResponseSchema(results=[
+            TaskBatchItemResultSchema(
+                id=task_id, status="deleted" if task_id in deleted else "not_found")
+            for task_id in task_ids
+        ])
+
+    async def search_by_query(
+        self,
+        query: str,
+        user_id: str,
+        limit: int = SEARCH_DEFAULT_LIMIT,
+    ) -> List[TaskResponseSchema]:
+        """
+        Семантический поиск задач пользователя.
+        Ближайшие векторы ищутся в Qdrant, задачи загружаются
+        из БД одним запросом и возвращаются в порядке близости
+        """
+        vector = await self.search_index.embed_query(query)
+        hits = await self.search_index.search(user_id, vector, limit)
+        if not hits:
+            return []
+
+        task_ids = [task_id for task_id, _ in hits]
+        result = await self.db_session.execute(
+            select(TaskModel).where(
+                TaskModel.id.in_(task_ids),
+                TaskModel.user_id == user_id,
+            )
+        )
+        tasks = {task.id: task for task in result.scalars().all()}
+
+        # Точки удаленных задач, еще не убранные из индекса, пропускаются
+        return [
+            TaskResponseSchema.model_validate(tasks[task_id])
+            for task_id in task_ids
+            if task_id in tasks
+        ]
 
-        return True
+    async def full_text_search(
+        self,
+        query: str,
+        user_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[TaskResponseSchema], Optional[str]]:
+        """
+        Поиск задач пользователя по словам запроса в заголовке и описании.
+        Полнотекстовый поиск с русской морфологией дополняется сходством
+        слов по триграммам, чтобы находить задачи при опечатках в запросе.
+        Задачи отдаются по убыванию релевантности, страницы — по курсору (score, id)
+
+        Returns:
+            Tuple[List[TaskResponseSchema], Optional[str]]: Задачи страницы
+                и курсор следующей страницы (None, если страница последняя)
+        """
+        if self.db_session.get_bind().dialect.name == "postgresql":
+            # Порог оператора <% действует до конца транзакции
+            await self.db_session.execute(select(func.set_config(
+                "pg_trgm.word_similarity_threshold", str(FTS_TYPO_THRESHOLD), True)))
+            search_vector = literal_column(TASK_SEARCH_VECTOR, type_=TSVECTOR)
+            tsquery = func.websearch_to_tsquery(literal_column("'russian'"), query)
+            matches = or_(
+                search_vector.op("@@")(tsquery),
+                literal(query).op("<%")(TaskModel.title),
+                literal(query).op("<%")(TaskModel.description),
+            )
+            # ts_rank_cd с нормализацией 32 лежит в [0, 1), совпадение
+            # в описании весит вдвое меньше совпадения в заголовке
+            score = func.ts_rank_cd(search_vector, tsquery, 32) + func.greatest(
+                func.word_similarity(query, TaskModel.title),
+                func.word_similarity(query, TaskModel.description) * 0.5,
+            )
+        else:
+            # SQLite (локальный запуск): поиск подстроки без ранжирования
+            matches = or_(
+                TaskModel.title.icontains(query, autoescape=True),
+                TaskModel.description.icontains(query, autoescape=True),
+            )
+            score = literal(0.0)
+
+        ranked = select(
+            TaskModel.id.label("id"),
+            score.label("score"),
+        ).where(TaskModel.user_id == user_id, matches).cte("ranked")
+
+        statement = select(TaskModel, ranked.c.score).join(
+            ranked, ranked.c.id == TaskModel.id)
+        if cursor is not None:
+            last_score, last_id = decode_cursor(cursor, (float, str))
+            statement = statement.where(or_(
+                ranked.c.score < last_score,
+                and_(ranked.c.score == last_score, ranked.c.id > last_id),
+            ))
+        # Лишняя строка показывает, есть ли следующая страница
+        statement = statement.order_by(
+            ranked.c.score.desc(), ranked.c.id).limit(limit + 1)
+
+        rows = (await self.db_session.execute(statement)).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_task, last_score = rows[-1]
+            next_cursor = encode_cursor(last_score, last_task.id)
+
+        return TASKS_ADAPTER.validate_python(
+            [task for task, _ in rows], from_attributes=True), next_cursor
+
+    async def list_tasks(
+        self,
+        user_id: str,
+        filters: TaskFiltersSchema,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[TaskResponseSchema], Optional[str]]:
+        """
+        Страница задач пользователя в порядке (date, id)
+
+        Returns:
+            Tuple[List[TaskResponseSchema], Optional[str]]: Задачи страницы
+                и курсор следующей страницы (None, если страница последняя)
+        """
+        # Лишняя строка показывает, есть ли следующая страница
+        query = self._list_query(user_id, filters, cursor).limit(limit + 1)
+        rows = (await self.db_session.execute(query)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].date, rows[-1].id)
+
+        return TASKS_ADAPTER.validate_python(rows, from_attributes=True), next_cursor
+
+    def stream_tasks(
+        self,
+        user_id: str,
+        filters: TaskFiltersSchema,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator:
+        """
+        Задачи пользователя в порядке (date, id) потоком из серверного
+        курсора: в памяти не больше TASKS_STREAM_BATCH_SIZE строк.
+        Курсор проверяется при вызове, до начала ответа; строки — словари
+        с колонками TaskResponseSchema, без валидации pydantic
+        """
+        query = self._list_query(user_id, filters, cursor)
+        if limit is not None:
+            query = query.limit(limit)
+        return self._stream_rows(query)
+
+    async def _stream_rows(self, query: Select) -> AsyncIterator:
+        async with self.session_factory() as session:
+            result = await session.stream(
+                query.execution_options(yield_per=TASKS_STREAM_BATCH_SIZE))
+            async for row in result.mappings():
+                yield row
+
+    def _list_query(
+        self,
+        user_id: str,
+        filters: TaskFiltersSchema,
+        cursor: Optional[str],
+    ) -> Select:
+        """Задачи пользователя с фильтрами после курсора, по индексу (user_id, date, id)"""
+        query = select(*TASK_RESPONSE_COLUMNS).where(
+            TaskModel.user_id == user_id,
+            *compile_task_filters(filters),
+        )
+        if cursor is not None:
+            last_date, last_id = decode_cursor(cursor, (datetime, str))
+            query = query.where(
+                tuple_(TaskModel.date, TaskModel.id) > tuple_(last_date, last_id))
+        return query.order_by(TaskModel.date, TaskModel.id)
 
     async def get_tasks_by_date(self, date: datetime, status: TaskStatusModel, user_id: str) -> List[TaskResponseSchema]:
         """Получить задачи на конкретный день"""
@@ -167,12 +579,11 @@ class TaskService:
             logger.info(
                 f"Поиск задач для пользователя {user_id} на дату {date.date()}")
 
+            # Полуоткрытый диапазон [day, day + 1) вместо сравнения с date.date(),
+            # чтобы использовался индекс (user_id, date, status)
             query = select(TaskModel).where(
-                TaskModel.user_id == user_id,
-                TaskModel.date == date.date(),
-                TaskModel.status == status
-            )
-            result = self.db_session.execute(query)
+                *_range_conditions(user_id, date.date(), date.date(), status))
+            result = await self.db_session.execute(query)
             tasks = result.scalars().all()
 
             if not tasks:
@@ -182,36 +593,397 @@ class TaskService:
 
             logger.info(
                 f"Найдено {len(tasks)} задач для пользователя {user_id} на дату {date.date()}")
-            return [
-                TaskResponseSchema.model_validate(task) for task in tasks
-            ]
+            return TASKS_ADAPTER.validate_python(tasks, from_attributes=True)
         except Exception as e:
             logger.error(
                 f"Ошибка при получении задач по дате: {str(e)}", exc_info=True)
             raise
 
+    def uses_db_json(self, endpoint: str) -> bool:
+        """Собирать ли ответ эндпоинта в JSON на стороне PostgreSQL"""
+        return (
+            endpoint in TASKS_DB_JSON_ENDPOINTS
+            and self.db_session.get_bind().dialect.name == "postgresql"
+        )
+
+    async def list_tasks_json(
+        self,
+        user_id: str,
+        filters: TaskFiltersSchema,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> bytes:
+        """
+        Страница задач (как list_tasks) готовым JSON TasksPageResponseSchema.
+        Задачи и ключ последней строки для курсора — одним запросом
+        """
+        page = self._list_query(user_id, filters, cursor).add_columns(
+            func.row_number().over(order_by=(TaskModel.date, TaskModel.id)).label("n"),
+        ).limit(limit + 1).cte("page")
+        tasks = select(*(page.c[column.key] for column in TASK_RESPONSE_COLUMNS)).where(
+            page.c.n <= limit).subquery("t")
+
+        def last(column):
+            return select(column).where(page.c.n == limit).scalar_subquery()
+
+        tasks_json, last_date, last_id, has_more = (await self.db_session.execute(select(
+            select(_json_array(tasks)).scalar_subquery(),
+            last(page.c.date),
+            last(page.c.id),
+            select(page.c.n).where(page.c.n > limit).exists(),
+        ))).one()
+
+        next_cursor = encode_cursor(last_date, last_id) if has_more else None
+        return (b'{"tasks":' + tasks_json.encode("utf-8")
+                + b',"next_cursor":' + dump_json(next_cursor) + b"}")
+
+    async def get_tasks_by_date_json(
+        self,
+        date: datetime,
+        status: TaskStatusModel,
+        user_id: str,
+    ) -> bytes:
+        """Задачи на день (как get_tasks_by_date) готовым JSON TasksResponseSchema"""
+        tasks = select(*TASK_RESPONSE_COLUMNS).where(
+            *_range_conditions(user_id, date.date(), date.date(), status)).subquery("t")
+        tasks_json = (await self.db_session.execute(select(_json_array(tasks)))).scalar_one()
+        return b'{"tasks":' + tasks_json.encode("utf-8") + b"}"
+
+    async def get_tasks_by_date_etag(
+        self,
+        date: datetime,
+        status: TaskStatusModel,
+        user_id: str,
+    ) -> str:
+        """ETag задач на день (get_tasks_by_date) без чтения самих задач"""
+        return await self._tasks_etag(
+            user_id, _range_conditions(user_id, date.date(), date.date(), status))
+
+    async def get_task_etag(self, task_id: str, user_id: str) -> str:
+        """
+        ETag задачи (get_task_by_id) без чтения самой задачи
+
+        Raises:
+            HTTPException: 404, если у пользователя нет такой задачи
+        """
+        row = await self._tasks_etag_row(user_id, [
+            TaskModel.id == task_id,
+            TaskModel.user_id == user_id,
+        ])
+        if not row.count:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Задача не найдена",
+            )
+        return make_etag(user_id, *row)
+
+    async def get_tasks_by_range(
+        self,
+        user_id: str,
+        date_from: date,
+        date_to: date,
+        status: Optional[TaskStatusModel] = None,
+    ) -> TasksRangeResponseSchema:
+        """
+        Задачи пользователя с date_from по date_to включительно, по дням.
+        Один запрос по диапазону date вместо запроса на каждый день
+        """
+        days = _range_days(date_from, date_to)
+        query = select(*TASK_RESPONSE_COLUMNS).where(
+            *_range_conditions(user_id, date_from, date_to, status),
+        ).order_by(TaskModel.date, TaskModel.id)
+        rows = (await self.db_session.execute(query)).all()
+
+        tasks_by_day = {day: [] for day in days}
+        for task in TASKS_ADAPTER.validate_python(rows, from_attributes=True):
+            tasks_by_day[task.date.date()].append(task)
+
+        return TasksRangeResponseSchema(days=[
+            TasksDaySchema(day=day, tasks=tasks) for day, tasks in tasks_by_day.items()
+        ])
+
+    async def count_tasks_by_range(
+        self,
+        user_id: str,
+        date_from: date,
+        date_to: date,
+        status: Optional[TaskStatusModel] = None,
+    ) -> TaskCountsRangeResponseSchema:
+        """
+        Количество задач пользователя по дням, статусам и меткам
+        с date_from по date_to включительно: агрегация в БД, без чтения задач
+        """
+        days = _range_days(date_from, date_to)
+        day = func.date(TaskModel.date).label("day")
+        query = select(
+            day,
+            TaskModel.status,
+            TaskModel.mark,
+            func.count().label("count"),
+        ).where(
+            *_range_conditions(user_id, date_from, date_to, status),
+        ).group_by(day, TaskModel.status, TaskModel.mark)
+        rows = (await self.db_session.execute(query)).all()
+
+        counts = {
+            day: TaskCountsDaySchema(day=day, total=0, by_status={}, by_mark={})
+            for day in days
+        }
+        for row in rows:
+            # SQLite возвращает date() строкой
+            row_day = row.day if isinstance(row.day, date) else date.fromisoformat(row.day)
+            day_counts = counts[row_day]
+            day_counts.total += row.count
+            day_counts.by_status[row.status.value] = (
+                day_counts.by_status.get(row.status.value, 0) + row.count)
+            if row.mark is not None:
+                day_counts.by_mark[row.mark] = day_counts.by_mark.get(row.mark, 0) + row.count
+
+        return TaskCountsRangeResponseSchema(days=list(counts.values()))
+
+    async def get_changes(
+        self,
+        user_id: str,
+        since: Optional[str],
+        limit: int,
+    ) -> TaskChangesResponseSchema:
+        """
+        Созданные, измененные и удаленные задачи пользователя после курсора
+        since в порядке (время изменения, id). Без курсора — все задачи
+        (полная синхронизация). Задачи и записи об удалении читаются одним
+        запросом UNION ALL, каждая часть — по своему индексу (user_id, время, id)
+
+        Курсор хранит, кроме ключа последней строки, время начала обхода:
+        ключ старых задач может быть сколь угодно старым, а записи об
+        удалении задач, уже отданных клиенту, появились позже начала обхода
+
+        Raises:
+            HTTPException: 410, если обход начат раньше срока хранения удалений
+        """
+        now = datetime.now()
+        settled = now - timedelta(seconds=TASK_CHANGES_SETTLE_SECONDS)
+
+        changed = select(
+            TaskModel.id.label("id"),
+            TaskModel.updated_at.label("changed_at"),
+            false().label("deleted"),
+            *TASK_RESPONSE_COLUMNS[1:],
+        ).where(
+            TaskModel.user_id == user_id,
+            TaskModel.updated_at <= settled,
+        )
+        deleted = select(
+            TaskDeletionModel.task_id.label("id"),
+            TaskDeletionModel.deleted_at.label("changed_at"),
+            true().label("deleted"),
+            # Типизированные NULL: PostgreSQL не выводит тип NULL в подзапросе UNION
+            *[cast(null(), column.type).label(column.key)
+              for column in TASK_RESPONSE_COLUMNS[1:]],
+        ).where(
+            TaskDeletionModel.user_id == user_id,
+            TaskDeletionModel.deleted_at <= settled,
+        )
+
+        started_at = now
+        if since is not None:
+            last_changed_at, last_id, started_at = decode_cursor(
+                since, (datetime, str, datetime))
+            # Записи об удалении после started_at еще не удалены
+            # purge_task_deletions
+            if started_at < now - timedelta(days=TASK_TOMBSTONE_RETENTION_DAYS):
+                raise HTTPException(
+                    status_code=status.HTTP_410_GONE,
+                    detail="Курсор устарел, нужна полная синхронизация",
+                )
+            changed = changed.where(
+                tuple_(TaskModel.updated_at, TaskModel.id) > tuple_(last_changed_at, last_id))
+            deleted = deleted.where(
+                tuple_(TaskDeletionModel.deleted_at, TaskDeletionModel.task_id)
+                > tuple_(last_changed_at, last_id))
+
+        # Каждая часть ограничена отдельно, лишняя строка показывает,
+        # есть ли продолжение
+        changed = changed.order_by(TaskModel.updated_at, TaskModel.id).limit(limit + 1)
+        deleted = deleted.order_by(
+            TaskDeletionModel.deleted_at, TaskDeletionModel.task_id).limit(limit + 1)
+        changes = union_all(
+            select(changed.subquery()),
+            select(deleted.subquery()),
+        ).subquery()
+        rows = (await self.db_session.execute(
+            select(changes).order_by(changes.c.changed_at, changes.c.id).limit(limit + 1)
+        )).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if has_more:
+            next_cursor = encode_cursor(rows[-1].changed_at, rows[-1].id, started_at)
+        else:
+            # Все изменения до settled отданы, следующий обход начинается с него
+            next_cursor = encode_cursor(settled, "", settled)
+
+        return TaskChangesResponseSchema(
+            tasks=TASKS_ADAPTER.validate_python(
+                [row for row in rows if not row.deleted], from_attributes=True),
+            deleted=[row.id for row in rows if row.deleted],
+            next_cursor=next_cursor,
+            has_more=has_more,
+        )
+
     async def mark_task_completed(self, task_id: str, user_id: str) -> Optional[TaskResponseSchema]:
         """Отметить задачу как выполненную"""
-        task = await self.get_task_by_id(task_id, user_id)
-        if not task:
-            return None
+        return await self._update_task_returning(task_id, user_id, {
+            "status": TaskStatusModel.completed,
+            "updated_at": datetime.now(),
+        })
+
+    async def _update_task_returning(
+        self,
+        task_id: str,
+        user_id: str,
+        values: dict,
+    ) -> Optional[TaskResponseSchema]:
+        """
+        Обновляет задачу одним запросом UPDATE ... RETURNING.
+        Фиксация транзакции выполняется в get_db.
 
+        Returns:
+            Optional[TaskResponseSchema]: Обновленная задача или None, если задача не найдена
+        """
         query = update(TaskModel).where(
             TaskModel.id == task_id,
             TaskModel.user_id == user_id
-        ).values(
-            status="completed",
-            updated_at=datetime.now()
+        ).values(**values).returning(TaskModel)
+
+        result = await self.db_session.execute(
+            query,
+            execution_options={"populate_existing": True},
         )
+        task = result.scalars().first()
+        if task is None:
+            return None
 
-        self.db_session.execute(query)
-        self.db_session.commit()
+        await self._bump_tasks_version(user_id)
+        return TaskResponseSchema.model_validate(task)
 
-        return await self.get_task_by_id(task_id, user_id)
+    async def get_tasks_version(self, user_id: str, for_update: bool = False) -> int:
+        """
+        Версия задач пользователя. С for_update строка пользователя
+        блокируется до конца транзакции: изменения задач пользователя
+        (они увеличивают версию) ждут ее завершения
+        """
+        query = select(UserModel.tasks_version).where(UserModel.id == user_id)
+        if for_update:
+            query = query.with_for_update()
+        return (await self.db_session.execute(query)).scalar_one()
+
+    async def get_tasks_by_ids(self, task_ids: List[str], user_id: str) -> dict:
+        """Задачи пользователя по ID одним запросом: {id: TaskResponseSchema}"""
+        if not task_ids:
+            return {}
+        rows = (await self.db_session.execute(select(*TASK_RESPONSE_COLUMNS).where(
+            TaskModel.user_id == user_id,
+            TaskModel.id.in_(task_ids),
+        ))).all()
+        return {task.id: task for task in TASKS_ADAPTER.validate_python(rows, from_attributes=True)}
+
+    async def _bump_tasks_version(self, user_id: str):
+        """
+        Увеличивает версию задач пользователя в текущей транзакции:
+        ETag всех выборок задач пользователя становятся неактуальными
+        """
+        await self.db_session.execute(
+            update(UserModel).where(UserModel.id == user_id).values(
+                tasks_version=UserModel.tasks_version + 1,
+                # Иначе onupdate изменит updated_at профиля пользователя
+                updated_at=UserModel.updated_at,
+            )
+        )
+
+    async def _tasks_etag(self, user_id: str, conditions: list) -> str:
+        """
+        ETag выборки задач: версия задач пользователя, количество строк
+        и max(updated_at) одним запросом по индексу, без чтения задач
+        """
+        return make_etag(user_id, *await self._tasks_etag_row(user_id, conditions))
+
+    async def _tasks_etag_row(self, user_id: str, conditions: list):
+        version = select(UserModel.tasks_version).where(
+            UserModel.id == user_id).scalar_subquery()
+        return (await self.db_session.execute(select(
+            version,
+            func.count().label("count"),
+            func.max(TaskModel.updated_at),
+        ).where(*conditions))).one()
+
+    def _enqueue_index(self, task_id: str, user_id: str, operation: str):
+        """
+        Ставит задачу в очередь поискового индекса в текущей транзакции.
+        Векторизацию и запись в Qdrant выполняет TaskIndexer
+        """
+        self.db_session.add(TaskIndexOutboxModel(
+            task_id=task_id,
+            user_id=user_id,
+            operation=operation,
+            created_at=datetime.now(),
+        ))
+
+    async def _enqueue_index_many(self, task_ids: List[str], user_id: str, operation: str):
+        """То же, что _enqueue_index, для пакета задач одним INSERT"""
+        if not task_ids:
+            return
+        now = datetime.now()
+        await self.db_session.execute(insert(TaskIndexOutboxModel), [
+            {"task_id": task_id, "user_id": user_id, "operation": operation, "created_at": now}
+            for task_id in task_ids
+        ])
+
+
+def _json_array(tasks) -> ColumnElement:
+    """
+    JSON-массив строк подзапроса в порядке (date, id), текстом. Ключи —
+    имена колонок; datetime в ISO 8601, как у orjson, но PostgreSQL
+    не дополняет дробные секунды нулями (".5" вместо ".500000")
+    """
+    return cast(func.coalesce(
+        func.json_agg(aggregate_order_by(tasks.table_valued(), tasks.c.date, tasks.c.id)),
+        literal_column("'[]'::json"),
+    ), Text)
+
+
+def _range_days(date_from: date, date_to: date) -> List[date]:
+    """
+    Raises:
+        HTTPException: Если период пустой или длиннее TASKS_RANGE_MAX_DAYS
+    """
+    days_count = (date_to - date_from).days + 1
+    if days_count < 1 or days_count > TASKS_RANGE_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Период должен содержать от 1 до {TASKS_RANGE_MAX_DAYS} дней",
+        )
+    return [date_from + timedelta(days=offset) for offset in range(days_count)]
+
+
+def _range_conditions(
+    user_id: str,
+    date_from: date,
+    date_to: date,
+    task_status: Optional[TaskStatusModel],
+) -> list:
+    # Полуоткрытый диапазон [date_from, date_to + 1) по индексу (user_id, date, ...)
+    conditions = [
+        TaskModel.user_id == user_id,
+        TaskModel.date >= datetime.combine(date_from, time.min),
+        TaskModel.date < datetime.combine(date_to + timedelta(days=1), time.min),
+    ]
+    if task_status is not None:
+        conditions.append(TaskModel.status == task_status)
+    return conditions
 
 
 def get_task_service(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> TaskService:
     """
     Зависимость для получения Task сервиса
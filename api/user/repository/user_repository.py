@@ -1,6 +1,5 @@
 from fastapi import Depends
 
-from api.task.service.task_service import TaskService
 from api.user.service.user_service import UserService, get_user_service
 
 
@@ -11,15 +10,14 @@ class UserRepository:
     Делегирует выполнение операций сервису UserService.
     """
 
-    def __init__(self, user_service: UserService, task_service: TaskService):
+    def __init__(self, user_service: UserService):
         """
         Инициализирует репозиторий
         """
 
         self.user_service = user_service
-        self.task_service = task_service
 
-    def delete_current(self, user_id: str) -> bool:
+    async def delete_current(self, user_id: str) -> bool:
         """
         Удаляет пользователя
 
@@ -29,7 +27,7 @@ class UserRepository:
         Returns:
             bool: True если пользователь был удален, False если пользователь не найден
         """
-        return self.user_service.delete_user(user_id)
+        return await self.user_service.delete_user(user_id)
 
     def get_user_smart_tags(self, user_id: str):
         """
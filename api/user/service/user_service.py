@@ -1,8 +1,10 @@
 from typing import List, Optional
 from uuid import uuid4
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends, HTTPException, status
+from api.auth.service.user_cache import user_cache
 from api.user.schemas.user_schema_response import UserSchemaResponse
 from api.user.schemas.user_schmea_request_update import UserSchemaRequestUpdate
 from database.database import get_db
@@ -12,16 +14,15 @@ from database.models.user.user_model import UserModel
 class UserService:
     """Сервис для работы с пользователями"""
 
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
 
-    def update_user(self, user_id: str, user_data: UserSchemaRequestUpdate) -> Optional[UserSchemaResponse]:
+    async def update_user(self, user_id: str, user_data: UserSchemaRequestUpdate) -> Optional[UserSchemaResponse]:
         """
         Обновляет данные пользователя
         """
         # Проверяем существование пользователя
-        user = self.db_session.query(UserModel).filter(
-            UserModel.id == user_id).first()
+        user = await self.db_session.get(UserModel, user_id)
         if not user:
             return None
 
@@ -30,10 +31,13 @@ class UserService:
 
         # Если изменяется email, проверяем его уникальность
         if "email" in update_data:
-            existing_user = self.db_session.query(UserModel).filter(
-                UserModel.email == update_data["email"],
-                UserModel.id != user_id
-            ).first()
+            result = await self.db_session.execute(
+                select(UserModel).where(
+                    UserModel.email == update_data["email"],
+                    UserModel.id != user_id
+                )
+            )
+            existing_user = result.scalars().first()
 
             if existing_user:
                 raise HTTPException(
@@ -48,31 +52,35 @@ class UserService:
         for key, value in update_data.items():
             setattr(user, key, value)
 
-        self.db_session.commit()
-        self.db_session.refresh(user)
+        await self.db_session.commit()
+        await self.db_session.refresh(user)
+
+        # Сбрасываем устаревшую запись в кэше аутентификации
+        user_cache.invalidate(user_id)
 
         # Возвращаем обновленного пользователя
         return UserSchemaResponse.model_validate(user)
 
-    def delete_user(self, user_id: str) -> bool:
+    async def delete_user(self, user_id: str) -> bool:
         """
         Удаляет пользователя
         """
         # Проверяем существование пользователя
-        user = self.db_session.query(UserModel).filter(
-            UserModel.id == user_id).first()
+        user = await self.db_session.get(UserModel, user_id)
         if not user:
             return False
 
         # Выполняем удаление
-        self.db_session.delete(user)
-        self.db_session.commit()
+        await self.db_session.delete(user)
+        await self.db_session.commit()
+
+        user_cache.invalidate(user_id)
 
         return True
 
 
 # Функция для внедрения зависимости
-def get_user_service(db_session: Session = Depends(get_db)) -> UserService:
+def get_user_service(db_session: AsyncSession = Depends(get_db)) -> UserService:
     """
     Возвращает экземпляр UserService для внедрения зависимости.
 
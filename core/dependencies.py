@@ -1,5 +1,18 @@
-from openai import OpenAI
+from fastapi import HTTPException, Request, status
 
+from core.llm_client import LLMClient
 
-def get_open_ai_client() -> OpenAI:
-    return OpenAI()
+
+def get_open_ai_client(request: Request) -> LLMClient:
+    """
+    Общий клиент OpenAI, создается в lifespan приложения
+
+    Raises:
+        HTTPException: 503, если OPENAI_API_KEY не задан
+    """
+    if request.app.state.llm_client is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Ассистент не настроен",
+        )
+    return request.app.state.llm_client
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Многоязычная модель (русский текст), 384-мерные векторы, работает на CPU
+EMBEDDING_MODEL = os.getenv(
+    "EMBEDDING_MODEL",
+    "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+)
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE", "cpu")
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+# Способ вычисления эмбеддингов на CPU:
+#   torch     — исходная модель float32
+#   int8      — та же модель с динамической int8-квантизацией Linear-слоев torch
+#   onnx      — экспорт модели в ONNX (scripts/export_embedding_onnx.py), onnxruntime
+#   onnx-int8 — ONNX с int8-квантизацией весов
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_BACKENDS = ("torch", "int8", "onnx", "onnx-int8")
+# Каталог с экспортированной ONNX-моделью и токенизатором
+EMBEDDING_ONNX_PATH = os.getenv("EMBEDDING_ONNX_PATH", "models/embedding-onnx")
+# Модель сама распараллеливает вычисления по ядрам,
+# несколько одновременных вызовов только конкурируют за CPU
+EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "1"))
+# Общий сервис эмбеддингов (core/embedding_server.py): Unix-сокет или URL.
+# Если задан, модель в процессе приложения не загружается
+EMBEDDING_SERVICE_SOCKET = os.getenv("EMBEDDING_SERVICE_SOCKET")
+EMBEDDING_SERVICE_URL = os.getenv("EMBEDDING_SERVICE_URL")
+
+
+class Embedder:
+    """
+    Векторизация текста моделью sentence-transformers.
+    Модель загружается при первом обращении, вычисления выполняются
+    в отдельном пуле потоков, чтобы не блокировать event loop.
+    Векторы нормализованы (косинусная близость = скалярное произведение).
+    """
+
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL,
+        device: str = EMBEDDING_DEVICE,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        workers: int = EMBEDDING_WORKERS,
+        backend: str = EMBEDDING_BACKEND,
+        onnx_path: str = EMBEDDING_ONNX_PATH,
+    ):
+        if backend not in EMBEDDING_BACKENDS:
+            raise ValueError(
+                f"Неизвестный EMBEDDING_BACKEND {backend}, "
+                f"допустимые значения: {', '.join(EMBEDDING_BACKENDS)}")
+        self.model_name = model_name
+        self.backend = backend
+        self.onnx_path = onnx_path
+        self.device = device
+        self.batch_size = batch_size
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="embedder",
+        )
+
+    @property
+    def cache_key(self) -> str:
+        """
+        Идентификатор векторов для кэша: квантизованные варианты дают
+        немного другие векторы, чем исходная модель
+        """
+        if self.backend == "torch":
+            return self.model_name
+        return f"{self.model_name}:{self.backend}"
+
+    @property
+    def dimension(self) -> int:
+        return self._get_model().get_sentence_embedding_dimension()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: Матрица float32 размера (len(texts), dimension)
+        """
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+
+        return self._get_model().encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        ).astype(np.float32, copy=False)
+
+    async def embed_async(self, texts: List[str]) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.embed, texts)
+
+    async def load_info(self):
+        """Совместимость с RemoteEmbedder: сведения о модели известны локально"""
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def close(self):
+        self.shutdown()
+
+    def _get_model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    logger.info(
+                        f"Загрузка модели эмбеддингов {self.model_name} ({self.backend})")
+                    self._model = self._load_model()
+        return self._model
+
+    def _load_model(self):
+        if self.backend in ("onnx", "onnx-int8"):
+            from core.onnx_encoder import OnnxEncoder
+
+            model = OnnxEncoder(self.onnx_path, quantized=self.backend == "onnx-int8")
+            if model.model_name != self.model_name:
+                logger.warning(
+                    f"ONNX-модель в {self.onnx_path} экспортирована из {model.model_name}, "
+                    f"а EMBEDDING_MODEL={self.model_name}")
+            return model
+
+        from sentence_transformers import SentenceTransformer
+
+        model = SentenceTransformer(self.model_name, device=self.device)
+        if self.backend == "int8":
+            import torch
+
+            # Веса Linear-слоев хранятся в int8, активации квантизуются
+            # на лету; работает только на CPU
+            model = torch.quantization.quantize_dynamic(
+                model.cpu(), {torch.nn.Linear}, dtype=torch.qint8)
+        return model
+
+
+def create_embedder():
+    """Embedder процесса: клиент общего сервиса или модель в процессе"""
+    if EMBEDDING_SERVICE_SOCKET or EMBEDDING_SERVICE_URL:
+        from core.embedding_client import RemoteEmbedder
+
+        return RemoteEmbedder(
+            socket_path=EMBEDDING_SERVICE_SOCKET,
+            url=EMBEDDING_SERVICE_URL,
+        )
+    return Embedder()
+
+
+embedder = create_embedder()
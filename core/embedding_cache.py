@@ -0,0 +1,193 @@
+import hashlib
+import logging
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from core import metrics
+from core.embedder import Embedder, embedder
+from database.database import SessionLocal, engine
+from database.models.embedding_cache_model import EmbeddingCacheModel
+
+logger = logging.getLogger(__name__)
+
+# Векторов в памяти процесса (~1.5 КБ на вектор размерности 384)
+EMBEDDING_CACHE_MEMORY_SIZE = int(
+    os.getenv("EMBEDDING_CACHE_MEMORY_SIZE", "50000"))
+# Строк в одном INSERT постоянного уровня
+EMBEDDING_CACHE_WRITE_CHUNK = 1000
+
+
+def content_hash(text: str) -> bytes:
+    """sha256 текста после нормализации Unicode и пробелов"""
+    normalized = " ".join(unicodedata.normalize("NFC", text).split())
+    return hashlib.sha256(normalized.encode("utf-8")).digest()
+
+
+class CachedEmbedder:
+    """
+    Embedder с кэшем по (модель, sha256 нормализованного текста).
+
+    Первый уровень — LRU в памяти процесса, второй — таблица
+    embedding_cache с векторами float16, общая для всех процессов.
+    Модель вызывается один раз на пачку только для текстов, которых нет
+    ни на одном уровне. Векторы всегда проходят через float16, поэтому
+    результат не зависит от того, был ли текст в кэше.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder = embedder,
+        memory_size: int = EMBEDDING_CACHE_MEMORY_SIZE,
+        session_factory=SessionLocal,
+    ):
+        self.embedder = embedder
+        self.memory_size = memory_size
+        self.session_factory = session_factory
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._memory_hits = metrics.counter("embedding_cache_memory_hits_total")
+        self._persistent_hits = metrics.counter(
+            "embedding_cache_persistent_hits_total")
+        self._misses = metrics.counter("embedding_cache_misses_total")
+        self._hit_rate = metrics.gauge("embedding_cache_hit_rate")
+        self._size = metrics.gauge("embedding_cache_memory_size")
+
+    @property
+    def model_name(self) -> str:
+        # Ключ кэша учитывает способ вычисления (EMBEDDING_BACKEND)
+        return self.embedder.cache_key
+
+    @property
+    def dimension(self) -> int:
+        return self.embedder.dimension
+
+    async def load_info(self):
+        await self.embedder.load_info()
+
+    async def embed_async(self, texts: List[str], persistent: bool = True) -> np.ndarray:
+        """
+        Args:
+            texts: Тексты для векторизации
+            persistent: Использовать постоянный уровень. Для поисковых
+                запросов отключается, чтобы не раздувать таблицу
+
+        Returns:
+            np.ndarray: Матрица float32 размера (len(texts), dimension)
+        """
+        # model_name нужен _load и _store, dimension — пустому результату
+        await self.load_info()
+        hashes = [content_hash(text) for text in texts]
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        # Хеш -> позиции текста в пачке (одинаковые тексты считаются один раз)
+        missing: Dict[bytes, List[int]] = {}
+
+        with self._lock:
+            for index, key in enumerate(hashes):
+                vector = self._memory.get(key)
+                if vector is None:
+                    missing.setdefault(key, []).append(index)
+                    continue
+                self._memory.move_to_end(key)
+                vectors[index] = vector
+        self._memory_hits.inc(len(texts) - sum(map(len, missing.values())))
+
+        if missing and persistent:
+            found = await self._load(list(missing))
+            for key, vector in found.items():
+                for index in missing.pop(key):
+                    vectors[index] = vector
+                self._persistent_hits.inc()
+            self._remember(found)
+
+        if missing:
+            keys = list(missing)
+            computed = await self.embedder.embed_async(
+                [texts[missing[key][0]] for key in keys])
+            computed = computed.astype(np.float16).astype(np.float32)
+
+            fresh = dict(zip(keys, computed))
+            for key, vector in fresh.items():
+                for index in missing[key]:
+                    vectors[index] = vector
+            self._misses.inc(len(keys))
+            self._remember(fresh)
+            if persistent:
+                await self._store(fresh)
+
+        self._update_hit_rate()
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        return np.stack(vectors)
+
+    async def _load(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    select(
+                        EmbeddingCacheModel.content_hash,
+                        EmbeddingCacheModel.vector,
+                    ).where(
+                        EmbeddingCacheModel.model == self.model_name,
+                        EmbeddingCacheModel.content_hash.in_(keys),
+                    )
+                )
+                return {
+                    bytes(key): np.frombuffer(vector, dtype=np.float16).astype(np.float32)
+                    for key, vector in result.all()
+                }
+        except Exception as e:
+            # Кэш не должен ломать векторизацию
+            logger.warning(f"Кэш эмбеддингов: ошибка чтения ({str(e)})")
+            return {}
+
+    async def _store(self, items: Dict[bytes, np.ndarray]):
+        rows = [
+            {
+                "model": self.model_name,
+                "content_hash": key,
+                "vector": vector.astype(np.float16).tobytes(),
+                "created_at": datetime.now(),
+            }
+            for key, vector in items.items()
+        ]
+        insert = postgresql.insert if engine.dialect.name == "postgresql" else sqlite.insert
+        try:
+            async with self.session_factory() as session:
+                for start in range(0, len(rows), EMBEDDING_CACHE_WRITE_CHUNK):
+                    await session.execute(
+                        insert(EmbeddingCacheModel)
+                        .values(rows[start:start + EMBEDDING_CACHE_WRITE_CHUNK])
+                        .on_conflict_do_nothing()
+                    )
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Кэш эмбеддингов: ошибка записи ({str(e)})")
+
+    def _remember(self, items: Dict[bytes, np.ndarray]):
+        if self.memory_size <= 0:
+            return
+        with self._lock:
+            for key, vector in items.items():
+                self._memory[key] = vector
+                self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+            self._size.set(len(self._memory))
+
+    def _update_hit_rate(self):
+        hits = self._memory_hits.value + self._persistent_hits.value
+        total = hits + self._misses.value
+        if total:
+            self._hit_rate.set(round(hits / total, 4))
+
+
+cached_embedder = CachedEmbedder()
@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+from typing import List, Optional
+
+import httpx
+import numpy as np
+
+EMBEDDING_SERVICE_TIMEOUT = float(os.getenv("EMBEDDING_SERVICE_TIMEOUT", "30"))
+
+
+class RemoteEmbedder:
+    """
+    Клиент сервиса эмбеддингов (core/embedding_server.py) с интерфейсом Embedder.
+    Модель загружена один раз в сервисе, воркеры приложения ее не держат.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, url: Optional[str] = None):
+        if socket_path:
+            base_url = "http://embedding"
+            async_transport = httpx.AsyncHTTPTransport(uds=socket_path)
+            sync_transport = httpx.HTTPTransport(uds=socket_path)
+        else:
+            base_url = url
+            async_transport = httpx.AsyncHTTPTransport()
+            sync_transport = httpx.HTTPTransport()
+
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            transport=async_transport,
+            timeout=EMBEDDING_SERVICE_TIMEOUT,
+        )
+        self._sync_client = httpx.Client(
+            base_url=base_url,
+            transport=sync_transport,
+            timeout=EMBEDDING_SERVICE_TIMEOUT,
+        )
+        # Размер батча задает сервис; атрибут оставлен для совместимости с Embedder
+        self.batch_size = None
+        self._info: Optional[dict] = None
+        self._info_lock = threading.Lock()
+
+    @property
+    def model_name(self) -> str:
+        return self._get_info()["model"]
+
+    @property
+    def cache_key(self) -> str:
+        return self._get_info()["cache_key"]
+
+    @property
+    def dimension(self) -> int:
+        return self._get_info()["dimension"]
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        response = self._sync_client.post("/embed", content=_encode(texts))
+        return _decode(response)
+
+    async def embed_async(self, texts: List[str]) -> np.ndarray:
+        response = await self._client.post("/embed", content=_encode(texts))
+        return _decode(response)
+
+    async def load_info(self):
+        """
+        Загружает /info асинхронным клиентом. Вызывается из async-кода до
+        обращения к model_name, cache_key и dimension, чтобы те не делали
+        блокирующий запрос в event loop
+        """
+        if self._info is None:
+            response = await self._client.get("/info")
+            response.raise_for_status()
+            self._info = response.json()
+
+    def shutdown(self):
+        self._sync_client.close()
+
+    async def close(self):
+        await self._client.aclose()
+        self.shutdown()
+
+    def _get_info(self) -> dict:
+        # Один раз на процесс: модель и размерность сервиса не меняются.
+        # Синхронный запрос — только для синхронного кода (скрипты)
+        if self._info is None:
+            with self._info_lock:
+                if self._info is None:
+                    response = self._sync_client.get("/info")
+                    response.raise_for_status()
+                    self._info = response.json()
+        return self._info
+
+
+def _encode(texts: List[str]) -> bytes:
+    return json.dumps(texts, ensure_ascii=False).encode("utf-8")
+
+
+def _decode(response: httpx.Response) -> np.ndarray:
+    response.raise_for_status()
+    dimension = int(response.headers["X-Embedding-Dimension"])
+    return np.frombuffer(response.content, dtype=np.float32).reshape(-1, dimension)
@@ -0,0 +1,153 @@
+# Общий для всех воркеров сервис эмбеддингов: одна копия модели на узел.
+# Запуск: python -m core.embedding_server --uds /tmp/dia_embedding.sock
+# Приложение: EMBEDDING_SERVICE_SOCKET=/tmp/dia_embedding.sock uvicorn main:app --workers 4
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import List, Optional, Tuple
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request, Response, status
+
+from core.embedder import Embedder
+
+logger = logging.getLogger(__name__)
+
+# Сколько ждать другие запросы, прежде чем запускать модель
+EMBEDDING_BATCH_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "5"))
+# Максимум текстов в одном вызове модели
+EMBEDDING_BATCH_MAX_TEXTS = int(os.getenv("EMBEDDING_BATCH_MAX_TEXTS", "256"))
+
+
+class MicroBatcher:
+    """
+    Объединяет одновременные запросы в один вызов модели.
+    Первый запрос пачки ждет остальных не дольше max_wait секунд;
+    пока модель считает пачку, в очереди копится следующая.
+    """
+
+    def __init__(self, embedder: Embedder, max_wait: float, max_texts: int):
+        self.embedder = embedder
+        self.max_wait = max_wait
+        self.max_texts = max_texts
+        self._queue: "asyncio.Queue[Tuple[List[str], asyncio.Future]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            count = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+
+            while count < self.max_texts:
+                timeout = deadline - loop.time()
+                if timeout <= 0 and self._queue.empty():
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), max(timeout, 0))
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                count += len(item[0])
+
+            try:
+                vectors = await self.embedder.embed_async(
+                    [text for texts, _ in batch for text in texts])
+            except Exception as e:
+                logger.error(f"Ошибка векторизации: {str(e)}", exc_info=True)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for texts, future in batch:
+                if not future.done():
+                    future.set_result(vectors[offset:offset + len(texts)])
+                offset += len(texts)
+
+
+embedder = Embedder()
+batcher = MicroBatcher(
+    embedder,
+    EMBEDDING_BATCH_WAIT_MS / 1000,
+    EMBEDDING_BATCH_MAX_TEXTS,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Модель загружается до приема запросов
+    await embedder.embed_async(["warmup"])
+    batcher.start()
+    yield
+    await batcher.stop()
+    embedder.shutdown()
+
+
+app = FastAPI(title="Embedding Service", lifespan=lifespan)
+
+
+@app.get("/info")
+async def info():
+    return {
+        "model": embedder.model_name,
+        "cache_key": embedder.cache_key,
+        "dimension": embedder.dimension,
+    }
+
+
+@app.post("/embed")
+async def embed(request: Request):
+    """
+    Принимает JSON-массив текстов, возвращает матрицу float32
+    (len(texts) x dimension) в виде сырых байт, без JSON
+    """
+    texts = json.loads(await request.body())
+    if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Ожидается массив строк",
+        )
+
+    vectors = await batcher.embed(texts)
+    return Response(
+        content=np.ascontiguousarray(vectors, dtype=np.float32).tobytes(),
+        media_type="application/octet-stream",
+        headers={"X-Embedding-Dimension": str(vectors.shape[1])},
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сервис эмбеддингов")
+    parser.add_argument("--uds", help="Путь к Unix-сокету")
+    parser.add_argument("--port", type=int, default=8200,
+                        help="Порт на 127.0.0.1, если сокет не указан")
+    args = parser.parse_args()
+
+    if args.uds:
+        uvicorn.run(app, uds=args.uds, log_level="warning")
+    else:
+        uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,70 @@
+import hashlib
+from collections import OrderedDict
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+from core import metrics
+from core.json_response import FastJSONResponse
+
+# Сколько последних ETag помнят размер ответа (для учета сэкономленного трафика)
+ETAG_SIZES_MEMORY = 10000
+
+
+def make_etag(*parts: Any) -> str:
+    """Сильный ETag из значений, от которых зависит ответ"""
+    digest = hashlib.sha256(
+        "\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    If-None-Match совпадает с etag. По RFC 9110 для If-None-Match
+    используется слабое сравнение: префикс W/ не учитывается
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+class ConditionalResponses:
+    """
+    Ответы на условные GET: 304 без тела, если ETag клиента актуален,
+    иначе тело с заголовком ETag. Экспортирует долю ответов 304 и оценку
+    сэкономленного трафика (размер последнего полного ответа с тем же ETag)
+    """
+
+    def __init__(self, sizes_memory: int = ETAG_SIZES_MEMORY):
+        self.sizes_memory = sizes_memory
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+
+        self._requests = metrics.counter("http_etag_requests_total")
+        self._not_modified = metrics.counter("http_etag_not_modified_total")
+        self._bytes_saved = metrics.counter("http_etag_bytes_saved_total")
+        self._hit_ratio = metrics.gauge("http_etag_not_modified_ratio")
+
+    def not_modified(self, request: Request, etag: str) -> Optional[Response]:
+        """Ответ 304, если клиент прислал актуальный ETag, иначе None"""
+        self._requests.inc()
+        matched = etag_matches(request, etag)
+        if matched:
+            self._not_modified.inc()
+            self._bytes_saved.inc(self._sizes.get(etag, 0))
+        self._hit_ratio.set(self._not_modified.value / self._requests.value)
+        if not matched:
+            return None
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    def respond(self, etag: str, body: bytes) -> Response:
+        """Полный ответ JSON (готовые байты, см. dump_json) с заголовком ETag"""
+        self._sizes[etag] = len(body)
+        self._sizes.move_to_end(etag)
+        if len(self._sizes) > self.sizes_memory:
+            self._sizes.popitem(last=False)
+        return FastJSONResponse(content=body, headers={"ETag": etag})
+
+
+conditional_responses = ConditionalResponses()
@@ -0,0 +1,67 @@
+import os
+from typing import Any, Callable
+
+import orjson
+from fastapi import Request, Response
+from fastapi.exceptions import ResponseValidationError
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+# Проверять ответы FastJSONResponse по response_model маршрута.
+# Включается в тестах и на стендах; в production проверка отключена ради скорости
+RESPONSE_VALIDATION = os.getenv("RESPONSE_VALIDATION", "false").lower() == "true"
+
+
+def _default(value: Any) -> Any:
+    # Модели ответов — простые поля без алиасов и сериализаторов:
+    # orjson сам кодирует datetime, date и Enum. __dict__ моделей pydantic
+    # содержит только поля и на порядок быстрее dict(model)
+    if isinstance(value, BaseModel):
+        return value.__dict__
+    raise TypeError(f"Тип {type(value).__name__} не сериализуется в JSON")
+
+
+def dump_json(content: Any) -> bytes:
+    """JSON через orjson; модели pydantic раскрываются без повторной валидации"""
+    return orjson.dumps(content, default=_default)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    JSON-ответ через orjson. Принимает готовые байты (dump_json) или
+    данные с уже провалидированными моделями. Обработчик, вернувший
+    Response, не проходит проверку по response_model в FastAPI; соответствие
+    схеме проверяет FastJSONRoute при RESPONSE_VALIDATION
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dump_json(content)
+
+
+class FastJSONRoute(APIRoute):
+    """
+    Маршрут, который при RESPONSE_VALIDATION проверяет тело
+    FastJSONResponse по объявленному response_model, чтобы быстрые ответы
+    не расходились со схемой OpenAPI
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        if not RESPONSE_VALIDATION or self.response_model is None:
+            return handler
+
+        adapter = TypeAdapter(self.response_model)
+
+        async def route_handler(request: Request) -> Response:
+            response = await handler(request)
+            if isinstance(response, FastJSONResponse) and response.status_code == 200:
+                try:
+                    adapter.validate_json(response.body)
+                except ValidationError as e:
+                    raise ResponseValidationError(e.errors(), body=response.body)
+            return response
+
+        return route_handler
@@ -0,0 +1,302 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+from fastapi import HTTPException, status
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    AsyncOpenAI,
+    RateLimitError,
+)
+from openai.types.chat.chat_completion import ChatCompletion
+
+from core import metrics
+
+logger = logging.getLogger(__name__)
+
+# Общий лимит одновременных запросов к OpenAI на процесс
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "32"))
+# Лимит одновременных запросов одного пользователя
+OPENAI_MAX_CONCURRENCY_PER_USER = int(
+    os.getenv("OPENAI_MAX_CONCURRENCY_PER_USER", "2"))
+# Сколько ждать свободного слота, прежде чем ответить 503
+OPENAI_ACQUIRE_TIMEOUT = float(os.getenv("OPENAI_ACQUIRE_TIMEOUT", "10"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "3"))
+OPENAI_BACKOFF_BASE = float(os.getenv("OPENAI_BACKOFF_BASE", "0.5"))
+OPENAI_BACKOFF_MAX = float(os.getenv("OPENAI_BACKOFF_MAX", "8"))
+
+OPENAI_BREAKER_FAILURES = int(os.getenv("OPENAI_BREAKER_FAILURES", "5"))
+OPENAI_BREAKER_RESET_SECONDS = float(
+    os.getenv("OPENAI_BREAKER_RESET_SECONDS", "30"))
+
+
+class CircuitBreaker:
+    """
+    Размыкается после failure_threshold ошибок подряд и отклоняет запросы
+    reset_timeout секунд. Затем пропускает один пробный запрос (half-open):
+    успех замыкает цепь, ошибка снова ее размыкает.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+        self._open_gauge = metrics.gauge("openai_circuit_open")
+
+    def allow_request(self) -> bool:
+        if self._opened_at is None:
+            return True
+
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return False
+
+        # half-open: пропускаем только один пробный запрос
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    @property
+    def probe_in_flight(self) -> bool:
+        return self._probe_in_flight
+
+    def release_probe(self):
+        """
+        Пробный запрос завершился без результата (отменен или упал
+        с непредвиденной ошибкой): следующий запрос снова станет пробным
+        """
+        self._probe_in_flight = False
+
+    def record_success(self):
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+        self._open_gauge.set(0)
+
+    def record_failure(self):
+        self._failures += 1
+        self._probe_in_flight = False
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logger.warning("OpenAI: цепь разомкнута после серии ошибок")
+            self._opened_at = time.monotonic()
+            self._open_gauge.set(1)
+
+
+class LLMClient:
+    """
+    Общий для приложения клиент OpenAI.
+    Держит один AsyncOpenAI с keep-alive пулом соединений, ограничивает
+    конкурентность (глобально и на пользователя), повторяет запросы при
+    429/5xx с экспоненциальной задержкой и jitter, а при деградации
+    провайдера быстро отвечает 503 через circuit breaker.
+    """
+
+    def __init__(
+        self,
+        client: Optional[AsyncOpenAI] = None,
+        max_concurrency: int = OPENAI_MAX_CONCURRENCY,
+        max_concurrency_per_user: int = OPENAI_MAX_CONCURRENCY_PER_USER,
+        max_retries: int = OPENAI_MAX_RETRIES,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        if client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_concurrency,
+                    max_keepalive_connections=max_concurrency,
+                ),
+                timeout=OPENAI_TIMEOUT,
+            )
+            # Повторы выполняются здесь, встроенные повторы SDK отключены.
+            # base_url берется из OPENAI_BASE_URL, что позволяет работать
+            # с локальной заглушкой (scripts/mock_openai_server.py)
+            client = AsyncOpenAI(max_retries=0, http_client=http_client)
+
+        self.client = client
+        self.max_concurrency_per_user = max_concurrency_per_user
+        self.max_retries = max_retries
+        self.breaker = breaker or CircuitBreaker(
+            OPENAI_BREAKER_FAILURES,
+            OPENAI_BREAKER_RESET_SECONDS,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._user_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._user_waiters: Dict[str, int] = {}
+
+        self._requests = metrics.counter("openai_requests_total")
+        self._retries = metrics.counter("openai_retries_total")
+        self._failures = metrics.counter("openai_failures_total")
+        self._rejected = metrics.counter("openai_rejected_total")
+        self._in_flight = metrics.gauge("openai_in_flight")
+
+    async def chat_completion(self, user_id: str, **params) -> ChatCompletion:
+        """Вызов chat.completions.create с лимитами, повторами и circuit breaker"""
+        async with self._slot(user_id):
+            return await self._with_retries(
+                self.client.chat.completions.create, **params)
+
+    async def chat_completion_stream(self, user_id: str, **params) -> AsyncIterator[str]:
+        """
+        Потоковый вызов chat.completions.create: отдает фрагменты текста ответа
+        по мере генерации. Слот конкурентности занят до конца стрима, повторы
+        возможны только до получения ответа
+        """
+        async with self._slot(user_id):
+            stream = await self._with_retries(
+                self.client.chat.completions.create, stream=True, **params)
+            async with stream:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+
+    async def close(self):
+        await self.client.close()
+
+    def _slot(self, user_id: str) -> "_ConcurrencySlot":
+        return _ConcurrencySlot(self, user_id)
+
+    async def _with_retries(self, call, **params):
+        attempt = 0
+        while True:
+            if not self.breaker.allow_request():
+                self._rejected.inc()
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Сервис OpenAI временно недоступен",
+                    headers={"Retry-After": str(int(self.breaker.reset_timeout))},
+                )
+
+            # allow_request только что занял пробный запрос half-open
+            probe = self.breaker.probe_in_flight
+            self._requests.inc()
+            try:
+                try:
+                    response = await call(**params)
+                finally:
+                    # Иначе отмена пробного запроса оставила бы цепь
+                    # разомкнутой навсегда. Исход запроса фиксируется ниже
+                    if probe:
+                        self.breaker.release_probe()
+            except (RateLimitError, APIConnectionError, APITimeoutError, APIStatusError) as e:
+                if not _is_retryable(e):
+                    # Ошибки запроса (4xx) не говорят о деградации провайдера
+                    self.breaker.record_success()
+                    raise
+
+                self._failures.inc()
+                self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise
+
+                delay = _backoff_delay(attempt, e)
+                attempt += 1
+                self._retries.inc()
+                logger.warning(
+                    f"OpenAI: {type(e).__name__}, повтор {attempt}/{self.max_retries} через {delay:.2f} s")
+                await asyncio.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return response
+
+
+class _ConcurrencySlot:
+    """Захватывает глобальный и пользовательский семафоры LLMClient"""
+
+    def __init__(self, llm_client: LLMClient, user_id: str):
+        self.llm_client = llm_client
+        self.user_id = user_id
+        self._user_semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self):
+        llm_client = self.llm_client
+        user_semaphore = llm_client._user_semaphores.get(self.user_id)
+        if user_semaphore is None:
+            user_semaphore = asyncio.Semaphore(
+                llm_client.max_concurrency_per_user)
+            llm_client._user_semaphores[self.user_id] = user_semaphore
+        llm_client._user_waiters[self.user_id] = llm_client._user_waiters.get(
+            self.user_id, 0) + 1
+        self._user_semaphore = user_semaphore
+
+        # При отмене запроса во время ожидания разрешения и запись
+        # пользователя освобождаются так же, как по тайм-ауту
+        try:
+            await asyncio.wait_for(user_semaphore.acquire(), OPENAI_ACQUIRE_TIMEOUT)
+        except BaseException as e:
+            self._release_user_entry()
+            if not isinstance(e, asyncio.TimeoutError):
+                raise
+            llm_client._rejected.inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Слишком много одновременных запросов к ассистенту",
+            )
+
+        try:
+            await asyncio.wait_for(llm_client._semaphore.acquire(), OPENAI_ACQUIRE_TIMEOUT)
+        except BaseException as e:
+            user_semaphore.release()
+            self._release_user_entry()
+            if not isinstance(e, asyncio.TimeoutError):
+                raise
+            llm_client._rejected.inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Ассистент перегружен, повторите попытку позже",
+                headers={"Retry-After": "1"},
+            )
+
+        llm_client._in_flight.inc()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        llm_client = self.llm_client
+        llm_client._in_flight.dec()
+        llm_client._semaphore.release()
+        self._user_semaphore.release()
+        self._release_user_entry()
+
+    def _release_user_entry(self):
+        # Семафоры неактивных пользователей удаляются, чтобы словарь не рос
+        llm_client = self.llm_client
+        waiters = llm_client._user_waiters[self.user_id] - 1
+        if waiters:
+            llm_client._user_waiters[self.user_id] = waiters
+        else:
+            del llm_client._user_waiters[self.user_id]
+            del llm_client._user_semaphores[self.user_id]
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (RateLimitError, APIConnectionError, APITimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def _backoff_delay(attempt: int, error: Exception) -> float:
+    """Экспоненциальная задержка с full jitter, с учетом Retry-After"""
+    delay = random.uniform(
+        0, min(OPENAI_BACKOFF_MAX, OPENAI_BACKOFF_BASE * (2 ** attempt)))
+
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            delay = max(delay, min(float(retry_after), OPENAI_BACKOFF_MAX))
+        except ValueError:
+            pass
+
+    return delay
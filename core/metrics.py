@@ -0,0 +1,72 @@
+import threading
+from typing import Dict, Union
+
+
+class Counter:
+    """Монотонно возрастающий счетчик"""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: Union[int, float] = 1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> Union[int, float]:
+        return self._value
+
+
+class Gauge:
+    """Значение, которое может как расти, так и уменьшаться"""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def set(self, value: Union[int, float]):
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: Union[int, float] = 1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: Union[int, float] = 1):
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> Union[int, float]:
+        return self._value
+
+
+_metrics: Dict[str, Union[Counter, Gauge]] = {}
+_registry_lock = threading.Lock()
+
+
+def counter(name: str, description: str = "") -> Counter:
+    """Возвращает счетчик по имени, создавая его при первом обращении"""
+    with _registry_lock:
+        if name not in _metrics:
+            _metrics[name] = Counter(name, description)
+        return _metrics[name]
+
+
+def gauge(name: str, description: str = "") -> Gauge:
+    """Возвращает gauge по имени, создавая его при первом обращении"""
+    with _registry_lock:
+        if name not in _metrics:
+            _metrics[name] = Gauge(name, description)
+        return _metrics[name]
+
+
+def snapshot() -> Dict[str, Union[int, float]]:
+    """Текущие значения всех метрик процесса"""
+    with _registry_lock:
+        return {name: metric.value for name, metric in sorted(_metrics.items())}
@@ -0,0 +1,72 @@
+import json
+import logging
+import os
+from typing import List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Файлы, которые пишет scripts/export_embedding_onnx.py
+ONNX_CONFIG_FILE = "embedding_config.json"
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_INT8_MODEL_FILE = "model_int8.onnx"
+
+
+class OnnxEncoder:
+    """
+    Модель sentence-transformers, экспортированная в ONNX, с интерфейсом
+    SentenceTransformer.encode. Пулинг и нормализация входят в граф,
+    здесь остаются только токенизация и запуск onnxruntime на CPU.
+    Нужны пакеты onnxruntime и transformers (ставится вместе
+    с sentence-transformers).
+    """
+
+    def __init__(self, path: str, quantized: bool = False):
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise RuntimeError(
+                "Для EMBEDDING_BACKEND=onnx нужен пакет onnxruntime") from e
+        from transformers import AutoTokenizer
+
+        with open(os.path.join(path, ONNX_CONFIG_FILE), encoding="utf-8") as config_file:
+            config = json.load(config_file)
+        self.model_name = config["model"]
+        self.max_seq_length = config["max_seq_length"]
+        self._dimension = config["dimension"]
+
+        self.tokenizer = AutoTokenizer.from_pretrained(path)
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = (
+            onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL)
+        model_file = ONNX_INT8_MODEL_FILE if quantized else ONNX_MODEL_FILE
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(path, model_file),
+            options,
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = [item.name for item in self.session.get_inputs()]
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dimension
+
+    def encode(self, texts: List[str], batch_size: int = 32,
+               normalize_embeddings: bool = True, **kwargs) -> np.ndarray:
+        # Векторы уже нормализованы в графе, normalize_embeddings
+        # и остальные аргументы оставлены для совместимости с SentenceTransformer
+        # Сортировка по длине уменьшает паддинг внутри батча
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        vectors = np.empty((len(texts), self._dimension), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            indexes = order[start:start + batch_size]
+            tokens = self.tokenizer(
+                [texts[index] for index in indexes],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            inputs = {name: tokens[name].astype(np.int64) for name in self._input_names}
+            vectors[indexes] = self.session.run(None, inputs)[0]
+        return vectors
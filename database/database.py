@@ -1,18 +1,45 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker, Session
-from typing import Generator
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import declarative_base
+from typing import AsyncGenerator
 import os
 
+# Синхронный URL используется Alembic (psycopg2)
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-# Создаем синхронный движок
-engine = create_engine(DATABASE_URL)
 
-# Создаем фабрику сессий
-SessionLocal = sessionmaker(
-    autocommit=False,
+def get_async_database_url(url: str) -> str:
+    """
+    Преобразует URL базы данных в URL для асинхронного драйвера.
+    postgresql:// -> postgresql+asyncpg://, sqlite:// -> sqlite+aiosqlite://
+    """
+    database_url = make_url(url)
+    if database_url.drivername in ("postgresql", "postgresql+psycopg2"):
+        database_url = database_url.set(drivername="postgresql+asyncpg")
+    elif database_url.drivername == "sqlite":
+        database_url = database_url.set(drivername="sqlite+aiosqlite")
+    return database_url.render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
+
+# Создаем асинхронный движок на asyncpg
+engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+)
+
+# Создаем фабрику асинхронных сессий
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
     autoflush=False,
-    bind=engine
+    # Объекты остаются доступными после commit без повторного запроса в БД
+    expire_on_commit=False,
 )
 
 # Базовый класс для моделей
@@ -21,13 +48,11 @@ Base = declarative_base()
 # Dependency для FastAPI
 
 
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
-    try:
-        yield db
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with SessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
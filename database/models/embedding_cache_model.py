@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, DateTime, LargeBinary
+from database.database import Base
+from datetime import datetime
+
+
+class EmbeddingCacheModel(Base):
+    """
+    Постоянный уровень кэша эмбеддингов.
+    Вектор хранится как массив float16 (2 байта на компоненту).
+    """
+    __tablename__ = "embedding_cache"
+
+    model = Column(String, primary_key=True)
+    # sha256 нормализованного текста
+    content_hash = Column(LargeBinary(32), primary_key=True)
+    vector = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
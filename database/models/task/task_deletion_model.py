@@ -0,0 +1,24 @@
+from sqlalchemy import Column, DateTime, Index, String
+from database.database import Base
+from datetime import datetime
+
+
+class TaskDeletionModel(Base):
+    """
+    Удаленные задачи (tombstones) для синхронизации изменений клиентов.
+    Запись добавляется в той же транзакции, что и удаление задачи;
+    записи старше TASK_TOMBSTONE_RETENTION_DAYS удаляет
+    scripts/purge_task_deletions.py.
+    """
+    __tablename__ = "task_deletions"
+    __table_args__ = (
+        # Keyset pagination изменений по (deleted_at, task_id)
+        Index("ix_task_deletions_user_id_deleted_at", "user_id", "deleted_at", "task_id"),
+    )
+
+    task_id = Column(String, primary_key=True)
+    user_id = Column(String, nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.now)
+
+    def __repr__(self):
+        return f"<TaskDeletion(task_id={self.task_id}, user_id={self.user_id})>"
@@ -0,0 +1,30 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String
+from database.database import Base
+from datetime import datetime
+
+
+class TaskIndexOutboxModel(Base):
+    """
+    Изменения задач, которые нужно перенести в поисковый индекс.
+    Запись добавляется в той же транзакции, что и изменение задачи,
+    и удаляется индексатором после обновления Qdrant.
+    """
+    __tablename__ = "task_index_outbox"
+
+    # Autoincrement в SQLite работает только для INTEGER PRIMARY KEY
+    id = Column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    task_id = Column(String, nullable=False)
+    user_id = Column(String, nullable=False)
+    # upsert — пересчитать вектор задачи, delete — удалить точку
+    operation = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+    # Запись занята индексатором до этого времени; после него
+    # (индексатор упал) пачка обрабатывается повторно
+    locked_until = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<TaskIndexOutbox(id={self.id}, task_id={self.task_id}, operation={self.operation})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Enum, ForeignKey
+from sqlalchemy import DDL, Column, String, DateTime, Enum, ForeignKey, Index, event
 from sqlalchemy.orm import relationship
 from database.database import Base
 from datetime import datetime
@@ -14,6 +14,29 @@ class TaskStatusModel(enum.Enum):
 
 class TaskModel(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Покрывает выборку задач пользователя за день с фильтром по статусу
+        Index("ix_tasks_user_id_date_status", "user_id", "date", "status"),
+        # Keyset pagination списка задач по (date, id)
+        Index("ix_tasks_user_id_date_id", "user_id", "date", "id"),
+        # Синхронизация изменений (GET /tasks/changes) по (updated_at, id)
+        Index("ix_tasks_user_id_updated_at", "user_id", "updated_at", "id"),
+        # Диапазонные фильтры TaskFilterSchema (compile_task_filters)
+        Index("ix_tasks_user_id_start_time", "user_id", "start_time"),
+        Index("ix_tasks_user_id_end_time", "user_id", "end_time"),
+        Index("ix_tasks_user_id_reminder", "user_id", "reminder"),
+        # Поиск с опечатками (pg_trgm), только PostgreSQL
+        Index(
+            "ix_tasks_user_id_title_trgm", "user_id", "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_tasks_user_id_description_trgm", "user_id", "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(String, primary_key=True)
     title = Column(String, nullable=False)
@@ -44,3 +67,37 @@ class TaskModel(Base):
 
     def __repr__(self):
         return f"<Task(id={self.id}, title={self.title}, user_id={self.user_id})>"
+
+
+# Полнотекстовый поиск (только PostgreSQL). Колонку search_vector
+# вычисляет БД, в модель она не отображается; в запросах используется
+# TASK_SEARCH_VECTOR. Для существующих БД то же делает миграция d41b7e9c3a52
+TASK_SEARCH_VECTOR = "tasks.search_vector"
+
+for extension in ("pg_trgm", "btree_gin"):
+    event.listen(
+        TaskModel.__table__,
+        "before_create",
+        DDL(f"CREATE EXTENSION IF NOT EXISTS {extension}").execute_if(
+            dialect="postgresql"),
+    )
+
+event.listen(
+    TaskModel.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('russian', coalesce(description, '')), 'B')"
+        ") STORED"
+    ).execute_if(dialect="postgresql"),
+)
+
+event.listen(
+    TaskModel.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX ix_tasks_user_id_search_vector "
+        "ON tasks USING gin (user_id, search_vector)"
+    ).execute_if(dialect="postgresql"),
+)
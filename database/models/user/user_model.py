@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import BigInteger, Column, String, DateTime
 from sqlalchemy.orm import relationship
 from database.database import Base
 from datetime import datetime
@@ -21,6 +21,13 @@ class UserModel(Base):
         default=datetime.now,
         onupdate=datetime.now
     )
+    # Увеличивается при каждом изменении задач пользователя (входит в ETag)
+    tasks_version = Column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
 
     # Определение отношений
     tasks = relationship("TaskModel", back_populates="user")
@@ -1,19 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
+import os
 
 from api.auth.routes import auth_routes
 from api.task.routes import task_routes
 from api.user.routes import user_routes
+from api.metrics.routes import metrics_routes
+from api.schedule.routes import schedule_routes
+from api.auth.service.password_hasher import password_hasher
+from api.task.service.task_indexer import TASK_INDEXER_ENABLED, task_indexer
+from api.task.service.task_search_index import task_search_index
+from core.embedder import embedder
+from core.llm_client import LLMClient
 from database.database import Base, engine
 from config.logging_config import setup_logging
 
 
-# Создаем таблицы
-Base.metadata.create_all(bind=engine)
-
 # Инициализируем логирование
 setup_logging()
+logger = logging.getLogger(__name__)
 
 # Настройка логирования
 # logging.basicConfig(
@@ -25,8 +32,40 @@ setup_logging()
 #     ]
 # )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Создаем таблицы
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    # Один клиент OpenAI с общим пулом соединений на весь процесс.
+    # Без ключа API остальные эндпоинты работают, ассистент отвечает 503
+    app.state.llm_client = None
+    if os.getenv("OPENAI_API_KEY"):
+        app.state.llm_client = LLMClient()
+    else:
+        logger.warning("OPENAI_API_KEY не задан, ассистент недоступен")
+
+    # Перенос изменений задач из task_index_outbox в поисковый индекс
+    if TASK_INDEXER_ENABLED:
+        task_indexer.start()
+
+    yield
+
+    await task_indexer.stop()
+    if app.state.llm_client is not None:
+        await app.state.llm_client.close()
+    await task_search_index.close()
+    await embedder.close()
+
+    # Закрываем пул соединений и пул хеширования паролей
+    await engine.dispose()
+    password_hasher.shutdown()
+
+
 # Инициализация FastAPI приложения
-app = FastAPI(title="Task Management API")
+app = FastAPI(title="Task Management API", lifespan=lifespan)
 
 # Настройка CORS
 app.add_middleware(
@@ -41,6 +80,8 @@ app.add_middleware(
 app.include_router(user_routes.router, prefix="/api")
 app.include_router(task_routes.router, prefix="/api")
 app.include_router(auth_routes.router, prefix="/api")
+app.include_router(metrics_routes.router, prefix="/api")
+app.include_router(schedule_routes.router, prefix="/api")
 
 # Точка входа для запуска приложения (если требуется запуск локально)
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+"""add_tasks_time_range_indexes
+
+Revision ID: 0b8c9bdcc2cd
+Revises: 954f972fd22a
+Create Date: 2025-05-06 14:02:11.503812
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b8c9bdcc2cd'
+down_revision: Union[str, None] = '954f972fd22a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Индексы под диапазонные фильтры задач пользователя
+indexes = {
+    'ix_tasks_user_id_start_time': ['user_id', 'start_time'],
+    'ix_tasks_user_id_end_time': ['user_id', 'end_time'],
+    'ix_tasks_user_id_reminder': ['user_id', 'reminder'],
+}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in indexes.items():
+            op.create_index(
+                name,
+                'tasks',
+                columns,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in indexes:
+            op.drop_index(
+                name,
+                table_name='tasks',
+                postgresql_concurrently=True,
+            )
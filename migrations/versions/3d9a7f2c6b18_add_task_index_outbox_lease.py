@@ -0,0 +1,30 @@
+"""add_task_index_outbox_lease
+
+Revision ID: 3d9a7f2c6b18
+Revises: b6e0d4f27a83
+Create Date: 2025-05-12 11:20:41.508362
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d9a7f2c6b18'
+down_revision: Union[str, None] = 'b6e0d4f27a83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Срок, до которого пачка занята индексатором (TaskIndexer.process_batch)
+    op.add_column(
+        'task_index_outbox',
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('task_index_outbox', 'locked_until')
@@ -0,0 +1,39 @@
+"""add_tasks_user_id_date_id_index
+
+Revision ID: 5e2a8c1f9b47
+Revises: d41b7e9c3a52
+Create Date: 2025-05-08 15:36:04.721953
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a8c1f9b47'
+down_revision: Union[str, None] = 'd41b7e9c3a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination списка задач: WHERE user_id = ? AND (date, id) > (?, ?)
+    # ORDER BY date, id читается из индекса без сортировки
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_user_id_date_id',
+            'tasks',
+            ['user_id', 'date', 'id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_user_id_date_id',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
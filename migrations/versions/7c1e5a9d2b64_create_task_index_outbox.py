@@ -0,0 +1,36 @@
+"""create_task_index_outbox
+
+Revision ID: 7c1e5a9d2b64
+Revises: 0b8c9bdcc2cd
+Create Date: 2025-05-06 11:42:15.104387
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e5a9d2b64'
+down_revision: Union[str, None] = '0b8c9bdcc2cd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Очередь изменений задач для поискового индекса.
+    # Без внешнего ключа: запись об удалении переживает саму задачу
+    op.create_table(
+        'task_index_outbox',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('task_id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('operation', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_index_outbox')
@@ -0,0 +1,55 @@
+"""add_task_changes_sync
+
+Revision ID: 8f3d6b2a0c19
+Revises: 5e2a8c1f9b47
+Create Date: 2025-05-09 11:05:23.904517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3d6b2a0c19'
+down_revision: Union[str, None] = '5e2a8c1f9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Удаленные задачи для синхронизации клиентов.
+    # Без внешнего ключа: запись об удалении переживает саму задачу
+    op.create_table(
+        'task_deletions',
+        sa.Column('task_id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('task_id'),
+    )
+    op.create_index(
+        'ix_task_deletions_user_id_deleted_at',
+        'task_deletions',
+        ['user_id', 'deleted_at', 'task_id'],
+    )
+
+    # Keyset pagination изменений задач по (updated_at, id)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_user_id_updated_at',
+            'tasks',
+            ['user_id', 'updated_at', 'id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_user_id_updated_at',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
+    op.drop_index('ix_task_deletions_user_id_deleted_at', table_name='task_deletions')
+    op.drop_table('task_deletions')
@@ -0,0 +1,52 @@
+"""add_tasks_user_id_date_status_index
+
+Revision ID: 954f972fd22a
+Revises: 2ce5ac80ca5a
+Create Date: 2025-05-02 10:21:37.418251
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '954f972fd22a'
+down_revision: Union[str, None] = '2ce5ac80ca5a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Индекс строится без блокировки записи в tasks
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_user_id_date_status',
+            'tasks',
+            ['user_id', 'date', 'status'],
+            postgresql_concurrently=True,
+        )
+
+        # ix_tasks_user_id покрывается префиксом составного индекса
+        op.drop_index(
+            'ix_tasks_user_id',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_user_id',
+            'tasks',
+            ['user_id'],
+            postgresql_concurrently=True,
+        )
+
+        op.drop_index(
+            'ix_tasks_user_id_date_status',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
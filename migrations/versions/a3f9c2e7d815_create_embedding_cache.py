@@ -0,0 +1,34 @@
+"""create_embedding_cache
+
+Revision ID: a3f9c2e7d815
+Revises: 7c1e5a9d2b64
+Create Date: 2025-05-07 14:08:51.660213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f9c2e7d815'
+down_revision: Union[str, None] = '7c1e5a9d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Векторы float16 по (модель, sha256 текста)
+    op.create_table(
+        'embedding_cache',
+        sa.Column('model', sa.String(), nullable=False),
+        sa.Column('content_hash', sa.LargeBinary(length=32), nullable=False),
+        sa.Column('vector', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('model', 'content_hash'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('embedding_cache')
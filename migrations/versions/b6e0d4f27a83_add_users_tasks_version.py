@@ -0,0 +1,31 @@
+"""add_users_tasks_version
+
+Revision ID: b6e0d4f27a83
+Revises: 8f3d6b2a0c19
+Create Date: 2025-05-09 16:48:10.215736
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e0d4f27a83'
+down_revision: Union[str, None] = '8f3d6b2a0c19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Версия задач пользователя для ETag. Константный DEFAULT
+    # не переписывает таблицу (PostgreSQL 11+)
+    op.add_column(
+        'users',
+        sa.Column('tasks_version', sa.BigInteger(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'tasks_version')
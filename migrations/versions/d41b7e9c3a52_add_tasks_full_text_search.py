@@ -0,0 +1,71 @@
+"""add_tasks_full_text_search
+
+Revision ID: d41b7e9c3a52
+Revises: a3f9c2e7d815
+Create Date: 2025-05-08 10:17:42.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41b7e9c3a52'
+down_revision: Union[str, None] = 'a3f9c2e7d815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Заголовок важнее описания при ранжировании
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B')"
+)
+
+# Индексы GIN с user_id первым столбцом (btree_gin): поиск всегда
+# ограничен задачами одного пользователя
+trigram_indexes = {
+    'ix_tasks_user_id_title_trgm': 'title',
+    'ix_tasks_user_id_description_trgm': 'description',
+}
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    # Генерируемая колонка переписывает таблицу под эксклюзивной
+    # блокировкой: на больших таблицах выполнять в окно обслуживания
+    op.execute(
+        f"ALTER TABLE tasks ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_user_id_search_vector',
+            'tasks',
+            ['user_id', 'search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+        for name, column in trigram_indexes.items():
+            op.create_index(
+                name,
+                'tasks',
+                ['user_id', column],
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in ['ix_tasks_user_id_search_vector', *trigram_indexes]:
+            op.drop_index(
+                name,
+                table_name='tasks',
+                postgresql_concurrently=True,
+            )
+    op.drop_column('tasks', 'search_vector')
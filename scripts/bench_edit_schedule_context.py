@@ -0,0 +1,105 @@
+# Запуск из корня репозитория: python -m scripts.bench_edit_schedule_context
+# Сквозная задержка измеряется против заглушки OpenAI:
+#   python scripts/mock_openai_server.py --latency 0.02 &
+#   OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=mock \
+#       python -m scripts.bench_edit_schedule_context --e2e
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from api.schemas.schedule.filters_response_schema import DateTimeRange, TaskFilterSchema
+from api.service.schedule.schedule_context_builder import (
+    estimate_tokens,
+    schedule_context_builder,
+)
+from api.task.schemas.task.task_response_schema import TaskResponseSchema
+from database.models.task.task_model import TaskStatusModel
+
+REQUEST = "Перенеси все созвоны на завтра на вечер"
+
+TITLES = ["Созвон с командой", "Тренировка", "Купить продукты",
+          "Подготовить отчет", "Позвонить маме", "Ревью проекта"]
+
+
+def generate_tasks(count: int, now: datetime) -> list[TaskResponseSchema]:
+    rnd = random.Random(count)
+    return [
+        TaskResponseSchema(
+            id=str(uuid4()),
+            title=rnd.choice(TITLES),
+            description=rnd.choice([None, "Обсудить план на неделю и сроки"]),
+            date=now.replace(minute=0, second=0, microsecond=0)
+            + timedelta(hours=rnd.randint(-24 * 30, 24 * 30)),
+            status=rnd.choice(list(TaskStatusModel)),
+        )
+        for _ in range(count)
+    ]
+
+
+def legacy_context(tasks: list[TaskResponseSchema]) -> str:
+    """Кодирование до изменения: json.dumps(indent=2) над строками model_dump_json"""
+    tasks_json = [task.model_dump_json() for task in tasks]
+    return json.dumps({"user_request": REQUEST, "tasks": tasks_json}, indent=2)
+
+
+def compare_tokens(sizes: list[int], now: datetime, filters: TaskFilterSchema):
+    print(f"{'задач':>6} | {'было токенов':>12} | {'стало (все)':>11} | "
+          f"{'частей':>6} | {'1-я часть':>9} | {'сборка, ms':>10}")
+    for size in sizes:
+        tasks = generate_tasks(size, now)
+        legacy_tokens = estimate_tokens(legacy_context(tasks))
+
+        started = time.perf_counter()
+        contexts = schedule_context_builder.build(REQUEST, tasks, filters, now)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        tokens = [estimate_tokens(context) for context in contexts]
+        print(f"{size:>6} | {legacy_tokens:>12} | {sum(tokens):>11} | "
+              f"{len(contexts):>6} | {tokens[0]:>9} | {elapsed:>10.1f}")
+
+
+async def measure_latency(sizes: list[int], now: datetime, filters: TaskFilterSchema, repeats: int):
+    from core.llm_client import LLMClient
+    from api.service.schedule.schedule_service import ScheduleService
+
+    client = LLMClient()
+    service = ScheduleService(client, db_session=None)
+    try:
+        print(f"\n{'задач':>6} | {'p50, ms':>8} | {'max, ms':>8}")
+        for size in sizes:
+            tasks = generate_tasks(size, now)
+            latencies = []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                await service.edit_schedule(REQUEST, "bench", tasks, filters)
+                latencies.append((time.perf_counter() - started) * 1000)
+            latencies.sort()
+            print(f"{size:>6} | {latencies[len(latencies) // 2]:>8.1f} | {latencies[-1]:>8.1f}")
+    finally:
+        await client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Размер контекста и задержка edit_schedule")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--e2e", action="store_true",
+                        help="Измерить задержку edit_schedule (нужен OPENAI_BASE_URL)")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    now = datetime.now()
+    tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    filters = TaskFilterSchema(
+        start_time=DateTimeRange(gte=tomorrow, lte=tomorrow + timedelta(hours=23, minutes=59)),
+        mark="call",
+    )
+
+    compare_tokens(args.sizes, now, filters)
+    if args.e2e:
+        asyncio.run(measure_latency(args.sizes, now, filters, args.repeats))
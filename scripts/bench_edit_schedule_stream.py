@@ -0,0 +1,70 @@
+# Запуск из корня репозитория против заглушки OpenAI с потоковым ответом:
+#   python scripts/mock_openai_server.py --latency 0.3 --token-delay 0.02 --tasks 10 &
+#   OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=mock \
+#       python -m scripts.bench_edit_schedule_stream
+
+import argparse
+import asyncio
+import time
+
+from api.service.schedule.schedule_service import ScheduleService
+from core.llm_client import LLMClient
+
+REQUEST = "Перенеси все созвоны на завтра на вечер"
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+async def bench(repeats: int):
+    """
+    Сравнивает время до первой задачи в потоковом edit_schedule
+    со временем полного ответа edit_schedule без стрима
+    """
+    client = LLMClient()
+    service = ScheduleService(client, db_session=None)
+
+    full_latencies = []
+    first_task_latencies = []
+    stream_latencies = []
+    tasks_count = 0
+    try:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            schedule = await service.edit_schedule(REQUEST, "bench")
+            full_latencies.append(time.perf_counter() - started)
+            tasks_count = len(schedule.tasks)
+
+            started = time.perf_counter()
+            first_task = None
+            async for _ in service.edit_schedule_stream(REQUEST, "bench"):
+                if first_task is None:
+                    first_task = time.perf_counter() - started
+            stream_latencies.append(time.perf_counter() - started)
+            first_task_latencies.append(first_task)
+    finally:
+        await client.close()
+
+    print(f"Задач в ответе: {tasks_count}, повторов: {repeats}")
+    print(f"{'':<26} | {'p50, ms':>8} | {'p99, ms':>8}")
+    for title, latencies in [
+        ("edit_schedule (целиком)", full_latencies),
+        ("stream: первая задача", first_task_latencies),
+        ("stream: все задачи", stream_latencies),
+    ]:
+        if None in latencies:
+            print(f"{title:<26} | {'—':>8} | {'—':>8}")
+            continue
+        print(f"{title:<26} | {percentile(latencies, 0.5) * 1000:>8.0f} | "
+              f"{percentile(latencies, 0.99) * 1000:>8.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Время до первой задачи в потоковом edit_schedule")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(bench(args.repeats))
@@ -0,0 +1,124 @@
+# Запуск из корня репозитория (нужна модель эмбеддингов; для onnx — экспорт
+# python -m scripts.export_embedding_onnx):
+#   python -m scripts.bench_embedding_backends --backends torch int8 onnx onnx-int8
+# Эталон для recall@10 — исходная модель float32 (backend torch).
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from core.embedder import EMBEDDING_ONNX_PATH, Embedder
+
+ACTIONS = ["Созвониться с", "Встретиться с", "Поужинать с", "Сходить в кино с",
+           "Обсудить бюджет с", "Обсудить отпуск с", "Договориться о ремонте с",
+           "Согласовать договор с"]
+PEOPLE = ["мамой", "бухгалтером", "командой разработки", "клиентом из Казани",
+          "стоматологом", "арендодателем", "руководителем", "соседом"]
+CHORES = ["Купить продукты на неделю", "Оплатить коммунальные услуги",
+          "Забрать посылку с почты", "Записаться к врачу", "Помыть машину",
+          "Починить кран на кухне", "Продлить страховку", "Сдать книги в библиотеку",
+          "Тренировка в зале", "Пробежка в парке", "Йога вечером",
+          "Подготовить презентацию", "Ревью кода", "Выучить 20 английских слов"]
+DETAILS = [None, "Не забыть документы", "Взять ноутбук и зарядку",
+           "Уточнить время заранее", "Обсудить план на квартал",
+           "Срочно, до конца дня", "Если будет дождь — перенести"]
+WHEN = ["", " в понедельник", " во вторник", " в среду", " в четверг", " в пятницу",
+        " в субботу", " утром", " вечером", " после обеда", " на выходных"]
+QUERIES = ["созвон с командой", "купить еду", "спорт", "поход к врачу",
+           "оплата счетов", "подготовка к презентации", "позвонить родителям",
+           "дела по дому", "машина", "учеба английский", "встреча с клиентом",
+           "документы по договору", "отчет для бухгалтерии", "пробежка утром",
+           "ремонт на кухне", "страховка", "забрать заказ", "поздравить с днем рождения"]
+
+
+def generate_corpus(count: int) -> list[str]:
+    """
+    Фиксированный корпус уникальных задач (seed 0): результаты сравнимы
+    между запусками, а одинаковые тексты не делают top-k неоднозначным
+    """
+    capacity = (len(ACTIONS) * len(PEOPLE) + len(CHORES)) * len(WHEN) * len(DETAILS)
+    if count > capacity:
+        raise SystemExit(f"Уникальных задач не больше {capacity}")
+    rnd = random.Random(0)
+    corpus = {}
+    while len(corpus) < count:
+        if rnd.random() < 0.5:
+            title = f"{rnd.choice(ACTIONS)} {rnd.choice(PEOPLE)}"
+        else:
+            title = rnd.choice(CHORES)
+        title += rnd.choice(WHEN)
+        details = rnd.choice(DETAILS)
+        corpus[f"{title}\n{details}" if details else title] = None
+    return list(corpus)
+
+
+def top_k(query_vectors: np.ndarray, corpus_vectors: np.ndarray, k: int) -> np.ndarray:
+    # Векторы нормализованы: косинусная близость = скалярное произведение
+    scores = query_vectors @ corpus_vectors.T
+    return np.argsort(-scores, axis=1, kind="stable")[:, :k]
+
+
+def bench(backend: str, corpus: list[str], latency_runs: int, onnx_path: str) -> dict:
+    embedder = Embedder(backend=backend, onnx_path=onnx_path)
+    loading_started = time.perf_counter()
+    embedder.embed(QUERIES[:1])
+    loading = time.perf_counter() - loading_started
+
+    started = time.perf_counter()
+    corpus_vectors = embedder.embed(corpus)
+    throughput = len(corpus) / (time.perf_counter() - started)
+
+    latencies = []
+    for index in range(latency_runs):
+        started = time.perf_counter()
+        embedder.embed([QUERIES[index % len(QUERIES)]])
+        latencies.append(time.perf_counter() - started)
+
+    query_vectors = embedder.embed(QUERIES)
+    embedder.shutdown()
+    return {
+        "loading": loading,
+        "throughput": throughput,
+        "p50": np.percentile(latencies, 50) * 1000,
+        "p99": np.percentile(latencies, 99) * 1000,
+        "corpus": corpus_vectors,
+        "queries": query_vectors,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Скорость и точность способов вычисления эмбеддингов на CPU")
+    parser.add_argument("--backends", nargs="+", default=["torch", "int8", "onnx", "onnx-int8"])
+    parser.add_argument("--corpus", type=int, default=3000, help="Задач в корпусе")
+    parser.add_argument("--latency-runs", type=int, default=300,
+                        help="Замеров векторизации одного запроса")
+    parser.add_argument("--onnx-path", default=EMBEDDING_ONNX_PATH)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.corpus)
+    # Эталон всегда считается первым
+    backends = ["torch"] + [backend for backend in args.backends if backend != "torch"]
+    results = {backend: bench(backend, corpus, args.latency_runs, args.onnx_path)
+               for backend in backends}
+
+    reference = results["torch"]
+    reference_top = top_k(reference["queries"], reference["corpus"], args.k)
+    print(f"Корпус: {len(corpus)} задач, запросов: {len(QUERIES)}")
+    print(f"{'backend':<10} | {'загрузка, s':>11} | {'emb/s':>7} | {'p50, ms':>7} | "
+          f"{'p99, ms':>7} | {f'recall@{args.k}':>9} | {'cos с float':>11}")
+    for backend in backends:
+        result = results[backend]
+        backend_top = top_k(result["queries"], result["corpus"], args.k)
+        recall = np.mean([
+            len(set(expected) & set(found)) / args.k
+            for expected, found in zip(reference_top, backend_top)
+        ])
+        # Средняя близость векторов корпуса к векторам исходной модели
+        similarity = np.mean(np.sum(result["corpus"] * reference["corpus"], axis=1))
+        print(f"{backend:<10} | {result['loading']:>11.2f} | {result['throughput']:>7.0f} | "
+              f"{result['p50']:>7.1f} | {result['p99']:>7.1f} | {recall:>9.3f} | "
+              f"{similarity:>11.4f}")
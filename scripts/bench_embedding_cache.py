@@ -0,0 +1,77 @@
+# Запуск из корня репозитория (нужны DATABASE_URL и модель эмбеддингов):
+#   python -m scripts.bench_embedding_cache --tasks 20000 --changed 0.05
+
+import argparse
+import asyncio
+import random
+import time
+
+import main  # noqa: F401  регистрирует все модели SQLAlchemy
+from core.embedder import embedder
+from core.embedding_cache import CachedEmbedder
+from database.database import Base, engine
+
+TITLES = ["Созвон с командой", "Тренировка", "Купить продукты",
+          "Подготовить отчет", "Позвонить маме", "Ревью проекта"]
+DESCRIPTIONS = [None, "Обсудить план на неделю", "Не забыть документы",
+                "Проверить сроки", "Взять ноутбук"]
+BATCH_SIZE = 256
+
+
+def generate_corpus(count: int) -> list[str]:
+    rnd = random.Random(0)
+    corpus = []
+    for index in range(count):
+        text = f"{rnd.choice(TITLES)} #{index}"
+        description = rnd.choice(DESCRIPTIONS)
+        corpus.append(f"{text}\n{description}" if description else text)
+    return corpus
+
+
+async def reindex(embed, corpus: list[str]) -> tuple[float, float]:
+    """Векторизует корпус пачками, возвращает (CPU, wall) в секундах"""
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    for start in range(0, len(corpus), BATCH_SIZE):
+        await embed(corpus[start:start + BATCH_SIZE])
+    return time.process_time() - cpu_started, time.perf_counter() - started
+
+
+async def bench(tasks: int, changed: float):
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    corpus = generate_corpus(tasks)
+    embedder.embed(corpus[:1])
+
+    # Полная переиндексация без кэша
+    plain_cpu, plain_wall = await reindex(embedder.embed_async, corpus)
+
+    # Кэш заполняется первой переиндексацией
+    await reindex(CachedEmbedder().embed_async, corpus)
+
+    # Большая часть корпуса не изменилась (например, только смена статуса/даты).
+    # Новый экземпляр кэша — пустой уровень в памяти, как после перезапуска
+    rnd = random.Random(1)
+    for index in rnd.sample(range(tasks), int(tasks * changed)):
+        corpus[index] += " (изменено)"
+    cache = CachedEmbedder()
+    cached_cpu, cached_wall = await reindex(cache.embed_async, corpus)
+
+    print(f"Задач: {tasks}, изменено: {changed:.0%}, модель: {embedder.model_name}")
+    print(f"{'':<22} | {'CPU, s':>8} | {'wall, s':>8}")
+    print(f"{'без кэша':<22} | {plain_cpu:>8.1f} | {plain_wall:>8.1f}")
+    print(f"{'с кэшем (из таблицы)':<22} | {cached_cpu:>8.1f} | {cached_wall:>8.1f}")
+    print(f"Экономия CPU: {1 - cached_cpu / plain_cpu:.0%}")
+    print(f"Hit rate: {cache._hit_rate.value:.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Экономия CPU кэшем эмбеддингов при переиндексации")
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--changed", type=float, default=0.05,
+                        help="Доля задач с измененным текстом")
+    args = parser.parse_args()
+
+    asyncio.run(bench(args.tasks, args.changed))
@@ -0,0 +1,128 @@
+# Запуск из корня репозитория (Linux, нужна модель эмбеддингов):
+#   python -m scripts.bench_embedding_sidecar --workers 4 8
+# Воркеры имитируют процессы uvicorn: каждый держит concurrency одновременных
+# запросов векторизации одного поискового запроса.
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+SOCKET_PATH = "/tmp/dia_embedding_bench.sock"
+QUERIES = ["созвон с командой", "купить продукты на неделю", "тренировка вечером",
+           "подготовить отчет по проекту", "позвонить маме в субботу"]
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status_file:
+        for line in status_file:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def worker(mode: str, concurrency: int, ready, start, stop, results):
+    if mode == "sidecar":
+        os.environ["EMBEDDING_SERVICE_SOCKET"] = SOCKET_PATH
+    from core.embedder import create_embedder
+
+    embedder = create_embedder()
+    # Холодный старт: загрузка модели или первое обращение к сервису
+    cold_started = time.perf_counter()
+    embedder.embed(QUERIES[:1])
+    cold_start = time.perf_counter() - cold_started
+    ready.set()
+    start.wait()
+
+    async def run() -> int:
+        done = 0
+
+        async def client(index: int):
+            nonlocal done
+            while not stop.is_set():
+                await embedder.embed_async([QUERIES[(index + done) % len(QUERIES)]])
+                done += 1
+
+        await asyncio.gather(*[client(index) for index in range(concurrency)])
+        return done
+
+    results.put((asyncio.run(run()), cold_start))
+
+
+def start_sidecar() -> subprocess.Popen:
+    if os.path.exists(SOCKET_PATH):
+        os.remove(SOCKET_PATH)
+    sidecar = subprocess.Popen(
+        [sys.executable, "-m", "core.embedding_server", "--uds", SOCKET_PATH])
+    transport = httpx.HTTPTransport(uds=SOCKET_PATH)
+    with httpx.Client(transport=transport, base_url="http://embedding") as client:
+        while True:
+            try:
+                client.get("/info").raise_for_status()
+                return sidecar
+            except (httpx.TransportError, httpx.HTTPStatusError):
+                if sidecar.poll() is not None:
+                    raise SystemExit("Сервис эмбеддингов не запустился")
+                time.sleep(0.5)
+
+
+def bench(mode: str, workers: int, concurrency: int, duration: float) -> dict:
+    context = multiprocessing.get_context("spawn")
+    sidecar = start_sidecar() if mode == "sidecar" else None
+    start, stop = context.Event(), context.Event()
+    results = context.Queue()
+    processes = []
+    ready_events = []
+    for _ in range(workers):
+        ready = context.Event()
+        process = context.Process(
+            target=worker, args=(mode, concurrency, ready, start, stop, results))
+        process.start()
+        processes.append(process)
+        ready_events.append(ready)
+
+    for ready in ready_events:
+        ready.wait()
+
+    start.set()
+    time.sleep(duration / 2)
+    memory = sum(rss_mb(process.pid) for process in processes)
+    if sidecar is not None:
+        memory += rss_mb(sidecar.pid)
+    time.sleep(duration / 2)
+    stop.set()
+
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    if sidecar is not None:
+        sidecar.terminate()
+        sidecar.wait()
+
+    return {
+        "rps": sum(done for done, _ in outcomes) / duration,
+        "memory": memory,
+        "cold_start": max(cold_start for _, cold_start in outcomes),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Память и пропускная способность: модель в каждом воркере или общий сервис")
+    parser.add_argument("--workers", type=int, nargs="+", default=[4, 8])
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Одновременных запросов на воркер")
+    parser.add_argument("--duration", type=float, default=20)
+    args = parser.parse_args()
+
+    print(f"{'режим':<10} | {'воркеров':>8} | {'RSS, MB':>8} | {'emb/s':>7} | {'холодный старт, s':>17}")
+    for workers in args.workers:
+        for mode in ["inprocess", "sidecar"]:
+            result = bench(mode, workers, args.concurrency, args.duration)
+            print(f"{mode:<10} | {workers:>8} | {result['memory']:>8.0f} | "
+                  f"{result['rps']:>7.0f} | {result['cold_start']:>17.2f}")
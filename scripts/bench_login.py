@@ -0,0 +1,63 @@
+import argparse
+import asyncio
+import os
+import time
+from uuid import uuid4
+
+import httpx
+
+
+async def bench(base_url: str, concurrency: int, requests_count: int, cores: int):
+    """
+    Измеряет пропускную способность POST /api/auth/login.
+    Результат приводится к одному ядру сервера (--cores).
+    """
+    limits = httpx.Limits(
+        max_connections=concurrency,
+        max_keepalive_connections=concurrency,
+    )
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        email = f"bench-{uuid4().hex[:12]}@example.com"
+        password = str(uuid4())
+        response = await client.post("/api/auth/register", json={
+            "email": email,
+            "password": password,
+            "confirm_password": password,
+        })
+        response.raise_for_status()
+
+        statuses: dict[int, int] = {}
+        remaining = requests_count
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                response = await client.post("/api/auth/login", json={
+                    "email": email,
+                    "password": password,
+                })
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+
+    succeeded = statuses.get(200, 0)
+    print(f"Клиентов: {concurrency}, запросов: {requests_count}, статусы: {statuses}")
+    print(f"Успешных входов в секунду: {succeeded / elapsed:.1f}")
+    print(f"На одно ядро ({cores}): {succeeded / elapsed / cores:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Бенчмарк пропускной способности /api/auth/login")
+    parser.add_argument("--url", default=os.getenv("API_URL", "http://localhost:8000"))
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--cores", type=int, default=os.cpu_count(),
+                        help="Число ядер, доступных серверу")
+    args = parser.parse_args()
+
+    asyncio.run(bench(args.url, args.concurrency, args.requests, args.cores))
@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import os
+import time
+from uuid import uuid4
+
+import httpx
+
+
+async def prepare_tasks(client: httpx.AsyncClient, tasks_count: int) -> tuple[dict, list[str]]:
+    """
+    Регистрирует пользователя и создает ему задачи.
+    Возвращает заголовки авторизации и ID созданных задач.
+    """
+    password = str(uuid4())
+    response = await client.post("/api/auth/register", json={
+        "email": f"bench-{uuid4().hex[:12]}@example.com",
+        "password": password,
+        "confirm_password": password,
+    })
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    task_ids = []
+    for index in range(tasks_count):
+        response = await client.post("/api/tasks", headers=headers, json={
+            "title": f"Задача {index}",
+            "date": "2025-05-01T00:00:00",
+        })
+        response.raise_for_status()
+        task_ids.append(response.json()["id"])
+
+    return headers, task_ids
+
+
+async def bench(base_url: str, concurrency: int, requests_count: int, tasks_count: int):
+    """
+    Измеряет пропускную способность PATCH /api/tasks/{id}/complete.
+    Запросы равномерно распределяются по задачам пользователя.
+    """
+    limits = httpx.Limits(
+        max_connections=concurrency,
+        max_keepalive_connections=concurrency,
+    )
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        headers, task_ids = await prepare_tasks(client, tasks_count)
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        for index in range(requests_count):
+            queue.put_nowait(task_ids[index % len(task_ids)])
+
+        errors: list[int] = []
+
+        async def worker():
+            while not queue.empty():
+                task_id = queue.get_nowait()
+                response = await client.patch(
+                    f"/api/tasks/{task_id}/complete", headers=headers)
+                if response.status_code != 200:
+                    errors.append(response.status_code)
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+
+    print(f"Клиентов: {concurrency}, запросов: {requests_count}, ошибок: {len(errors)}")
+    print(f"Время: {elapsed:.2f} s")
+    print(f"RPS: {requests_count / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Бенчмарк пропускной способности PATCH /api/tasks/{id}/complete")
+    parser.add_argument("--url", default=os.getenv("API_URL", "http://localhost:8000"))
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--tasks", type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(bench(args.url, args.concurrency, args.requests, args.tasks))
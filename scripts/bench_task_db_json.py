@@ -0,0 +1,127 @@
+# Запуск из корня репозитория (PostgreSQL):
+#   python -m scripts.bench_task_db_json --seed --tasks 10000
+#   python -m scripts.bench_task_db_json --limit 10000
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+
+from sqlalchemy import text
+from sqlalchemy.future import select
+
+from api.task.schemas.task.task_list_response_schema import TasksResponseSchema
+from api.task.schemas.task.task_response_schema import TaskResponseSchema
+from api.task.schemas.task.task_filters_schema import TaskFiltersSchema
+from api.task.service.task_service import TaskService
+from core.json_response import dump_json
+from database.database import SessionLocal
+from database.models.task.task_model import TaskModel
+# Связи UserModel, без которых не настраиваются мапперы ORM
+from database.models.token_model import RefreshToken  # noqa: F401
+
+BENCH_USER_ID = "bench-json-user"
+
+SEED_USER_QUERY = """
+INSERT INTO users (id, email, hashed_password, created_at, updated_at)
+VALUES (:user_id, :email, 'x', now(), now())
+ON CONFLICT DO NOTHING
+"""
+
+SEED_TASKS_QUERY = """
+INSERT INTO tasks (id, title, description, date, status, user_id, created_at, updated_at)
+SELECT
+    'bench-json-' || n,
+    'Задача ' || n || ': созвон с командой',
+    CASE WHEN n % 3 = 0 THEN 'Обсудить план на неделю и бюджет проекта' END,
+    timestamp '2025-01-01 08:00' + n * interval '17 minutes',
+    'created',
+    :user_id,
+    now(),
+    now()
+FROM generate_series(1, :tasks) AS n
+ON CONFLICT DO NOTHING
+"""
+
+
+async def seed(tasks: int):
+    async with SessionLocal() as session:
+        await session.execute(text(SEED_USER_QUERY), {
+            "user_id": BENCH_USER_ID,
+            "email": f"{BENCH_USER_ID}@example.com",
+        })
+        await session.execute(text(SEED_TASKS_QUERY), {"user_id": BENCH_USER_ID, "tasks": tasks})
+        await session.commit()
+        await session.execute(text("ANALYZE tasks"))
+    print(f"✅ Задачи: {tasks}")
+
+
+async def orm_path(service: TaskService, limit: int) -> bytes:
+    """Исходный путь: ORM-объекты, model_validate на строку, model_dump_json"""
+    query = select(TaskModel).where(TaskModel.user_id == BENCH_USER_ID).order_by(
+        TaskModel.date, TaskModel.id).limit(limit)
+    tasks = (await service.db_session.execute(query)).scalars().all()
+    return TasksResponseSchema(
+        tasks=[TaskResponseSchema.model_validate(task) for task in tasks],
+    ).model_dump_json().encode("utf-8")
+
+
+async def columns_path(service: TaskService, limit: int) -> bytes:
+    """GET /tasks по умолчанию: колонки, TypeAdapter, orjson"""
+    tasks, next_cursor = await service.list_tasks(BENCH_USER_ID, TaskFiltersSchema(), limit)
+    return dump_json({"tasks": tasks, "next_cursor": next_cursor})
+
+
+async def db_json_path(service: TaskService, limit: int) -> bytes:
+    """GET /tasks с TASKS_DB_JSON_ENDPOINTS=list: JSON собирает PostgreSQL"""
+    return await service.list_tasks_json(BENCH_USER_ID, TaskFiltersSchema(), limit)
+
+
+async def measure(name: str, path, limit: int, iterations: int):
+    cpu, wall = [], []
+    size = 0
+    async with SessionLocal() as session:
+        service = TaskService(session)
+        await path(service, limit)
+        for _ in range(iterations):
+            cpu_started, wall_started = time.process_time(), time.perf_counter()
+            size = len(await path(service, limit))
+            cpu.append((time.process_time() - cpu_started) * 1000)
+            wall.append((time.perf_counter() - wall_started) * 1000)
+            # Как у запроса API: новая сессия, identity map не накапливается
+            session.expunge_all()
+
+        # Пик памяти отдельно: tracemalloc замедляет выполнение
+        tracemalloc.start()
+        await path(service, limit)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"{name:<8} | {statistics.median(cpu):>12.1f} | {statistics.median(wall):>9.1f} | "
+          f"{peak / 1024 / 1024:>13.1f} | {size / 1024:>9.0f}")
+
+
+async def bench(limit: int, iterations: int, tasks: int = 0):
+    # Один цикл событий: соединения пула привязаны к нему
+    if tasks:
+        await seed(tasks)
+
+    print(f"Задач в ответе: {limit}, повторов: {iterations}")
+    print(f"{'путь':<8} | {'CPU API, ms':>12} | {'время, ms':>9} | {'пик памяти, MB':>13} | {'ответ, KB':>9}")
+    await measure("orm", orm_path, limit, iterations)
+    await measure("columns", columns_path, limit, iterations)
+    await measure("db_json", db_json_path, limit, iterations)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="CPU и память процесса API: ответ из ORM против json_agg в PostgreSQL")
+    parser.add_argument("--seed", action="store_true",
+                        help="Создать пользователя с синтетическими задачами")
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(bench(args.limit, args.iterations, args.tasks if args.seed else 0))
@@ -0,0 +1,154 @@
+# Запуск из корня репозитория (PostgreSQL с миграцией d41b7e9c3a52):
+#   python -m scripts.bench_task_fts --seed --tasks 10000000
+#   python -m scripts.bench_task_fts
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+
+# Запрос, который выполняет TaskService.full_text_search (первая страница)
+FTS_QUERY = """
+WITH ranked AS (
+    SELECT id,
+           ts_rank_cd(search_vector, websearch_to_tsquery('russian', :q), 32)
+           + greatest(word_similarity(:q, title), word_similarity(:q, description) * 0.5)
+           AS score
+    FROM tasks
+    WHERE user_id = :user_id
+      AND (search_vector @@ websearch_to_tsquery('russian', :q)
+           OR :q <% title
+           OR :q <% description)
+)
+SELECT tasks.*, ranked.score
+FROM tasks JOIN ranked ON ranked.id = tasks.id
+ORDER BY ranked.score DESC, ranked.id
+LIMIT :limit
+"""
+
+SEED_USERS_QUERY = """
+INSERT INTO users (id, email, hashed_password, created_at, updated_at)
+SELECT 'bench-user-' || n, 'bench-' || n || '@example.com', 'x', now(), now()
+FROM generate_series(1, :users) AS n
+ON CONFLICT DO NOTHING
+"""
+
+# Заголовок: действие + объект + номер, у трети задач есть описание
+SEED_TASKS_QUERY = """
+INSERT INTO tasks (id, title, description, date, status, user_id, created_at, updated_at)
+SELECT
+    'bench-fts-' || n,
+    (ARRAY['Записаться к', 'Позвонить', 'Встреча с', 'Оплатить', 'Обсудить с',
+           'Отправить отчет', 'Купить подарок для', 'Ревью проекта'])[1 + (random() * 7)::int]
+    || ' ' ||
+    (ARRAY['стоматологу', 'бухгалтеру', 'команде Альфа', 'арендодателю', 'маме',
+           'клиенту Orion', 'терапевту', 'проекту Феникс', 'соседу', 'юристу'])[1 + (random() * 9)::int]
+    || ' #' || n,
+    CASE WHEN random() < 0.33 THEN
+        (ARRAY['Не забыть документы', 'Уточнить время', 'Взять ноутбук',
+               'Перенести, если заболею', 'Обсудить бюджет'])[1 + (random() * 4)::int]
+    END,
+    CAST(:first_day AS date) + (random() * 364)::int,
+    'created',
+    'bench-user-' || (1 + (random() * (:users - 1))::int),
+    now(),
+    now()
+FROM generate_series(:start, :stop) AS n
+ON CONFLICT DO NOTHING
+"""
+
+# Точные слова, словоформы, опечатки и названия проектов
+QUERIES = ["стоматолог", "стоматологу", "стамотолог", "бухгалтер", "бугалтер",
+           "Феникс", "проект Альфа", "Orion", "фенекс", "отчет", "документы"]
+
+
+def seed(engine, users: int, tasks: int, chunk: int):
+    """Заполняет users и tasks синтетическими данными"""
+    with engine.begin() as connection:
+        connection.execute(text(SEED_USERS_QUERY), {"users": users})
+    print(f"✅ Пользователи: {users}")
+
+    for start in range(1, tasks + 1, chunk):
+        stop = min(start + chunk - 1, tasks)
+        with engine.begin() as connection:
+            connection.execute(text(SEED_TASKS_QUERY), {
+                "first_day": "2025-01-01",
+                "users": users,
+                "start": start,
+                "stop": stop,
+            })
+        print(f"✅ Задачи: {stop}/{tasks}")
+
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE tasks"))
+
+
+def random_params(users: int, limit: int) -> dict:
+    return {
+        "user_id": f"bench-user-{random.randint(1, users)}",
+        "q": random.choice(QUERIES),
+        "limit": limit,
+    }
+
+
+def bench(engine, users: int, iterations: int, limit: int, threshold: float):
+    """Выводит план запроса и задержку поиска по запросам разных видов"""
+    with engine.connect() as connection:
+        connection.execute(
+            text("SELECT set_config('pg_trgm.word_similarity_threshold', :t, false)"),
+            {"t": str(threshold)},
+        )
+        plan = connection.execute(
+            text("EXPLAIN (ANALYZE, BUFFERS) " + FTS_QUERY),
+            random_params(users, limit),
+        ).scalars().all()
+        print("\n".join(plan))
+
+        latencies = {query: [] for query in QUERIES}
+        found = {query: 0 for query in QUERIES}
+        for _ in range(iterations):
+            params = random_params(users, limit)
+            started = time.perf_counter()
+            rows = connection.execute(text(FTS_QUERY), params).all()
+            latencies[params["q"]].append((time.perf_counter() - started) * 1000)
+            found[params["q"]] += len(rows)
+
+    print(f"\nЗапросов: {iterations}, порог опечаток: {threshold}")
+    print(f"{'запрос':<14} | {'p50, ms':>8} | {'p99, ms':>8} | {'найдено в среднем':>17}")
+    everything = []
+    for query, values in latencies.items():
+        if not values:
+            continue
+        everything += values
+        values.sort()
+        print(f"{query:<14} | {statistics.median(values):>8.2f} | "
+              f"{values[int(len(values) * 0.99) - 1 if len(values) > 1 else 0]:>8.2f} | "
+              f"{found[query] / len(values):>17.1f}")
+    everything.sort()
+    print(f"\nВсе запросы: p50 {statistics.median(everything):.2f} ms, "
+          f"p99 {everything[int(len(everything) * 0.99) - 1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Бенчмарк полнотекстового поиска задач (EXPLAIN и задержка)")
+    parser.add_argument("--seed", action="store_true",
+                        help="Заполнить БД синтетическими данными")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--tasks", type=int, default=10_000_000)
+    parser.add_argument("--chunk", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="pg_trgm.word_similarity_threshold (FTS_TYPO_THRESHOLD)")
+    args = parser.parse_args()
+
+    engine = create_engine(os.getenv("DATABASE_URL"))
+
+    if args.seed:
+        seed(engine, args.users, args.tasks, args.chunk)
+
+    bench(engine, args.users, args.iterations, args.limit, args.threshold)
@@ -0,0 +1,97 @@
+# Запуск из корня репозитория (БД не нужна, приложение в процессе):
+#   python -m scripts.bench_task_json --sizes 10 100 1000
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+
+import httpx
+from fastapi import FastAPI
+
+from api.task.schemas.task.task_list_response_schema import TasksResponseSchema
+from api.task.schemas.task.task_response_schema import TaskResponseSchema
+from core.json_response import FastJSONResponse, dump_json
+from database.models.task.task_model import TaskStatusModel
+from pydantic import TypeAdapter
+
+TASKS_ADAPTER = TypeAdapter(List[TaskResponseSchema])
+
+
+def make_rows(size: int) -> list:
+    """Строки, как их возвращает SQLAlchemy (атрибуты вместо ключей)"""
+    first = datetime(2025, 5, 1, 8, 0)
+    return [
+        SimpleNamespace(
+            id=f"task-{index}",
+            title=f"Задача {index}: созвон с командой",
+            description="Обсудить план на неделю" if index % 3 == 0 else None,
+            date=first + timedelta(minutes=15 * index, microseconds=index),
+            status=TaskStatusModel.created,
+        )
+        for index in range(size)
+    ]
+
+
+def make_app(rows_by_size: dict) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/model/{size}", response_model=TasksResponseSchema)
+    async def model(size: int):
+        # Прежний путь: model_validate на строку, затем повторная проверка
+        # по response_model и json.dumps в FastAPI
+        tasks = [TaskResponseSchema.model_validate(row) for row in rows_by_size[size]]
+        return TasksResponseSchema(tasks=tasks)
+
+    @app.get("/fast/{size}", response_model=TasksResponseSchema)
+    async def fast(size: int):
+        tasks = TASKS_ADAPTER.validate_python(rows_by_size[size], from_attributes=True)
+        return FastJSONResponse({"tasks": tasks})
+
+    @app.get("/bytes/{size}", response_model=TasksResponseSchema)
+    async def prepared(size: int):
+        # Как в условном GET: байты готовятся до создания ответа
+        tasks = TASKS_ADAPTER.validate_python(rows_by_size[size], from_attributes=True)
+        return FastJSONResponse(dump_json({"tasks": tasks}))
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, seconds: float) -> tuple:
+    requests = 0
+    body = b""
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        response = await client.get(path)
+        response.raise_for_status()
+        body = response.content
+        requests += 1
+    return requests / (time.perf_counter() - started), body
+
+
+async def bench(sizes: List[int], seconds: float):
+    app = make_app({size: make_rows(size) for size in sizes})
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'задач':>6} | {'model, rps':>11} | {'fast, rps':>10} | {'bytes, rps':>10} | {'ускорение':>9}")
+        for size in sizes:
+            baseline, expected = await measure(client, f"/model/{size}", seconds)
+            fast, fast_body = await measure(client, f"/fast/{size}", seconds)
+            prepared, prepared_body = await measure(client, f"/bytes/{size}", seconds)
+            # Новый путь не должен менять тело ответа
+            assert fast_body == expected and prepared_body == expected
+            print(f"{size:>6} | {baseline:>11.0f} | {fast:>10.0f} | {prepared:>10.0f} | "
+                  f"{fast / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Запросов в секунду: response_model против TypeAdapter + orjson")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--seconds", type=float, default=3.0,
+                        help="Длительность замера для каждого варианта")
+    args = parser.parse_args()
+
+    asyncio.run(bench(args.sizes, args.seconds))
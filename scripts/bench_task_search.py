@@ -0,0 +1,125 @@
+# Запуск из корня репозитория (нужен запущенный Qdrant, QDRANT_URL):
+#   python -m scripts.bench_task_search --points 1000000 --users 1000
+# Повторный запуск без --seed использует уже заполненную коллекцию.
+
+import argparse
+import asyncio
+import os
+import time
+
+import numpy as np
+from qdrant_client import QdrantClient
+
+from api.task.service.task_search_index import QDRANT_URL, TaskSearchIndex
+
+SEED_CHUNK = 100_000
+
+
+def seed(collection_name: str, points: int, users: int, dimension: int, parallel: int):
+    """
+    Заполняет коллекцию случайными нормализованными векторами.
+    Векторизация 1M текстов здесь не нужна: измеряется поиск,
+    а не качество модели
+    """
+    client = QdrantClient(url=QDRANT_URL, timeout=300)
+    client.delete_collection(collection_name)
+    asyncio.run(TaskSearchIndex(collection_name).ensure_collection(
+        dimension=dimension))
+
+    rnd = np.random.default_rng(0)
+    started = time.perf_counter()
+    for start in range(0, points, SEED_CHUNK):
+        count = min(SEED_CHUNK, points - start)
+        vectors = rnd.standard_normal((count, dimension), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        client.upload_collection(
+            collection_name=collection_name,
+            vectors=vectors,
+            payload=({"user_id": f"user-{(start + index) % users}"} for index in range(count)),
+            ids=range(start, start + count),
+            batch_size=1024,
+            parallel=parallel,
+        )
+        print(f"Загружено {start + count}/{points}")
+
+    # Поиск измеряется после построения графов HNSW
+    while client.get_collection(collection_name).status != "green":
+        time.sleep(1)
+    print(f"Коллекция готова за {time.perf_counter() - started:.0f} s")
+
+
+async def bench_search(collection_name: str, users: int, dimension: int,
+                       queries: int, concurrency: int, limit: int):
+    index = TaskSearchIndex(collection_name)
+    rnd = np.random.default_rng(1)
+    query_vectors = rnd.standard_normal((queries, dimension), dtype=np.float32)
+    query_vectors /= np.linalg.norm(query_vectors, axis=1, keepdims=True)
+
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for query_index in range(queries):
+        queue.put_nowait(query_index)
+    latencies: list[float] = []
+
+    async def worker():
+        while not queue.empty():
+            query_index = queue.get_nowait()
+            started = time.perf_counter()
+            await index.search(
+                f"user-{query_index % users}", query_vectors[query_index], limit)
+            latencies.append(time.perf_counter() - started)
+
+    # Первый запрос создает соединение и проверяет коллекцию
+    await index.search("user-0", query_vectors[0], limit)
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    await index.close()
+
+    latencies.sort()
+    print(f"\nПоиск в Qdrant (фильтр по user_id, top-{limit}), concurrency={concurrency}")
+    print(f"RPS: {queries / elapsed:.0f}")
+    print(f"p50: {latencies[len(latencies) // 2] * 1000:.1f} ms")
+    print(f"p99: {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms")
+
+
+def bench_embedding(queries: int):
+    from core.embedder import embedder
+
+    texts = [f"созвон с командой по проекту {index}" for index in range(queries)]
+    embedder.embed(texts[:1])
+    latencies = []
+    for text in texts:
+        started = time.perf_counter()
+        embedder.embed([text])
+        latencies.append(time.perf_counter() - started)
+
+    latencies.sort()
+    print(f"\nВекторизация запроса ({embedder.model_name}, {os.cpu_count()} CPU)")
+    print(f"p50: {latencies[len(latencies) // 2] * 1000:.1f} ms")
+    print(f"p99: {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Задержка семантического поиска задач")
+    parser.add_argument("--collection", default="tasks_bench")
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--seed", action="store_true",
+                        help="Пересоздать и заполнить коллекцию")
+    parser.add_argument("--parallel", type=int, default=os.cpu_count())
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--embed", action="store_true",
+                        help="Измерить также векторизацию запроса моделью")
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.collection, args.points, args.users, args.dimension, args.parallel)
+
+    asyncio.run(bench_search(args.collection, args.users, args.dimension,
+                             args.queries, args.concurrency, args.limit))
+    if args.embed:
+        bench_embedding(min(args.queries, 200))
@@ -0,0 +1,83 @@
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import httpx
+
+FIRST_DAY = datetime(2025, 6, 2, 9, 0)
+
+
+async def register(client: httpx.AsyncClient) -> dict:
+    """Регистрирует нового пользователя, возвращает заголовки авторизации"""
+    password = str(uuid4())
+    response = await client.post("/api/auth/register", json={
+        "email": f"bench-{uuid4().hex[:12]}@example.com",
+        "password": password,
+        "confirm_password": password,
+    })
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def make_plan(tasks: int) -> list:
+    """План из другого приложения: задачи по 8 в день"""
+    return [
+        {
+            "title": f"Импорт: задача {index}",
+            "description": "Перенесено из старого планировщика" if index % 4 == 0 else None,
+            "date": (FIRST_DAY + timedelta(days=index // 8, hours=index % 8)).isoformat(),
+            "mark": "work" if index % 2 else "home",
+        }
+        for index in range(tasks)
+    ]
+
+
+async def import_per_task(client: httpx.AsyncClient, plan: list) -> float:
+    """Как сейчас: POST /tasks на каждую задачу"""
+    headers = await register(client)
+    started = time.perf_counter()
+    for task in plan:
+        response = await client.post("/api/tasks", headers=headers, json=task)
+        response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def import_batch(client: httpx.AsyncClient, plan: list, batch_size: int) -> float:
+    """POST /tasks/batch пакетами по batch_size задач"""
+    headers = await register(client)
+    started = time.perf_counter()
+    for start in range(0, len(plan), batch_size):
+        response = await client.post("/api/tasks/batch", headers=headers, json={
+            "tasks": plan[start:start + batch_size],
+        })
+        response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def bench(base_url: str, tasks: int, batch_size: int, iterations: int):
+    plan = make_plan(tasks)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        print(f"Задач: {tasks}, размер пакета: {batch_size}, повторов: {iterations}")
+        print(f"{'способ':<22} | {'время, s':>9} | {'задач/s':>8}")
+        for name, run in [
+            ("POST /tasks x N", lambda: import_per_task(client, plan)),
+            ("POST /tasks/batch", lambda: import_batch(client, plan, batch_size)),
+        ]:
+            elapsed = min([await run() for _ in range(iterations)])
+            print(f"{name:<22} | {elapsed:>9.2f} | {tasks / elapsed:>8.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Импорт плана: POST /tasks на каждую задачу против POST /tasks/batch")
+    parser.add_argument("--url", default=os.getenv("API_URL", "http://localhost:8000"))
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=1000,
+                        help="Не больше TASKS_BATCH_MAX_SIZE")
+    parser.add_argument("--iterations", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(bench(args.url, args.tasks, args.batch_size, args.iterations))
@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from uuid import uuid4
+
+import httpx
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Возвращает перцентиль (метод ближайшего ранга)"""
+    ordered = sorted(values)
+    index = max(0, int(round(percent / 100 * len(ordered))) - 1)
+    return ordered[index]
+
+
+async def prepare_user(client: httpx.AsyncClient, tasks_count: int, date: str) -> dict:
+    """
+    Регистрирует пользователя и создает ему задачи на указанную дату.
+    Возвращает заголовки авторизации.
+    """
+    password = str(uuid4())
+    response = await client.post("/api/auth/register", json={
+        "email": f"bench-{uuid4().hex[:12]}@example.com",
+        "password": password,
+        "confirm_password": password,
+    })
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    for index in range(tasks_count):
+        response = await client.post("/api/tasks", headers=headers, json={
+            "title": f"Задача {index}",
+            "date": date,
+        })
+        response.raise_for_status()
+
+    return headers
+
+
+async def run_client(
+    client: httpx.AsyncClient,
+    headers: dict,
+    date: str,
+    requests_per_client: int,
+    latencies: list[float],
+    errors: list[int],
+):
+    """Последовательно выполняет запросы одного клиента"""
+    for _ in range(requests_per_client):
+        started = time.perf_counter()
+        response = await client.get(
+            "/api/tasks/by-date/",
+            params={"date": date},
+            headers=headers,
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            errors.append(response.status_code)
+
+
+async def bench(base_url: str, concurrency: int, requests_per_client: int, tasks_count: int):
+    """
+    Нагружает /api/tasks/by-date/ заданным числом конкурентных клиентов
+    и выводит p50/p99 задержки. Для сравнения "до/после" запускается
+    против сервера, собранного из соответствующего коммита.
+    """
+    date = "2025-05-01T00:00:00"
+    limits = httpx.Limits(
+        max_connections=concurrency,
+        max_keepalive_connections=concurrency,
+    )
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        headers = await prepare_user(client, tasks_count, date)
+
+        latencies: list[float] = []
+        errors: list[int] = []
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            run_client(client, headers, date, requests_per_client, latencies, errors)
+            for _ in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+
+    print(f"Клиентов: {concurrency}, запросов: {len(latencies)}, ошибок: {len(errors)}")
+    print(f"RPS: {len(latencies) / elapsed:.1f}")
+    print(f"p50: {statistics.median(latencies):.1f} ms")
+    print(f"p99: {percentile(latencies, 99):.1f} ms")
+    print(f"max: {max(latencies):.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Бенчмарк задержки /api/tasks/by-date/ под конкурентной нагрузкой")
+    parser.add_argument("--url", default=os.getenv("API_URL", "http://localhost:8000"))
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=50,
+                        help="Запросов на одного клиента")
+    parser.add_argument("--tasks", type=int, default=20,
+                        help="Задач на дату у тестового пользователя")
+    args = parser.parse_args()
+
+    asyncio.run(bench(args.url, args.concurrency, args.requests, args.tasks))
@@ -0,0 +1,115 @@
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+
+# Запрос, который выполняет TaskService.get_tasks_by_date
+TASKS_BY_DATE_QUERY = """
+SELECT *
+FROM tasks
+WHERE user_id = :user_id
+  AND date >= :day_start
+  AND date < :day_end
+  AND status = :status
+"""
+
+SEED_USERS_QUERY = """
+INSERT INTO users (id, email, hashed_password, created_at, updated_at)
+SELECT 'bench-user-' || n, 'bench-' || n || '@example.com', 'x', now(), now()
+FROM generate_series(1, :users) AS n
+ON CONFLICT DO NOTHING
+"""
+
+SEED_TASKS_QUERY = """
+INSERT INTO tasks (id, title, date, status, user_id, created_at, updated_at)
+SELECT
+    'bench-task-' || n,
+    'Задача ' || n,
+    CAST(:first_day AS date) + (random() * :days)::int,
+    (CASE WHEN random() < 0.7 THEN 'created' ELSE 'completed' END)::taskstatus,
+    'bench-user-' || (1 + (random() * (:users - 1))::int),
+    now(),
+    now()
+FROM generate_series(:start, :stop) AS n
+ON CONFLICT DO NOTHING
+"""
+
+FIRST_DAY = datetime(2025, 1, 1)
+DAYS = 365
+
+
+def seed(engine, users: int, tasks: int, chunk: int):
+    """Заполняет users и tasks синтетическими данными"""
+    with engine.begin() as connection:
+        connection.execute(text(SEED_USERS_QUERY), {"users": users})
+    print(f"✅ Пользователи: {users}")
+
+    for start in range(1, tasks + 1, chunk):
+        stop = min(start + chunk - 1, tasks)
+        with engine.begin() as connection:
+            connection.execute(text(SEED_TASKS_QUERY), {
+                "first_day": FIRST_DAY.date(),
+                "days": DAYS - 1,
+                "users": users,
+                "start": start,
+                "stop": stop,
+            })
+        print(f"✅ Задачи: {stop}/{tasks}")
+
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE tasks"))
+
+
+def random_params(users: int) -> dict:
+    day_start = FIRST_DAY + timedelta(days=random.randrange(DAYS))
+    return {
+        "user_id": f"bench-user-{random.randint(1, users)}",
+        "day_start": day_start,
+        "day_end": day_start + timedelta(days=1),
+        "status": "created",
+    }
+
+
+def bench(engine, users: int, iterations: int):
+    """Выводит план запроса и задержку выборки задач за день"""
+    with engine.connect() as connection:
+        plan = connection.execute(
+            text("EXPLAIN (ANALYZE, BUFFERS) " + TASKS_BY_DATE_QUERY),
+            random_params(users),
+        ).scalars().all()
+        print("\n".join(plan))
+
+        latencies = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            connection.execute(
+                text(TASKS_BY_DATE_QUERY), random_params(users)).all()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    latencies.sort()
+    print(f"\nЗапросов: {iterations}")
+    print(f"p50: {statistics.median(latencies):.2f} ms")
+    print(f"p99: {latencies[int(len(latencies) * 0.99) - 1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Бенчмарк выборки задач за день (EXPLAIN и задержка)")
+    parser.add_argument("--seed", action="store_true",
+                        help="Заполнить БД синтетическими данными")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--tasks", type=int, default=10_000_000)
+    parser.add_argument("--chunk", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    engine = create_engine(os.getenv("DATABASE_URL"))
+
+    if args.seed:
+        seed(engine, args.users, args.tasks, args.chunk)
+
+    bench(engine, args.users, args.iterations)
@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+import httpx
+
+FIRST_DAY = date(2025, 5, 1)
+
+
+async def prepare_tasks(client: httpx.AsyncClient, days: int, tasks_per_day: int) -> dict:
+    """Регистрирует пользователя и создает задачи на каждый день периода"""
+    password = str(uuid4())
+    response = await client.post("/api/auth/register", json={
+        "email": f"bench-{uuid4().hex[:12]}@example.com",
+        "password": password,
+        "confirm_password": password,
+    })
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    for day in range(days):
+        for index in range(tasks_per_day):
+            task_date = datetime.combine(FIRST_DAY + timedelta(days=day), datetime.min.time())
+            response = await client.post("/api/tasks", headers=headers, json={
+                "title": f"Задача {day}-{index}",
+                "date": (task_date + timedelta(hours=random.randint(8, 20))).isoformat(),
+                "mark": random.choice(["work", "home", None]),
+            })
+            response.raise_for_status()
+
+    return headers
+
+
+async def month_per_day(client: httpx.AsyncClient, headers: dict, days: int,
+                        parallel: int) -> int:
+    """Как мобильный клиент сейчас: GET /tasks/by-date/ на каждый день"""
+    semaphore = asyncio.Semaphore(parallel)
+
+    async def fetch(day: int) -> int:
+        async with semaphore:
+            response = await client.get("/api/tasks/by-date/", headers=headers, params={
+                "date": datetime.combine(
+                    FIRST_DAY + timedelta(days=day), datetime.min.time()).isoformat(),
+            })
+            response.raise_for_status()
+            return len(response.json()["tasks"])
+
+    return sum(await asyncio.gather(*[fetch(day) for day in range(days)]))
+
+
+async def month_range(client: httpx.AsyncClient, headers: dict, days: int,
+                      counts: bool = False) -> int:
+    """Один запрос GET /tasks/range за весь период"""
+    response = await client.get("/api/tasks/range", headers=headers, params={
+        "from": FIRST_DAY.isoformat(),
+        "to": (FIRST_DAY + timedelta(days=days - 1)).isoformat(),
+        "status": "created",
+        "counts": str(counts).lower(),
+    })
+    response.raise_for_status()
+    if counts:
+        return sum(day["total"] for day in response.json()["days"])
+    return sum(len(day["tasks"]) for day in response.json()["days"])
+
+
+async def measure(name: str, view, iterations: int):
+    latencies = []
+    found = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        found = await view()
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    print(f"{name:<28} | {statistics.median(latencies):>8.1f} | "
+          f"{latencies[int(len(latencies) * 0.99) - 1]:>8.1f} | {found:>6}")
+
+
+async def bench(base_url: str, days: int, tasks_per_day: int, iterations: int, parallel: int):
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        headers = await prepare_tasks(client, days, tasks_per_day)
+
+        print(f"Дней: {days}, задач в день: {tasks_per_day}, повторов: {iterations}")
+        print(f"{'способ':<28} | {'p50, ms':>8} | {'p99, ms':>8} | {'задач':>6}")
+        await measure(f"by-date x{days}, по {parallel}",
+                      lambda: month_per_day(client, headers, days, parallel), iterations)
+        await measure(f"by-date x{days}, по 1",
+                      lambda: month_per_day(client, headers, days, 1), iterations)
+        await measure("range",
+                      lambda: month_range(client, headers, days), iterations)
+        await measure("range, counts",
+                      lambda: month_range(client, headers, days, counts=True), iterations)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Месячный календарь: GET /tasks/by-date/ на каждый день против GET /tasks/range")
+    parser.add_argument("--url", default=os.getenv("API_URL", "http://localhost:8000"))
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--tasks-per-day", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--parallel", type=int, default=6,
+                        help="Одновременных запросов по дням (как у мобильного клиента)")
+    args = parser.parse_args()
+
+    asyncio.run(bench(args.url, args.days, args.tasks_per_day, args.iterations, args.parallel))
@@ -0,0 +1,104 @@
+# Запуск из корня репозитория: python -m scripts.check_filters_parser [--record]
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+
+from api.schemas.schedule.filters_response_schema import TaskFilterSchema
+from api.service.schedule.define_filters_prompt import define_filters_prompt
+from api.service.schedule.filters_parser import (
+    FILTERS_PARSER_MIN_CONFIDENCE,
+    filters_parser,
+)
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "filters_parser_corpus.json")
+
+
+async def record(corpus: list[dict]):
+    """
+    Записывает в корпус ответы LLM (define_filters_prompt) для каждого запроса.
+    Текущая дата модели не передается явно, поэтому запись нужно делать
+    в день, указанный в поле now.
+    """
+    from core.llm_client import LLMClient
+
+    client = LLMClient()
+    try:
+        for item in corpus:
+            response = await client.chat_completion(
+                "golden-corpus",
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": define_filters_prompt},
+                    {"role": "user", "content": item["request"]},
+                ],
+                response_format={"type": "json_object"},
+                temperature=0,
+            )
+            filters = json.loads(response.choices[0].message.content)["filters"]
+            item["filters"] = TaskFilterSchema(**filters).model_dump(
+                mode="json", exclude_none=True)
+            print(f"✅ {item['request']}: {item['filters']}")
+    finally:
+        await client.close()
+
+
+def check(corpus: list[dict]) -> bool:
+    """
+    Сравнивает результат локального разбора с записанными ответами LLM.
+    Запросы с "local": false обязаны уходить в LLM.
+    """
+    hits = 0
+    mismatches = 0
+    elapsed = 0.0
+
+    for item in corpus:
+        now = datetime.fromisoformat(item["now"])
+        started = time.perf_counter()
+        filters, confidence = filters_parser.parse(item["request"], now)
+        elapsed += time.perf_counter() - started
+
+        if filters is None or confidence < FILTERS_PARSER_MIN_CONFIDENCE:
+            print(f"↪ LLM ({confidence:.2f}): {item['request']}")
+            continue
+
+        hits += 1
+        if item.get("local") is False:
+            # Запрос помечен как неразбираемый локально
+            mismatches += 1
+            print(f"❌ {item['request']}: должен уходить в LLM")
+            continue
+
+        actual = filters.model_dump(mode="json", exclude_none=True)
+        expected = item["filters"]
+        if expected is not None and actual != expected:
+            mismatches += 1
+            print(f"❌ {item['request']}\n   ожидалось: {expected}\n   получено:  {actual}")
+
+    print(f"\nЗапросов: {len(corpus)}")
+    print(f"Разобрано локально: {hits} ({hits / len(corpus):.0%})")
+    print(f"Расхождений с LLM: {mismatches}")
+    print(f"Среднее время разбора: {elapsed / len(corpus) * 1_000_000:.0f} µs")
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Сверка локального разбора фильтров с ответами LLM")
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--record", action="store_true",
+                        help="Перезаписать ожидаемые фильтры ответами LLM")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as corpus_file:
+        corpus = json.load(corpus_file)
+
+    if args.record:
+        asyncio.run(record(corpus))
+        with open(args.corpus, "w", encoding="utf-8") as corpus_file:
+            json.dump(corpus, corpus_file, ensure_ascii=False, indent=2)
+    else:
+        raise SystemExit(0 if check(corpus) else 1)
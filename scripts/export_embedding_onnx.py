@@ -0,0 +1,88 @@
+# Запуск из корня репозитория (нужны onnx и onnxruntime):
+#   python -m scripts.export_embedding_onnx --output models/embedding-onnx
+# Затем: EMBEDDING_BACKEND=onnx (или onnx-int8) EMBEDDING_ONNX_PATH=models/embedding-onnx
+
+import argparse
+import json
+import os
+
+import torch
+from sentence_transformers import SentenceTransformer
+
+from core.embedder import EMBEDDING_MODEL
+from core.onnx_encoder import ONNX_CONFIG_FILE, ONNX_INT8_MODEL_FILE, ONNX_MODEL_FILE
+
+
+class SentenceEmbedding(torch.nn.Module):
+    """Трансформер + пулинг модели + нормализация, как в SentenceTransformer.encode"""
+
+    def __init__(self, model: SentenceTransformer, input_names: list[str]):
+        super().__init__()
+        self.model = model
+        self.input_names = input_names
+
+    def forward(self, *inputs):
+        features = dict(zip(self.input_names, inputs))
+        embeddings = self.model(features)["sentence_embedding"]
+        return torch.nn.functional.normalize(embeddings, p=2, dim=1)
+
+
+def export(model_name: str, output: str, opset: int):
+    model = SentenceTransformer(model_name, device="cpu").eval()
+    tokenizer = model.tokenizer
+    input_names = [name for name in tokenizer.model_input_names
+                   if name in ("input_ids", "attention_mask", "token_type_ids")]
+    sample = tokenizer(["Пример задачи", "Созвон с командой в понедельник"],
+                       padding=True, return_tensors="pt")
+
+    os.makedirs(output, exist_ok=True)
+    model_path = os.path.join(output, ONNX_MODEL_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            SentenceEmbedding(model, input_names),
+            tuple(sample[name] for name in input_names),
+            model_path,
+            input_names=input_names,
+            output_names=["sentence_embedding"],
+            dynamic_axes={
+                **{name: {0: "batch", 1: "sequence"} for name in input_names},
+                "sentence_embedding": {0: "batch"},
+            },
+            opset_version=opset,
+            # Классический экспорт через TorchScript, без onnxscript
+            dynamo=False,
+        )
+    tokenizer.save_pretrained(output)
+    with open(os.path.join(output, ONNX_CONFIG_FILE), "w", encoding="utf-8") as config_file:
+        json.dump({
+            "model": model_name,
+            "max_seq_length": model.max_seq_length,
+            "dimension": model.get_sentence_embedding_dimension(),
+        }, config_file)
+    print(f"✅ {model_path}")
+    return model_path
+
+
+def quantize(model_path: str, output: str):
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantized_path = os.path.join(output, ONNX_INT8_MODEL_FILE)
+    # Веса MatMul в int8, активации квантизуются на лету
+    quantize_dynamic(model_path, quantized_path,
+                     op_types_to_quantize=["MatMul"], weight_type=QuantType.QInt8)
+    print(f"✅ {quantized_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Экспорт модели эмбеддингов в ONNX (float32 и int8)")
+    parser.add_argument("--model", default=EMBEDDING_MODEL)
+    parser.add_argument("--output", default="models/embedding-onnx")
+    parser.add_argument("--opset", type=int, default=14)
+    parser.add_argument("--no-quantize", action="store_true",
+                        help="Не создавать int8-вариант")
+    args = parser.parse_args()
+
+    path = export(args.model, args.output, args.opset)
+    if not args.no_quantize:
+        quantize(path, args.output)
@@ -0,0 +1,132 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from uuid import uuid4
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Локальная заглушка OpenAI Chat Completions API (обычный и потоковый ответ).
+# Запуск приложения против нее: OPENAI_BASE_URL=http://localhost:8100/v1
+
+app = FastAPI(title="Mock OpenAI API")
+
+settings = {
+    "latency": 0.5,
+    "error_rate": 0.0,
+    "error_status": 503,
+    "content": json.dumps({"tasks": []}),
+    # Задержка между фрагментами потокового ответа, секунды
+    "token_delay": 0.0,
+}
+
+# Символов в одном фрагменте потокового ответа (примерно один токен)
+STREAM_CHUNK_CHARS = 4
+
+
+def build_completion(model: str, content: str) -> dict:
+    return {
+        "id": f"chatcmpl-{uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+def build_chunk(completion_id: str, model: str, delta: dict, finish_reason=None) -> str:
+    chunk = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+
+
+async def stream_completion(model: str, content: str):
+    completion_id = f"chatcmpl-{uuid4().hex}"
+    yield build_chunk(completion_id, model, {"role": "assistant", "content": ""})
+    for start in range(0, len(content), STREAM_CHUNK_CHARS):
+        await asyncio.sleep(settings["token_delay"])
+        yield build_chunk(
+            completion_id, model, {"content": content[start:start + STREAM_CHUNK_CHARS]})
+    yield build_chunk(completion_id, model, {}, finish_reason="stop")
+    yield "data: [DONE]\n\n"
+
+
+def generate_edited_tasks(count: int) -> str:
+    """Ответ edit_schedule с count измененными задачами"""
+    return json.dumps({"tasks": [
+        {
+            "action": "UPDATED",
+            "edited_task": {
+                "id": str(uuid4()),
+                "title": f"Созвон с командой {index}",
+                "description": "Обсудить план на неделю и сроки",
+                "date": "2025-05-01T18:00:00",
+                "status": "created",
+            },
+        }
+        for index in range(count)
+    ]}, ensure_ascii=False)
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    await asyncio.sleep(settings["latency"])
+
+    if random.random() < settings["error_rate"]:
+        return JSONResponse(
+            status_code=settings["error_status"],
+            content={"error": {"message": "mock failure", "type": "server_error"}},
+        )
+
+    if body.get("stream"):
+        return StreamingResponse(
+            stream_completion(body.get("model", "mock"), settings["content"]),
+            media_type="text/event-stream",
+        )
+
+    # Без стрима ответ приходит целиком, как после генерации всех токенов
+    chunks_count = -(-len(settings["content"]) // STREAM_CHUNK_CHARS)
+    await asyncio.sleep(settings["token_delay"] * chunks_count)
+    return build_completion(body.get("model", "mock"), settings["content"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Заглушка OpenAI API")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=settings["latency"],
+                        help="Задержка ответа, секунды")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Доля ответов с ошибкой")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--content", default=settings["content"],
+                        help="Текст ответа ассистента")
+    parser.add_argument("--tasks", type=int, default=None,
+                        help="Ответить edit_schedule с указанным числом задач")
+    parser.add_argument("--token-delay", type=float, default=settings["token_delay"],
+                        help="Задержка между фрагментами ответа, секунды")
+    args = parser.parse_args()
+
+    settings.update(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        content=args.content if args.tasks is None else generate_edited_tasks(args.tasks),
+        token_delay=args.token_delay,
+    )
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,29 @@
+# Запуск из корня репозитория по расписанию (cron), нужен DATABASE_URL:
+#   python -m scripts.purge_task_deletions
+
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete
+
+from api.task.service.task_service import TASK_TOMBSTONE_RETENTION_DAYS
+from database.database import SessionLocal
+from database.models.task.task_deletion_model import TaskDeletionModel
+
+
+async def purge_task_deletions():
+    """
+    Удаляет записи об удаленных задачах старше TASK_TOMBSTONE_RETENTION_DAYS.
+    Клиенты, начавшие обход /tasks/changes раньше, получают 410
+    и синхронизируются заново
+    """
+    threshold = datetime.now() - timedelta(days=TASK_TOMBSTONE_RETENTION_DAYS)
+    async with SessionLocal() as session:
+        result = await session.execute(
+            delete(TaskDeletionModel).where(TaskDeletionModel.deleted_at < threshold))
+        await session.commit()
+    print(f"✅ Удалено записей: {result.rowcount}")
+
+
+if __name__ == "__main__":
+    asyncio.run(purge_task_deletions())
@@ -0,0 +1,306 @@
+# Запуск из корня репозитория (нужны DATABASE_URL и QDRANT_URL):
+#   python -m scripts.reindex_tasks                  # дозаписать в текущую коллекцию
+#   python -m scripts.reindex_tasks --shadow         # собрать новую коллекцию и переключить алиас
+# Прерванный запуск продолжается с контрольной точки тем же вызовом.
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+
+from qdrant_client.http import models
+from sqlalchemy import insert, literal, select
+
+import main  # noqa: F401  регистрирует все модели SQLAlchemy
+from api.task.service.task_search_index import (
+    QDRANT_COLLECTION,
+    TaskSearchIndex,
+    task_document,
+)
+from core.embedder import embedder
+from database.database import SessionLocal
+from database.models.task.task_deletion_model import TaskDeletionModel
+from database.models.task.task_index_outbox_model import TaskIndexOutboxModel
+from database.models.task.task_model import TaskModel
+
+CHECKPOINT_PATH = "reindex_tasks.checkpoint.json"
+# Как часто сохранять контрольную точку и печатать прогресс, секунды
+REPORT_INTERVAL = 5
+UPSERT_RETRIES = 5
+
+
+def load_checkpoint(path: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as checkpoint_file:
+        return json.load(checkpoint_file)
+
+
+def save_checkpoint(path: str, checkpoint: dict):
+    # Запись через временный файл: прерывание не оставит поврежденный JSON
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file)
+    os.replace(tmp_path, path)
+
+
+async def read_batches(
+    after_id: Optional[str],
+    batch_size: int,
+    page_size: int,
+) -> AsyncIterator[List]:
+    """
+    Читает задачи страницами по id (keyset pagination), строки страницы
+    приходят из серверного курсора пачками по batch_size (yield_per)
+    """
+    while True:
+        query = select(
+            TaskModel.id,
+            TaskModel.user_id,
+            TaskModel.title,
+            TaskModel.description,
+        ).order_by(TaskModel.id).limit(page_size)
+        if after_id is not None:
+            query = query.where(TaskModel.id > after_id)
+
+        rows_count = 0
+        async with SessionLocal() as session:
+            result = await session.stream(
+                query.execution_options(yield_per=batch_size))
+            async for rows in result.partitions():
+                rows_count += len(rows)
+                after_id = rows[-1].id
+                yield rows
+
+        if rows_count < page_size:
+            return
+
+
+class Progress:
+    """
+    Учет завершенных пачек. Контрольная точка сдвигается только по
+    непрерывному префиксу: пачки записываются параллельно, и при
+    возобновлении ни одна незаписанная пачка не должна быть пропущена
+    """
+
+    def __init__(self, checkpoint: dict, path: str):
+        self.checkpoint = checkpoint
+        self.path = path
+        self.next_sequence = 0
+        self.finished = {}
+        self.started = time.perf_counter()
+        self.indexed = 0
+        self.last_report = self.started
+
+    def done(self, sequence: int, last_id: str, count: int):
+        self.finished[sequence] = (last_id, count)
+        self.indexed += count
+        while self.next_sequence in self.finished:
+            last_id, count = self.finished.pop(self.next_sequence)
+            self.checkpoint["last_id"] = last_id
+            self.checkpoint["indexed"] += count
+            self.next_sequence += 1
+
+        now = time.perf_counter()
+        if now - self.last_report >= REPORT_INTERVAL:
+            self.last_report = now
+            save_checkpoint(self.path, self.checkpoint)
+            print(f"Проиндексировано {self.checkpoint['indexed']} задач, "
+                  f"{self.rate():.0f} docs/s")
+
+    def rate(self) -> float:
+        return self.indexed / max(time.perf_counter() - self.started, 1e-9)
+
+
+async def upsert_with_retries(index: TaskSearchIndex, collection_name: str,
+                              ids, user_ids, vectors):
+    for attempt in range(UPSERT_RETRIES):
+        try:
+            # Контрольная точка продвигается после возврата, поэтому
+            # запись должна быть применена, а не только принята Qdrant
+            await index.upsert(ids, user_ids, vectors,
+                               collection_name=collection_name, wait=True)
+            return
+        except Exception as e:
+            if attempt == UPSERT_RETRIES - 1:
+                raise
+            delay = 2 ** attempt
+            print(f"Ошибка записи в Qdrant ({str(e)}), повтор через {delay} s")
+            await asyncio.sleep(delay)
+
+
+async def build(index: TaskSearchIndex, checkpoint: dict, args) -> Progress:
+    """Конвейер: чтение из БД -> векторизация -> параллельная запись в Qdrant"""
+    collection_name = checkpoint["collection"]
+    await index.ensure_collection(collection_name)
+    progress = Progress(checkpoint, args.checkpoint)
+
+    embed_queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+    upsert_queue: asyncio.Queue = asyncio.Queue(maxsize=args.upsert_workers * 2)
+
+    async def reader():
+        sequence = 0
+        async for rows in read_batches(checkpoint["last_id"], args.batch_size, args.page_size):
+            await embed_queue.put((sequence, rows))
+            sequence += 1
+        await embed_queue.put(None)
+
+    async def embedding_worker():
+        # Модель сама использует все ядра (torch intra-op threads),
+        # пока она считает, reader и upsert-воркеры работают параллельно
+        while (item := await embed_queue.get()) is not None:
+            sequence, rows = item
+            vectors = await index.embed_documents([
+                task_document(row.title, row.description) for row in rows
+            ])
+            await upsert_queue.put((sequence, rows, vectors))
+        for _ in range(args.upsert_workers):
+            await upsert_queue.put(None)
+
+    async def upsert_worker():
+        while (item := await upsert_queue.get()) is not None:
+            sequence, rows, vectors = item
+            await upsert_with_retries(
+                index,
+                collection_name,
+                [row.id for row in rows],
+                [row.user_id for row in rows],
+                vectors,
+            )
+            progress.done(sequence, rows[-1].id, len(rows))
+
+    await asyncio.gather(
+        reader(),
+        embedding_worker(),
+        *[upsert_worker() for _ in range(args.upsert_workers)],
+    )
+    save_checkpoint(args.checkpoint, checkpoint)
+    return progress
+
+
+async def swap_alias(index: TaskSearchIndex, alias: str, collection_name: str, drop_old: bool):
+    """Атомарно переключает алиас на собранную коллекцию"""
+    client = index.client
+    aliases = await client.get_aliases()
+    old_collection = next(
+        (item.collection_name for item in aliases.aliases if item.alias_name == alias),
+        None,
+    )
+
+    collections = await client.get_collections()
+    if alias in {collection.name for collection in collections.collections}:
+        # Первый переход на алиасы: коллекция с именем алиаса удаляется,
+        # на время между удалением и созданием алиаса поиск недоступен
+        print(f"⚠ Коллекция {alias} заменяется алиасом")
+        await client.delete_collection(alias)
+
+    operations = []
+    if old_collection is not None:
+        operations.append(models.DeleteAliasOperation(
+            delete_alias=models.DeleteAlias(alias_name=alias)))
+    operations.append(models.CreateAliasOperation(
+        create_alias=models.CreateAlias(collection_name=collection_name, alias_name=alias)))
+    await client.update_collection_aliases(change_aliases_operations=operations)
+    print(f"✅ Алиас {alias} -> {collection_name}")
+
+    if drop_old and old_collection is not None:
+        await client.delete_collection(old_collection)
+        print(f"Удалена коллекция {old_collection}")
+
+
+async def enqueue_changed_since(started_at: str):
+    """
+    Изменения и удаления задач во время сборки индексатор записал в старую
+    коллекцию. Они ставятся в очередь повторно и попадают в новую коллекцию:
+    иначе задачи, удаленные после чтения сборкой, остались бы в поиске
+    """
+    started_at = datetime.fromisoformat(started_at)
+    columns = ["task_id", "user_id", "operation", "created_at"]
+    async with SessionLocal() as session:
+        changed = select(
+            TaskModel.id,
+            TaskModel.user_id,
+            literal("upsert"),
+            literal(datetime.now()),
+        ).where(TaskModel.updated_at >= started_at)
+        changed_result = await session.execute(
+            insert(TaskIndexOutboxModel).from_select(columns, changed))
+
+        deleted = select(
+            TaskDeletionModel.task_id,
+            TaskDeletionModel.user_id,
+            literal("delete"),
+            literal(datetime.now()),
+        ).where(TaskDeletionModel.deleted_at >= started_at)
+        deleted_result = await session.execute(
+            insert(TaskIndexOutboxModel).from_select(columns, deleted))
+        await session.commit()
+        print(f"Повторно поставлено в очередь изменений: {changed_result.rowcount}, "
+              f"удалений: {deleted_result.rowcount}")
+
+
+async def reindex(args):
+    if args.threads:
+        import torch
+        torch.set_num_threads(args.threads)
+    embedder.batch_size = args.embed_batch_size
+
+    checkpoint = None if args.reset else load_checkpoint(args.checkpoint)
+    if checkpoint is not None and checkpoint.get("shadow") != args.shadow:
+        raise SystemExit("Контрольная точка создана в другом режиме, используйте --reset")
+    if checkpoint is None:
+        collection_name = QDRANT_COLLECTION
+        if args.shadow:
+            collection_name = f"{QDRANT_COLLECTION}_{datetime.now():%Y%m%d%H%M%S}"
+        checkpoint = {
+            "collection": collection_name,
+            "shadow": args.shadow,
+            "last_id": None,
+            "indexed": 0,
+            "started_at": datetime.now().isoformat(),
+        }
+        save_checkpoint(args.checkpoint, checkpoint)
+    else:
+        print(f"Продолжение с задачи {checkpoint['last_id']}, "
+              f"уже проиндексировано {checkpoint['indexed']}")
+
+    index = TaskSearchIndex(checkpoint["collection"])
+    try:
+        progress = await build(index, checkpoint, args)
+        print(f"Готово: {checkpoint['indexed']} задач в {checkpoint['collection']}, "
+              f"{progress.rate():.0f} docs/s")
+
+        if args.shadow:
+            await swap_alias(index, QDRANT_COLLECTION, checkpoint["collection"], args.drop_old)
+            await enqueue_changed_since(checkpoint["started_at"])
+    finally:
+        await index.close()
+
+    os.remove(args.checkpoint)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Переиндексация задач в Qdrant")
+    parser.add_argument("--shadow", action="store_true",
+                        help="Собрать новую коллекцию и атомарно переключить на нее алиас")
+    parser.add_argument("--drop-old", action="store_true",
+                        help="После переключения удалить предыдущую коллекцию")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH)
+    parser.add_argument("--reset", action="store_true",
+                        help="Начать заново, игнорируя контрольную точку")
+    parser.add_argument("--page-size", type=int, default=50_000,
+                        help="Задач в одной странице keyset pagination")
+    parser.add_argument("--batch-size", type=int, default=1024,
+                        help="Задач в пачке векторизации и записи")
+    parser.add_argument("--embed-batch-size", type=int, default=128,
+                        help="Размер батча внутри модели")
+    parser.add_argument("--upsert-workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=os.cpu_count(),
+                        help="Потоков torch для векторизации")
+    args = parser.parse_args()
+
+    asyncio.run(reindex(args))
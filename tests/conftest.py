@@ -0,0 +1,59 @@
+import os
+import tempfile
+
+# Окружение задается до импорта приложения: движок БД и настройки
+# читаются при импорте модулей
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ["TASK_INDEXER_ENABLED"] = "false"
+os.environ["TASK_CHANGES_SETTLE_SECONDS"] = "0"
+os.environ["RESPONSE_VALIDATION"] = "true"
+
+import pytest  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+import main  # noqa: E402
+from api.auth.middleware.auth_middleware import get_current_user  # noqa: E402
+from api.auth.schemas.current_user_schema import CurrentUserSchema  # noqa: E402
+from database.database import Base, SessionLocal, engine  # noqa: E402
+from database.models.user.user_model import UserModel  # noqa: E402
+
+USER_ID = "user-1"
+OTHER_USER_ID = "user-2"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    """Пустая БД SQLite на каждый тест"""
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    yield
+    # Соединения пула привязаны к циклу событий теста
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session(db):
+    async with SessionLocal() as session:
+        for user_id in (USER_ID, OTHER_USER_ID):
+            session.add(UserModel(
+                id=user_id, email=f"{user_id}@example.com", hashed_password="x"))
+        await session.commit()
+        yield session
+
+
+@pytest.fixture
+async def client(session):
+    """Клиент API от имени USER_ID, без выдачи токенов"""
+    main.app.dependency_overrides[get_current_user] = lambda: CurrentUserSchema(
+        id=USER_ID, email=f"{USER_ID}@example.com")
+    async with AsyncClient(
+        transport=ASGITransport(app=main.app), base_url="http://test",
+    ) as client:
+        yield client
+    main.app.dependency_overrides.clear()
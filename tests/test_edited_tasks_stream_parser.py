@@ -0,0 +1,74 @@
+import json
+import random
+
+import pytest
+
+from api.schemas.schedule.edited_schedule_schema import EditedScheduleSchema
+from api.service.schedule.edited_tasks_stream_parser import EditedTasksStreamParser
+
+RESPONSE = json.dumps({
+    "comment": "Ключи до tasks: {\"tasks\": [не массив]}",
+    "tasks": [
+        {
+            "action": "UPDATED",
+            "edited_task": {
+                "id": "task-1",
+                "title": "Созвон {команда} [план]",
+                "description": "Кавычки \" и обратный слеш \\",
+                "date": "2025-06-02T09:00:00",
+                "status": "created",
+            },
+        },
+        {
+            "action": "CREATED",
+            "edited_task": {
+                "id": "",
+                "title": "Спортзал",
+                "description": None,
+                "date": "2025-06-02T19:00:00",
+                "status": "created",
+                "tasks": [{"лишнее": "поле"}],
+            },
+        },
+        {
+            "action": "DELETED",
+            "edited_task": {
+                "id": "task-3",
+                "title": "Старая задача",
+                "description": "\u0000\n\t",
+                "date": "2025-06-03T10:00:00",
+                "status": "completed",
+            },
+        },
+    ],
+    "summary": {"tasks": 3},
+}, ensure_ascii=False)
+
+EXPECTED = EditedScheduleSchema.model_validate_json(RESPONSE).tasks
+
+
+def feed_chunks(chunks):
+    parser = EditedTasksStreamParser()
+    return [edited_task for chunk in chunks for edited_task in parser.feed(chunk)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(RESPONSE)])
+def test_fixed_size_chunks(size):
+    chunks = [RESPONSE[start:start + size] for start in range(0, len(RESPONSE), size)]
+    assert feed_chunks(chunks) == EXPECTED
+
+
+def test_random_chunks():
+    rng = random.Random(20250602)
+    for _ in range(200):
+        cuts = sorted(rng.sample(range(1, len(RESPONSE)), rng.randint(1, 40)))
+        chunks = [RESPONSE[start:end] for start, end in zip([0] + cuts, cuts + [None])]
+        assert feed_chunks(chunks) == EXPECTED
+
+
+def test_task_is_returned_as_soon_as_it_is_closed():
+    first_end = RESPONSE.index("}}", RESPONSE.index('"task-1"')) + 2
+    parser = EditedTasksStreamParser()
+
+    assert parser.feed(RESPONSE[:first_end - 1]) == []
+    assert parser.feed(RESPONSE[first_end - 1:first_end]) == EXPECTED[:1]
@@ -0,0 +1,32 @@
+import httpx
+import numpy as np
+import pytest
+
+from core.embedding_client import RemoteEmbedder
+
+pytestmark = pytest.mark.anyio
+
+INFO = {"model": "test-model", "cache_key": "test-model", "dimension": 2}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/info":
+        return httpx.Response(200, json=INFO)
+    return httpx.Response(
+        200,
+        content=np.zeros((1, 2), dtype=np.float32).tobytes(),
+        headers={"X-Embedding-Dimension": "2"},
+    )
+
+
+async def test_info_is_loaded_without_sync_client():
+    embedder = RemoteEmbedder(url="http://embedding")
+    embedder._client = httpx.AsyncClient(
+        base_url="http://embedding", transport=httpx.MockTransport(handler))
+    embedder._sync_client = None
+
+    await embedder.load_info()
+
+    assert embedder.model_name == "test-model"
+    assert embedder.dimension == 2
+    await embedder._client.aclose()
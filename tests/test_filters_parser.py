@@ -0,0 +1,37 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from api.service.schedule.filters_parser import filters_parser
+from scripts.check_filters_parser import CORPUS_PATH
+
+with open(CORPUS_PATH, encoding="utf-8") as corpus_file:
+    CORPUS = json.load(corpus_file)
+
+
+@pytest.mark.parametrize("item", CORPUS, ids=[item["request"] for item in CORPUS])
+def test_confident_parse_matches_llm(item):
+    filters = filters_parser.parse_confident(item["request"], datetime.fromisoformat(item["now"]))
+    if filters is None:
+        pytest.skip("Запрос уходит в LLM")
+    if item["filters"] is None:
+        pytest.skip("Ответ LLM не записан")
+
+    assert filters.model_dump(mode="json", exclude_none=True) == item["filters"]
+
+
+@pytest.mark.parametrize(
+    "item", [item for item in CORPUS if item.get("local") is False],
+    ids=lambda item: item["request"])
+def test_llm_only_requests_are_not_parsed_locally(item):
+    assert filters_parser.parse_confident(
+        item["request"], datetime.fromisoformat(item["now"])) is None
+
+
+def test_most_of_corpus_is_parsed_locally():
+    parsed = [
+        item for item in CORPUS
+        if filters_parser.parse_confident(item["request"], datetime.fromisoformat(item["now"]))
+    ]
+    assert len(parsed) >= len(CORPUS) * 0.8
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from core.llm_client import CircuitBreaker, LLMClient
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cancelled_probe_releases_half_open():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    llm_client = LLMClient(client=object(), breaker=breaker)
+
+    async def hang(**params):
+        await asyncio.Event().wait()
+
+    probe = asyncio.create_task(llm_client._with_retries(hang))
+    await asyncio.sleep(0)
+    assert breaker.probe_in_flight
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert breaker.allow_request()
+
+
+async def test_cancelled_wait_releases_slot():
+    llm_client = LLMClient(client=object(), max_concurrency=1)
+    busy = llm_client._slot("user-1")
+    await busy.__aenter__()
+
+    waiting = asyncio.create_task(llm_client._slot("user-2").__aenter__())
+    # Ждет глобальный семафор, разрешение пользователя уже получено
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert llm_client._user_waiters == {"user-1": 1, "user-2": 1}
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    assert llm_client._user_waiters == {"user-1": 1}
+    assert set(llm_client._user_semaphores) == {"user-1"}
+    await busy.__aexit__(None, None, None)
+    assert llm_client._user_waiters == {} and llm_client._user_semaphores == {}
@@ -0,0 +1,25 @@
+import pytest
+
+from api.metrics.routes import metrics_routes
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_metrics_are_disabled_without_token(client, monkeypatch):
+    monkeypatch.setattr(metrics_routes, "METRICS_TOKEN", None)
+
+    response = await client.get("/api/metrics")
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("authorization, status_code", [
+    (None, 401),
+    ("Bearer wrong", 401),
+    ("Bearer secret", 200),
+])
+async def test_metrics_require_token(client, monkeypatch, authorization, status_code):
+    monkeypatch.setattr(metrics_routes, "METRICS_TOKEN", "secret")
+    headers = {"Authorization": authorization} if authorization else {}
+
+    response = await client.get("/api/metrics", headers=headers)
+    assert response.status_code == status_code
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from database.models.task.task_deletion_model import TaskDeletionModel
+from database.models.task.task_index_outbox_model import TaskIndexOutboxModel
+from database.models.task.task_model import TaskModel
+from scripts.reindex_tasks import enqueue_changed_since, upsert_with_retries
+from tests.conftest import USER_ID
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_changes_and_deletions_during_build_are_requeued(session):
+    started_at = datetime.now()
+    before = started_at - timedelta(hours=1)
+    session.add_all([
+        TaskModel(id="old", user_id=USER_ID, title="До сборки", date=before,
+                  created_at=before, updated_at=before),
+        TaskModel(id="changed", user_id=USER_ID, title="Во время сборки", date=before,
+                  created_at=before, updated_at=started_at + timedelta(minutes=1)),
+        TaskDeletionModel(task_id="deleted-before", user_id=USER_ID, deleted_at=before),
+        TaskDeletionModel(task_id="deleted", user_id=USER_ID,
+                          deleted_at=started_at + timedelta(minutes=2)),
+    ])
+    await session.commit()
+
+    await enqueue_changed_since(started_at.isoformat())
+
+    rows = (await session.execute(select(
+        TaskIndexOutboxModel.task_id, TaskIndexOutboxModel.operation))).all()
+    assert sorted(rows) == [("changed", "upsert"), ("deleted", "delete")]
+
+
+async def test_upsert_waits_for_qdrant_before_checkpoint():
+    calls = []
+
+    class FakeIndex:
+        async def upsert(self, ids, user_ids, vectors, collection_name=None, wait=False):
+            calls.append((collection_name, wait))
+
+    await upsert_with_retries(FakeIndex(), "tasks_new", ["task"], [USER_ID], None)
+
+    assert calls == [("tasks_new", True)]
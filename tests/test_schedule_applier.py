@@ -0,0 +1,127 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from database.models.task.task_model import TaskModel
+from database.models.user.user_model import UserModel
+from tests.conftest import OTHER_USER_ID, USER_ID
+
+pytestmark = pytest.mark.anyio
+
+
+def edited(action: str, task_id: str, title: str, status: str = "created") -> dict:
+    return {
+        "action": action,
+        "edited_task": {
+            "id": task_id,
+            "title": title,
+            "description": None,
+            "date": "2025-06-02T09:00:00",
+            "status": status,
+        },
+    }
+
+
+@pytest.fixture
+async def tasks(session):
+    session.add_all([
+        TaskModel(id=task_id, user_id=USER_ID, title=title, date=datetime(2025, 6, 2, 9))
+        for task_id, title in [("keep", "Без изменений"), ("move", "Перенести"),
+                               ("drop", "Удалить")]
+    ] + [TaskModel(id="foreign", user_id=OTHER_USER_ID, title="Чужая",
+                   date=datetime(2025, 6, 2, 9))])
+    await session.commit()
+
+
+async def titles(session) -> dict:
+    rows = (await session.execute(select(TaskModel.id, TaskModel.title, TaskModel.status).where(
+        TaskModel.user_id == USER_ID))).all()
+    return {row.id: (row.title, row.status.value) for row in rows}
+
+
+async def tasks_version(session) -> int:
+    return (await session.execute(
+        select(UserModel.tasks_version).where(UserModel.id == USER_ID))).scalar_one()
+
+
+async def test_apply_schedule(client, session, tasks):
+    response = await client.post("/api/schedule/apply", json={
+        "tasks": [
+            edited("READ", "keep", "Без изменений"),
+            edited("UPDATED", "move", "Перенесено", "completed"),
+            edited("CREATED", "", "Новая"),
+            edited("DELETED", "drop", "Удалить"),
+        ],
+        "tasks_version": 0,
+    })
+    assert response.status_code == 200
+    body = response.json()
+
+    assert [task["title"] for task in body["tasks"]] == ["Без изменений", "Перенесено", "Новая"]
+    assert body["tasks_version"] == await tasks_version(session) > 0
+
+    new_id = body["tasks"][2]["id"]
+    assert await titles(session) == {
+        "keep": ("Без изменений", "created"),
+        "move": ("Перенесено", "completed"),
+        new_id: ("Новая", "created"),
+    }
+
+
+async def test_stale_version_is_conflict(client, session, tasks):
+    await client.post("/api/tasks", json={"title": "Добавлена после", "date": "2025-06-02T10:00:00"})
+    before = await titles(session)
+
+    response = await client.post("/api/schedule/apply", json={
+        "tasks": [edited("DELETED", "drop", "Удалить")],
+        "tasks_version": 0,
+    })
+
+    assert response.status_code == 409
+    assert await titles(session) == before
+
+
+@pytest.mark.parametrize("task_id", ["missing", "foreign"])
+async def test_unknown_task_is_conflict(client, session, tasks, task_id):
+    before = await titles(session)
+
+    response = await client.post("/api/schedule/apply", json={
+        "tasks": [
+            edited("DELETED", "drop", "Удалить"),
+            edited("CREATED", "", "Новая"),
+            edited("UPDATED", task_id, "Не найдена"),
+        ],
+        "tasks_version": 0,
+    })
+
+    assert response.status_code == 409
+    assert task_id in response.json()["detail"]
+    assert await titles(session) == before
+    assert await tasks_version(session) == 0
+
+
+@pytest.mark.parametrize("schedule_tasks", [
+    [edited("MOVED", "move", "Перенести")],
+    [edited("UPDATED", "", "Без ID")],
+    [edited("UPDATED", "move", "Раз"), edited("DELETED", "move", "Два")],
+])
+async def test_invalid_actions_are_rejected(client, session, tasks, schedule_tasks):
+    response = await client.post("/api/schedule/apply", json={
+        "tasks": schedule_tasks,
+        "tasks_version": 0,
+    })
+
+    assert response.status_code == 422
+    assert await tasks_version(session) == 0
+
+
+async def test_missing_version_is_required(client, session, tasks):
+    before = await titles(session)
+
+    response = await client.post("/api/schedule/apply", json={
+        "tasks": [edited("DELETED", "drop", "Удалить")],
+    })
+
+    assert response.status_code == 428
+    assert await titles(session) == before
@@ -0,0 +1,59 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from api.service.schedule import schedule_service as schedule_service_module
+from api.service.schedule.schedule_service import EDIT_SCHEDULE_MAX_CHUNKS, ScheduleService
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeLLMClient:
+    """Считает одновременные вызовы, отвечает пустым расписанием"""
+
+    max_concurrency_per_user = 2
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    async def chat_completion(self, user_id: str, **params):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return SimpleNamespace(choices=[
+            SimpleNamespace(message=SimpleNamespace(content='{"tasks": []}')),
+        ])
+
+
+def use_contexts(monkeypatch, count: int):
+    monkeypatch.setattr(
+        schedule_service_module.schedule_context_builder, "build",
+        lambda request, tasks, filters: [f"часть {index}" for index in range(count)])
+
+
+async def test_chunks_respect_per_user_limit(monkeypatch):
+    use_contexts(monkeypatch, EDIT_SCHEDULE_MAX_CHUNKS)
+    client = FakeLLMClient()
+
+    schedule = await ScheduleService(client, None).edit_schedule("перенеси все", "user-1")
+
+    assert schedule.tasks == []
+    assert client.calls == EDIT_SCHEDULE_MAX_CHUNKS
+    assert client.max_in_flight <= client.max_concurrency_per_user
+
+
+async def test_too_many_chunks_is_rejected(monkeypatch):
+    use_contexts(monkeypatch, EDIT_SCHEDULE_MAX_CHUNKS + 1)
+    client = FakeLLMClient()
+
+    with pytest.raises(HTTPException) as error:
+        await ScheduleService(client, None).edit_schedule("перенеси все", "user-1")
+
+    assert error.value.status_code == 422
+    assert client.calls == 0
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from api.task.service.task_cursor import encode_cursor
+from api.task.service.task_service import TASK_TOMBSTONE_RETENTION_DAYS, TaskService
+from database.models.task.task_model import TaskModel
+from tests.conftest import USER_ID
+
+pytestmark = pytest.mark.anyio
+
+OLD = datetime(2025, 1, 1, 9, 0)
+
+
+async def add_old_tasks(session, count: int):
+    """Задачи, измененные раньше срока хранения записей об удалении"""
+    for index in range(count):
+        session.add(TaskModel(
+            id=f"old-{index}",
+            user_id=USER_ID,
+            title=f"Задача {index}",
+            date=OLD,
+            created_at=OLD,
+            updated_at=OLD + timedelta(minutes=index),
+        ))
+    await session.commit()
+
+
+async def test_full_sync_pages_through_old_tasks(session):
+    await add_old_tasks(session, 3)
+    service = TaskService(session)
+
+    ids, since = [], None
+    while True:
+        changes = await service.get_changes(USER_ID, since, limit=1)
+        ids += [task.id for task in changes.tasks]
+        since = changes.next_cursor
+        if not changes.has_more:
+            break
+
+    assert ids == ["old-0", "old-1", "old-2"]
+    # Сохраненный курсор продолжает синхронизацию
+    changes = await service.get_changes(USER_ID, since, limit=1)
+    assert changes.tasks == [] and changes.deleted == []
+
+
+async def test_deletion_after_page_is_returned(session):
+    await add_old_tasks(session, 2)
+    service = TaskService(session)
+
+    first = await service.get_changes(USER_ID, None, limit=1)
+    await service.delete_task("old-0", USER_ID)
+    await session.commit()
+
+    ids, deleted, since = [], [], first.next_cursor
+    while True:
+        changes = await service.get_changes(USER_ID, since, limit=1)
+        ids += [task.id for task in changes.tasks]
+        deleted += changes.deleted
+        since = changes.next_cursor
+        if not changes.has_more:
+            break
+
+    assert ids == ["old-1"]
+    assert deleted == ["old-0"]
+
+
+async def test_cursor_older_than_retention_is_gone(session):
+    started_at = datetime.now() - timedelta(days=TASK_TOMBSTONE_RETENTION_DAYS + 1)
+    with pytest.raises(HTTPException) as error:
+        await TaskService(session).get_changes(
+            USER_ID, encode_cursor(started_at, "", started_at), limit=1)
+    assert error.value.status_code == 410
@@ -0,0 +1,40 @@
+import base64
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from api.task.service.task_cursor import decode_cursor, encode_cursor
+
+
+def test_round_trip():
+    values = [0.75, datetime(2025, 6, 2, 9, 30, 15, 123456), "задача-1"]
+    cursor = encode_cursor(*values)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, (float, datetime, str)) == values
+
+
+def test_int_is_accepted_as_float():
+    assert decode_cursor(encode_cursor(1, "id"), (float, str)) == [1, "id"]
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "не base64",
+    base64.urlsafe_b64encode(b"{}").decode(),
+    base64.urlsafe_b64encode(b"[1, 2").decode(),
+    encode_cursor("id"),
+    encode_cursor("2025-06-02T09:00:00", "id", "лишнее"),
+    encode_cursor("не дата", "id"),
+    encode_cursor(True, "id"),
+])
+def test_invalid_cursor_is_bad_request(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, (datetime, str))
+    assert error.value.status_code == 400
+
+
+def test_bool_is_not_float():
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor(True, "id"), (float, str))
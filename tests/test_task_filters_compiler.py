@@ -0,0 +1,110 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from api.schemas.range_filter import RangeFilter
+from api.schemas.schedule.filters_response_schema import DateTimeRange, TaskFilterSchema
+from api.task.schemas.task.task_filters_schema import TaskFiltersSchema
+from api.task.schemas.task.task_status_schema import TaskStatusSchema
+from api.task.service.task_filters_compiler import RANGE_COLUMNS, compile_task_filters
+from database.models.task.task_model import TaskModel, TaskStatusModel
+from tests.conftest import USER_ID
+
+pytestmark = pytest.mark.anyio
+
+SEED = 20250601
+TASKS = 300
+FILTERS = 500
+# Небольшая сетка значений, чтобы точные совпадения и границы диапазонов
+# встречались часто
+TIMES = [datetime(2025, 6, 2, 9, 0) + timedelta(hours=hours) for hours in range(8)]
+MARKS = ["work", "home", "sport"]
+
+
+def random_time(rng: random.Random):
+    return rng.choice(TIMES + [None])
+
+
+def random_range_value(rng: random.Random, range_type):
+    kind = rng.choice(["none", "exact", "range"])
+    if kind == "none":
+        return None
+    if kind == "exact":
+        return rng.choice(TIMES)
+    # Пустой диапазон (gte > lte) тоже допустим
+    return range_type(gte=random_time(rng), lte=random_time(rng))
+
+
+def random_filters(rng: random.Random, schema, range_type, status_type):
+    return schema(
+        **{field: random_range_value(rng, range_type) for field in RANGE_COLUMNS},
+        mark=rng.choice(MARKS + [None]),
+        status=rng.choice(list(status_type) + [None]),
+    )
+
+
+def reference_match(task: TaskModel, filters) -> bool:
+    """Фильтр в памяти с семантикой SQL: NULL не удовлетворяет условию"""
+    for field in RANGE_COLUMNS:
+        value = getattr(filters, field)
+        # Диапазон без границ ничего не ограничивает
+        if value is None or (
+                not isinstance(value, datetime) and value.gte is None and value.lte is None):
+            continue
+        task_value = getattr(task, field)
+        if task_value is None:
+            return False
+        if isinstance(value, datetime):
+            if task_value != value:
+                return False
+            continue
+        if value.gte is not None and task_value < value.gte:
+            return False
+        if value.lte is not None and task_value > value.lte:
+            return False
+
+    if filters.mark is not None and task.mark != filters.mark:
+        return False
+    if filters.status is not None and task.status.value != filters.status.value:
+        return False
+    return True
+
+
+async def add_random_tasks(session, rng: random.Random) -> list:
+    tasks = [
+        TaskModel(
+            id=f"task-{index}",
+            user_id=USER_ID,
+            title=f"Задача {index}",
+            date=TIMES[0],
+            start_time=random_time(rng),
+            end_time=random_time(rng),
+            reminder=random_time(rng),
+            mark=rng.choice(MARKS + [None]),
+            status=rng.choice(list(TaskStatusModel)),
+        )
+        for index in range(TASKS)
+    ]
+    session.add_all(tasks)
+    await session.commit()
+    return tasks
+
+
+@pytest.mark.parametrize("schema, range_type, status_type", [
+    (TaskFilterSchema, DateTimeRange, TaskStatusSchema),
+    (TaskFiltersSchema, RangeFilter, TaskStatusModel),
+])
+async def test_compiled_filters_match_reference(session, schema, range_type, status_type):
+    rng = random.Random(SEED)
+    tasks = await add_random_tasks(session, rng)
+
+    for _ in range(FILTERS):
+        filters = random_filters(rng, schema, range_type, status_type)
+        found = set((await session.execute(select(TaskModel.id).where(
+            TaskModel.user_id == USER_ID,
+            *compile_task_filters(filters),
+        ))).scalars())
+        expected = {task.id for task in tasks if reference_match(task, filters)}
+        assert found == expected, filters
@@ -0,0 +1,112 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import delete, select, update
+
+from api.task.service.task_indexer import TaskIndexer
+from database.database import SessionLocal
+from database.models.task.task_index_outbox_model import TaskIndexOutboxModel
+from database.models.task.task_model import TaskModel
+from tests.conftest import USER_ID
+
+pytestmark = pytest.mark.anyio
+
+
+async def read_outbox():
+    async with SessionLocal() as session:
+        return (await session.execute(select(
+            TaskIndexOutboxModel.task_id, TaskIndexOutboxModel.locked_until))).all()
+
+
+class FakeSearchIndex:
+    def __init__(self, fail: bool = False, on_upsert=None):
+        self.fail = fail
+        self.on_upsert = on_upsert
+        self.upserted = []
+        self.deleted = []
+        self.waits = []
+        self.outbox_while_embedding = None
+
+    async def embed_documents(self, texts):
+        # Пачка уже занята и зафиксирована другой транзакцией
+        self.outbox_while_embedding = await read_outbox()
+        return np.zeros((len(texts), 2), dtype=np.float32)
+
+    async def upsert(self, ids, user_ids, vectors, wait=False):
+        if self.fail:
+            raise RuntimeError("Qdrant недоступен")
+        self.upserted += ids
+        self.waits.append(wait)
+        if self.on_upsert:
+            await self.on_upsert()
+
+    async def delete(self, ids, wait=False):
+        self.deleted += ids
+        self.waits.append(wait)
+
+
+async def enqueue(session):
+    now = datetime.now()
+    session.add(TaskModel(id="task", user_id=USER_ID, title="Задача", date=now))
+    for task_id, operation in [("task", "upsert"), ("gone", "upsert"), ("gone", "delete")]:
+        session.add(TaskIndexOutboxModel(
+            task_id=task_id, user_id=USER_ID, operation=operation, created_at=now))
+    await session.commit()
+
+
+async def test_batch_is_claimed_before_embedding(session):
+    await enqueue(session)
+    search_index = FakeSearchIndex()
+
+    assert await TaskIndexer(search_index).process_batch() == 3
+
+    assert all(locked_until is not None
+               for _, locked_until in search_index.outbox_while_embedding)
+    assert search_index.upserted == ["task"]
+    assert search_index.deleted == ["gone"]
+    assert search_index.waits == [True, True]
+    assert await read_outbox() == []
+
+
+async def test_failed_batch_is_released(session):
+    await enqueue(session)
+
+    with pytest.raises(RuntimeError):
+        await TaskIndexer(FakeSearchIndex(fail=True)).process_batch()
+
+    outbox = await read_outbox()
+    assert len(outbox) == 3
+    assert all(locked_until is None for _, locked_until in outbox)
+
+
+async def test_task_deleted_during_upsert_loses_its_point(session):
+    await enqueue(session)
+
+    async def delete_task():
+        # Удаление и обработка его записи другим индексатором
+        # завершились раньше, чем upsert этой пачки
+        async with SessionLocal() as other:
+            await other.execute(delete(TaskModel).where(TaskModel.id == "task"))
+            await other.commit()
+
+    search_index = FakeSearchIndex(on_upsert=delete_task)
+    await TaskIndexer(search_index).process_batch()
+
+    assert search_index.upserted == ["task"]
+    assert sorted(search_index.deleted) == ["gone", "task"]
+    assert await read_outbox() == []
+
+
+async def test_task_changed_during_upsert_is_requeued(session):
+    await enqueue(session)
+
+    async def change_task():
+        async with SessionLocal() as other:
+            await other.execute(update(TaskModel).where(TaskModel.id == "task")
+                                .values(title="Новое", updated_at=datetime(2030, 1, 1)))
+            await other.commit()
+
+    await TaskIndexer(FakeSearchIndex(on_upsert=change_task)).process_batch()
+
+    assert await read_outbox() == [("task", None)]
@@ -0,0 +1,83 @@
+import re
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, select
+
+from api.task.schemas.task.task_create_schema import TaskCreateSchema
+from api.task.schemas.task.task_update_schema import TaskUpdateSchema
+from api.task.service.task_service import TaskService
+from database.database import engine
+from database.models.task.task_model import TaskModel
+from tests.conftest import USER_ID
+
+pytestmark = pytest.mark.anyio
+
+TASKS_TABLE = re.compile(r"\btasks\b")
+
+
+@contextmanager
+def tasks_statements():
+    """Запросы к таблице tasks, выполненные внутри блока"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if TASKS_TABLE.search(statement):
+            statements.append(statement.split()[0])
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+async def service(session):
+    session.add(TaskModel(id="task", user_id=USER_ID, title="Задача", date=datetime.now()))
+    await session.commit()
+    return TaskService(session)
+
+
+async def test_update_task_is_single_statement(service):
+    with tasks_statements() as statements:
+        task = await service.update_task("task", USER_ID, TaskUpdateSchema(title="Новое"))
+        await service.db_session.flush()
+
+    assert task.title == "Новое"
+    assert statements == ["UPDATE"]
+
+
+async def test_mark_task_completed_is_single_statement(service):
+    with tasks_statements() as statements:
+        task = await service.mark_task_completed("task", USER_ID)
+        await service.db_session.flush()
+
+    assert task.status.value == "completed"
+    assert statements == ["UPDATE"]
+
+
+async def test_delete_task_is_single_statement(service):
+    with tasks_statements() as statements:
+        assert await service.delete_task("task", USER_ID)
+        await service.db_session.flush()
+
+    assert statements == ["DELETE"]
+
+
+async def test_missing_task_is_single_statement(service):
+    with tasks_statements() as statements:
+        assert await service.mark_task_completed("missing", USER_ID) is None
+        assert not await service.delete_task("missing", USER_ID)
+
+    assert statements == ["UPDATE", "DELETE"]
+
+
+async def test_create_task_leaves_commit_to_request(service, session):
+    created = await service.create_task(
+        TaskCreateSchema(title="Новая", date=datetime.now()), USER_ID)
+    await session.rollback()
+
+    assert (await session.execute(
+        select(TaskModel.id).where(TaskModel.id == created.id))).first() is None
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+import pytest
+from fastapi.exceptions import ResponseValidationError
+
+from api.task.repository.task_repository import TaskRepository
+from database.models.task.task_model import TaskModel
+from tests.conftest import OTHER_USER_ID
+
+pytestmark = pytest.mark.anyio
+
+TASK = {"title": "Созвон с командой", "date": "2025-06-02T09:00:00"}
+
+
+async def test_get_task_etag(client):
+    created = (await client.post("/api/tasks", json=TASK)).json()
+
+    response = await client.get(f"/api/tasks/{created['id']}")
+    assert response.status_code == 200
+    assert response.json()["title"] == TASK["title"]
+
+    etag = response.headers["etag"]
+    response = await client.get(
+        f"/api/tasks/{created['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize("headers", [{}, {"If-None-Match": "*"}])
+async def test_get_unknown_task_is_not_found(client, headers):
+    response = await client.get("/api/tasks/unknown", headers=headers)
+    assert response.status_code == 404
+
+
+async def test_get_other_users_task_is_not_found(client, session):
+    session.add(TaskModel(
+        id="foreign", user_id=OTHER_USER_ID, title="Чужая задача",
+        date=datetime(2025, 6, 2, 9, 0)))
+    await session.commit()
+
+    response = await client.get("/api/tasks/foreign", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
+
+
+async def test_fast_json_response_is_checked_against_response_model(client, monkeypatch):
+    async def get_changes(self, user_id, since, limit):
+        return {"changes": "не список"}
+
+    monkeypatch.setattr(TaskRepository, "get_changes", get_changes)
+
+    with pytest.raises(ResponseValidationError):
+        await client.get("/api/tasks/changes")
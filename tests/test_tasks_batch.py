@@ -0,0 +1,97 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from database.models.task.task_deletion_model import TaskDeletionModel
+from database.models.task.task_index_outbox_model import TaskIndexOutboxModel
+from database.models.task.task_model import TaskModel
+from database.models.user.user_model import UserModel
+from tests.conftest import OTHER_USER_ID, USER_ID
+
+pytestmark = pytest.mark.anyio
+
+PLAN = [
+    {"title": f"Импорт: задача {index}", "date": f"2025-06-02T0{index}:00:00"}
+    for index in range(3)
+]
+
+
+async def create_plan(client) -> list:
+    response = await client.post("/api/tasks/batch", json={"tasks": PLAN})
+    assert response.status_code == 200
+    return response.json()["results"]
+
+
+async def tasks_version(session) -> int:
+    return (await session.execute(
+        select(UserModel.tasks_version).where(UserModel.id == USER_ID))).scalar_one()
+
+
+async def test_create_batch_keeps_request_order(client, session):
+    results = await create_plan(client)
+
+    assert [result["status"] for result in results] == ["created"] * 3
+    assert [result["task"]["title"] for result in results] == [task["title"] for task in PLAN]
+    assert [result["id"] for result in results] == [result["task"]["id"] for result in results]
+    assert await tasks_version(session) == 1
+
+    outbox = (await session.execute(select(TaskIndexOutboxModel.task_id))).scalars().all()
+    assert sorted(outbox) == sorted(result["id"] for result in results)
+
+
+async def test_update_batch_changes_only_given_fields(client, session):
+    first, second, _ = [result["id"] for result in await create_plan(client)]
+    session.add(TaskModel(
+        id="foreign", user_id=OTHER_USER_ID, title="Чужая", date=datetime(2025, 6, 2)))
+    await session.commit()
+
+    response = await client.patch("/api/tasks/batch", json={"tasks": [
+        {"id": second, "status": "completed"},
+        {"id": "missing", "title": "Нет такой"},
+        {"id": first, "title": "Переименована"},
+        {"id": "foreign", "title": "Чужая задача не меняется"},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    assert [(result["id"], result["status"]) for result in results] == [
+        (second, "updated"), ("missing", "not_found"),
+        (first, "updated"), ("foreign", "not_found"),
+    ]
+    assert results[0]["task"]["status"] == "completed"
+    assert results[0]["task"]["title"] == PLAN[1]["title"]
+    assert results[2]["task"]["title"] == "Переименована"
+    assert results[2]["task"]["status"] == "created"
+
+    foreign = await session.get(TaskModel, "foreign", populate_existing=True)
+    assert foreign.title == "Чужая"
+
+
+async def test_delete_batch_records_tombstones(client, session):
+    first, second, third = [result["id"] for result in await create_plan(client)]
+
+    response = await client.request(
+        "DELETE", "/api/tasks/batch", json={"ids": [third, "missing", first]})
+    assert response.status_code == 200
+    assert [(result["id"], result["status"]) for result in response.json()["results"]] == [
+        (third, "deleted"), ("missing", "not_found"), (first, "deleted"),
+    ]
+
+    remaining = (await session.execute(select(TaskModel.id))).scalars().all()
+    assert remaining == [second]
+    tombstones = (await session.execute(select(TaskDeletionModel.task_id))).scalars().all()
+    assert sorted(tombstones) == sorted([first, third])
+    assert await tasks_version(session) == 2
+
+
+@pytest.mark.parametrize("method, body", [
+    ("POST", {"tasks": []}),
+    ("PATCH", {"tasks": [{"id": "a", "title": "1"}, {"id": "a", "title": "2"}]}),
+    ("DELETE", {"ids": ["a", "a"]}),
+    ("PATCH", {"tasks": [{"id": "a", "title": None}]}),
+    ("PATCH", {"tasks": [{"id": "a", "date": None}]}),
+])
+async def test_invalid_batch_is_rejected(client, method, body):
+    response = await client.request(method, "/api/tasks/batch", json=body)
+    assert response.status_code == 422